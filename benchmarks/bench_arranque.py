@@ -0,0 +1,53 @@
+# benchmarks/bench_arranque.py
+"""
+Mide el arranque en frío (proceso nuevo) de la CLI frente al coste de importar
+la aplicación gráfica (tkinter + vistas, sin abrir ventana) y reportlab.
+
+Uso: python benchmarks/bench_arranque.py [repeticiones]
+"""
+import sys
+import os
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import statistics
+import subprocess
+import tempfile
+import time
+
+CASOS = {
+    "python vacío": ["-c", "pass"],
+    "cli.py listar --limite 1": [os.path.join(RAIZ, "cli.py"), "--archivo", "{archivo}",
+                                 "listar", "--limite", "1"],
+    "import main (GUI, sin ventana)": ["-c", "import main"],
+    "import utils.pdf_exporter": ["-c", "import utils.pdf_exporter"],
+}
+
+
+def medir(argumentos: list, repeticiones: int) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable] + argumentos, cwd=RAIZ, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with tempfile.TemporaryDirectory() as carpeta:
+        archivo = os.path.join(carpeta, "tareas.json")
+        with open(archivo, "w", encoding="utf-8") as f:
+            f.write('[{"titulo": "Tarea de prueba", "fecha_limite": "2025-01-01"}]')
+        print(f"{'caso':<34} {'mediana':>10}")
+        for nombre, argumentos in CASOS.items():
+            argumentos = [a.format(archivo=archivo) for a in argumentos]
+            try:
+                print(f"{nombre:<34} {medir(argumentos, repeticiones) * 1000:>8.1f} ms")
+            except subprocess.CalledProcessError:
+                print(f"{nombre:<34} {'(falló)':>10}")
+
+
+if __name__ == "__main__":
+    main()
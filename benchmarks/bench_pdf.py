@@ -0,0 +1,68 @@
+# benchmarks/bench_pdf.py
+"""
+Compara la exportación clásica (una sola Table + doc.build) con la exportación
+en streaming (una tabla por página) y la paralela (partes en varios procesos).
+Cada medición corre en un proceso hijo para que el pico de memoria (RSS) de un
+modo no contamine al otro; en el modo paralelo es el pico del proceso padre.
+
+Uso: python benchmarks/bench_pdf.py [n_tareas ...]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import subprocess
+import tempfile
+import time
+
+MODOS = ("clasico", "streaming", "paralelo")
+
+
+def _pico_rss_kib() -> int:
+    import resource
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico // 1024 if sys.platform == "darwin" else pico  # macOS informa bytes
+
+
+def medir_en_hijo(modo: str, n: int):
+    """Se ejecuta en el proceso hijo: genera n tareas, exporta e imprime JSON."""
+    from benchmarks.bench_tarea import generar_datos
+    from models.tarea import Tarea
+    from utils.pdf_exporter import PDFExporter
+
+    tareas = (Tarea.from_dict(d) for d in generar_datos(n))
+    rss_base = _pico_rss_kib()
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "informe.pdf")
+        inicio = time.perf_counter()
+        if modo == "clasico":
+            PDFExporter.exportar(list(tareas), ruta)
+        elif modo == "paralelo":
+            PDFExporter.exportar_paralelo(list(tareas), ruta)
+        else:
+            PDFExporter.exportar_streaming(tareas, ruta)
+        segundos = time.perf_counter() - inicio
+        tamano = os.path.getsize(ruta)
+    print(json.dumps({"modo": modo, "n": n, "segundos": segundos,
+                      "pico_rss_kib": _pico_rss_kib(), "rss_base_kib": rss_base,
+                      "bytes_pdf": tamano}))
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--hijo":
+        medir_en_hijo(sys.argv[2], int(sys.argv[3]))
+        return
+    tamanos = [int(a) for a in sys.argv[1:]] or [1_000, 10_000]
+    print(f"{'modo':<10} {'tareas':>8} {'tiempo':>10} {'pico RSS':>12} {'PDF':>10}")
+    for n in tamanos:
+        for modo in MODOS:
+            salida = subprocess.run([sys.executable, __file__, "--hijo", modo, str(n)],
+                                    capture_output=True, text=True, check=True).stdout
+            r = json.loads(salida.strip().splitlines()[-1])
+            print(f"{modo:<10} {n:>8} {r['segundos']:>9.2f}s {r['pico_rss_kib'] / 1024:>9.1f} MiB "
+                  f"{r['bytes_pdf'] / 1024:>7.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# benchmarks/bench_servidor.py
+"""
+Prueba de carga de servidor.py: peticiones por segundo y latencias con varios
+clientes concurrentes sobre conexiones keep-alive (solo biblioteca estándar).
+
+Escenarios:
+    listar     GET /tareas?vista=pendientes&limite=50 sin caché
+    sondeo     el mismo GET con If-None-Match (el cliente recibe 304)
+    mixto      90 % lecturas con sondeo, 10 % altas y alternados
+
+Sin --url levanta una instancia propia sobre un archivo temporal con n tareas.
+
+Uso: python benchmarks/bench_servidor.py [--url http://127.0.0.1:8765] [--tareas 10000]
+                                         [--clientes 32] [--segundos 5]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+ESCENARIOS = ("listar", "sondeo", "mixto")
+LISTADO = "/tareas?vista=pendientes&limite=50"
+
+
+class Cliente:
+    """Una conexión keep-alive que envía peticiones de una en una."""
+    def __init__(self, host: str, puerto: int):
+        self.host, self.puerto = host, puerto
+
+    async def abrir(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.puerto)
+
+    async def pedir(self, metodo: str, ruta: str, cuerpo: bytes = b"", cabeceras: dict = None):
+        lineas = [f"{metodo} {ruta} HTTP/1.1", f"Host: {self.host}", f"Content-Length: {len(cuerpo)}"]
+        lineas += [f"{k}: {v}" for k, v in (cabeceras or {}).items()]
+        self.writer.write(("\r\n".join(lineas) + "\r\n\r\n").encode("latin-1") + cuerpo)
+        cabecera = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        estado = int(cabecera[0].split(" ", 2)[1])
+        valores = {}
+        for linea in cabecera[1:]:
+            if ":" in linea:
+                nombre, valor = linea.split(":", 1)
+                valores[nombre.strip().lower()] = valor.strip()
+        longitud = int(valores.get("content-length", 0))
+        datos = await self.reader.readexactly(longitud) if longitud else b""
+        return estado, valores, datos
+
+    def cerrar(self):
+        self.writer.close()
+
+
+async def _trabajador(cliente: Cliente, escenario: str, fin: float, latencias: list, estados: dict):
+    etag = None
+    while time.perf_counter() < fin:
+        cabeceras = {}
+        if escenario != "listar" and etag:
+            cabeceras["If-None-Match"] = etag
+        metodo, ruta, cuerpo = "GET", LISTADO, b""
+        if escenario == "mixto" and random.random() < 0.1:
+            if random.random() < 0.5:
+                metodo, ruta = "POST", "/tareas"
+                cuerpo = json.dumps({"titulo": f"Carga {random.randrange(10**9)}",
+                                     "fecha_limite": "2030-01-01"}).encode("utf-8")
+            else:
+                metodo, ruta = "POST", f"/tareas/{random.choice(cliente.ids)}/alternar"
+        inicio = time.perf_counter()
+        estado, valores, datos = await cliente.pedir(metodo, ruta, cuerpo, cabeceras)
+        latencias.append(time.perf_counter() - inicio)
+        estados[estado] = estados.get(estado, 0) + 1
+        if metodo == "GET":
+            etag = valores.get("etag", etag)
+            if estado == 200 and not cliente.ids:
+                cliente.ids = [t["id"] for t in json.loads(datos)["tareas"]]
+
+
+async def medir(host: str, puerto: int, escenario: str, clientes: int, segundos: float) -> dict:
+    conexiones = [Cliente(host, puerto) for _ in range(clientes)]
+    await asyncio.gather(*(c.abrir() for c in conexiones))
+    for c in conexiones:
+        c.ids = []
+    # Calentamiento: cada cliente obtiene su primer ETag y los ids para alternar
+    for c in conexiones:
+        _, _, datos = await c.pedir("GET", LISTADO)
+        c.ids = [t["id"] for t in json.loads(datos)["tareas"]]
+    latencias, estados = [], {}
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_trabajador(c, escenario, inicio + segundos, latencias, estados)
+                           for c in conexiones))
+    transcurrido = time.perf_counter() - inicio
+    for c in conexiones:
+        c.cerrar()
+    latencias.sort()
+    percentil = lambda p: latencias[min(len(latencias) - 1, int(p * len(latencias)))] * 1000
+    return {"escenario": escenario, "peticiones": len(latencias),
+            "rps": len(latencias) / transcurrido, "p50_ms": percentil(0.50),
+            "p99_ms": percentil(0.99), "estados": estados}
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _levantar(carpeta: str, n: int):
+    """Genera n tareas en un tareas.json temporal y arranca servidor.py sobre él."""
+    from benchmarks.bench_tarea import generar_datos
+    archivo = os.path.join(carpeta, "tareas.json")
+    with open(archivo, "w", encoding="utf-8") as f:
+        json.dump(generar_datos(n), f)
+    puerto = _puerto_libre()
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proceso = subprocess.Popen([sys.executable, os.path.join(raiz, "servidor.py"), "--archivo", archivo,
+                                "--puerto", str(puerto)], stdout=subprocess.DEVNULL)
+    limite = time.time() + 60
+    while time.time() < limite:
+        try:
+            socket.create_connection(("127.0.0.1", puerto), timeout=0.2).close()
+            return proceso, puerto
+        except OSError:
+            time.sleep(0.1)
+    proceso.kill()
+    raise RuntimeError("El servidor no arrancó a tiempo.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="instancia ya en marcha (por defecto se levanta una)")
+    parser.add_argument("--tareas", type=int, default=10_000)
+    parser.add_argument("--clientes", type=int, default=32)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--escenarios", nargs="+", choices=ESCENARIOS, default=list(ESCENARIOS))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        proceso = None
+        if args.url:
+            url = urlsplit(args.url)
+            host, puerto = url.hostname, url.port or 80
+        else:
+            proceso, puerto = _levantar(carpeta, args.tareas)
+            host = "127.0.0.1"
+        try:
+            print(f"{'escenario':<10} {'peticiones':>10} {'req/s':>10} {'p50':>9} {'p99':>9}  estados")
+            for escenario in args.escenarios:
+                r = asyncio.run(medir(host, puerto, escenario, args.clientes, args.segundos))
+                estados = " ".join(f"{k}:{v}" for k, v in sorted(r["estados"].items()))
+                print(f"{escenario:<10} {r['peticiones']:>10} {r['rps']:>10.0f} "
+                      f"{r['p50_ms']:>7.2f}ms {r['p99_ms']:>7.2f}ms  {estados}")
+        finally:
+            if proceso is not None:
+                proceso.terminate()
+                proceso.wait()
+
+
+if __name__ == "__main__":
+    main()
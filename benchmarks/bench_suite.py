@@ -0,0 +1,320 @@
+# benchmarks/bench_suite.py
+"""
+Suite de rendimiento de los caminos críticos, para comparar entre commits.
+
+Genera tareas.json sintéticos (deterministas) de 1k/10k/100k/1M tareas y mide,
+cada caso en un proceso hijo propio:
+  - Tarea.from_dict                      (diccionarios ya parseados -> Tareas)
+  - TareaRepository.cargar_desde_json    (archivo -> repositorio)
+  - TareaRepository.guardar_en_json      (repositorio -> archivo)
+  - Igual con el formato binario .bin    (abrir mapeado; guardar tras un cambio)
+  - TareaRepository.ordenar_por_fecha    (reordena y persiste)
+  - TareaRepository.ordenadas_por_fecha  (vista ordenada, sin persistir)
+  - AppView.actualizar_lista             (tabla vacía -> llena, y refresco con un cambio)
+  - PDFExporter.exportar / exportar_streaming (solo hasta --pdf-max tareas)
+
+Por caso se informa la mediana y el mínimo del tiempo de varias repeticiones, el
+pico de memoria de Python (tracemalloc, en una pasada aparte para no falsear el
+tiempo) y el pico de RSS del hijo. AppView usa una raíz Tk oculta si hay pantalla;
+si no, un Treeview simulado en memoria.
+
+Uso:
+    python benchmarks/bench_suite.py [--tamanos 1000 10000] [--casos cargar guardar]
+                                     [--salida resultados.json] [--comparar base.json]
+"""
+import sys
+import os
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import argparse
+import gc
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+TAMANOS = (1_000, 10_000, 100_000, 1_000_000)
+PDF_MAX = 10_000  # Exportar 1M de tareas a PDF llevaría horas
+
+
+# --- Casos: caso(archivo, carpeta) -> (preparar, ejecutar); solo se cronometra ejecutar(estado) ---
+# carpeta es un directorio temporal del hijo para las copias que se escriben
+def caso_from_dict(archivo: str, carpeta: str):
+    from models.tarea import Tarea
+    with open(archivo, "r", encoding="utf-8") as f:
+        datos = json.load(f)
+    return (lambda: datos), (lambda d: [Tarea.from_dict(x) for x in d])
+
+
+def caso_cargar(archivo: str, carpeta: str):
+    from data.tarea_repository import TareaRepository
+    return (lambda: TareaRepository(archivo, cargar=False)), (lambda repo: repo.cargar_desde_json())
+
+
+def caso_cargar_bin(archivo: str, carpeta: str):
+    from data.almacenamiento import AlmacenamientoBinario
+    from data.binario import convertir
+    from data.tarea_repository import TareaRepository
+    binario = os.path.join(carpeta, "tareas.bin")
+    convertir(archivo, binario)
+    return ((lambda: TareaRepository(binario, almacenamiento=AlmacenamientoBinario(binario), cargar=False)),
+            (lambda repo: repo.cargar_desde_json()))
+
+
+def caso_guardar_bin(archivo: str, carpeta: str):
+    preparar, cargar = caso_cargar_bin(archivo, carpeta)
+    repo = preparar()
+    cargar(repo)
+    primera = repo.obtener(repo._id_en(0)) if len(repo) else None
+
+    def preparar_cambio():
+        if primera is not None:
+            repo.marcar(primera.id, not primera.completada)  # Un cambio; el resto se copia en crudo
+        return repo
+    return preparar_cambio, (lambda r: r.guardar_en_json())
+
+
+def caso_guardar(archivo: str, carpeta: str):
+    repo = _repositorio_en_copia(archivo, carpeta)
+    return (lambda: repo), (lambda r: r.guardar_en_json())
+
+
+def caso_ordenar(archivo: str, carpeta: str):
+    repo = _repositorio_en_copia(archivo, carpeta)
+    sentido = [False]
+
+    def preparar():
+        sentido[0] = not sentido[0]  # Alternar: ordenar lo ya ordenado sería engañoso
+        return repo
+    return preparar, (lambda r: r.ordenar_por_fecha(ascendente=sentido[0]))
+
+
+def caso_ordenadas(archivo: str, carpeta: str):
+    repo = _repositorio_en_copia(archivo, carpeta)
+    repo.ordenadas_por_fecha(limite=1)  # El índice por fecha se construye una sola vez
+    return (lambda: repo), (lambda r: r.ordenadas_por_fecha(ascendente=False))
+
+
+def caso_vista(archivo: str, carpeta: str):
+    repo = _repositorio_en_copia(archivo, carpeta)
+    tareas = repo.tareas
+    return (lambda: _crear_vista()), (lambda v: v.actualizar_lista(tareas))
+
+
+def caso_vista_cambio(archivo: str, carpeta: str):
+    repo = _repositorio_en_copia(archivo, carpeta)
+    vista = _crear_vista()
+    vista.actualizar_lista(repo.tareas)
+    primera = repo.tareas[0]
+
+    def preparar():
+        primera.completada = not primera.completada  # Una fila cambia; la vista solo lee las Tareas
+        return repo.tareas
+    return preparar, (lambda tareas: vista.actualizar_lista(tareas))
+
+
+def caso_pdf(archivo: str, carpeta: str, streaming: bool = False):
+    from utils.pdf_exporter import PDFExporter
+    repo = _repositorio_en_copia(archivo, carpeta)
+    pendientes = repo.pendientes()
+    ruta = os.path.join(carpeta, "informe.pdf")
+    exportar = PDFExporter.exportar_streaming if streaming else PDFExporter.exportar
+    return (lambda: pendientes), (lambda tareas: exportar(tareas, ruta))
+
+
+CASOS = {
+    "from_dict": caso_from_dict,
+    "cargar": caso_cargar,
+    "guardar": caso_guardar,
+    "cargar_bin": caso_cargar_bin,
+    "guardar_bin": caso_guardar_bin,
+    "ordenar": caso_ordenar,
+    "ordenadas": caso_ordenadas,
+    "vista": caso_vista,
+    "vista_cambio": caso_vista_cambio,
+    "pdf": caso_pdf,
+    "pdf_streaming": lambda archivo, carpeta: caso_pdf(archivo, carpeta, streaming=True),
+}
+CASOS_PDF = ("pdf", "pdf_streaming")
+
+
+def _repositorio_en_copia(archivo: str, carpeta: str):
+    """Repositorio cargado sobre una copia del archivo (los casos que escriben no lo alteran)."""
+    from data.tarea_repository import TareaRepository
+    copia = os.path.join(carpeta, "tareas.json")
+    shutil.copyfile(archivo, copia)
+    return TareaRepository(copia)
+
+
+class _ArbolSimulado:
+    """Sustituto del Treeview sin pantalla: guarda las filas como lo haría Tk."""
+    def __init__(self):
+        self.filas = {}
+        self.orden = []
+
+    def insert(self, padre, indice, iid, values):
+        self.filas[iid] = values
+        self.orden.insert(indice, iid)
+
+    def delete(self, *iids):
+        for iid in iids:
+            del self.filas[iid]
+        quitar = set(iids)
+        self.orden = [iid for iid in self.orden if iid not in quitar]
+
+    def move(self, iid, padre, indice):
+        self.orden.remove(iid)
+        self.orden.insert(indice, iid)
+
+    def item(self, iid, values):
+        self.filas[iid] = values
+
+
+class _BarraSimulada:
+    def set(self, primero, ultimo):
+        pass
+
+
+def _crear_vista():
+    import tkinter as tk
+    from views.app_view import AppView
+    try:
+        root = tk.Tk()
+        root.withdraw()
+        return AppView(root)
+    except tk.TclError:  # Sin pantalla (CI, SSH): misma lógica de diff sobre un árbol simulado
+        vista = AppView.__new__(AppView)
+        vista._tareas_vista, vista._filas, vista._orden_filas = [], {}, []
+        vista._virtual, vista._inicio = False, 0
+        vista.tree, vista.scrollbar = _ArbolSimulado(), _BarraSimulada()
+        vista._filas_visibles = lambda: 15  # Altura configurada del Treeview
+        return vista
+
+
+# --- Ejecución en el proceso hijo ---
+def _pico_rss_kib() -> int:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico // 1024 if sys.platform == "darwin" else pico  # macOS informa bytes
+
+
+def medir_en_hijo(caso: str, archivo: str, n: int, repeticiones: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix="bench_") as carpeta:
+        return _medir(caso, archivo, carpeta, n, repeticiones)
+
+
+def _medir(caso: str, archivo: str, carpeta: str, n: int, repeticiones: int) -> dict:
+    preparar, ejecutar = CASOS[caso](archivo, carpeta)
+    tiempos = []
+    for _ in range(repeticiones):
+        estado = preparar()
+        gc.collect()
+        inicio = time.perf_counter()
+        ejecutar(estado)
+        tiempos.append(time.perf_counter() - inicio)
+    # Pasada aparte con tracemalloc (ralentiza la ejecución, solo se usa para la memoria)
+    estado = preparar()
+    gc.collect()
+    tracemalloc.start()
+    ejecutar(estado)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"caso": caso, "n": n, "repeticiones": repeticiones,
+            "segundos_mediana": statistics.median(tiempos), "segundos_min": min(tiempos),
+            "pico_python_bytes": pico, "pico_rss_kib": _pico_rss_kib()}
+
+
+# --- Proceso principal ---
+def generar_archivo(carpeta: str, n: int) -> str:
+    """tareas.json determinista de n tareas (se reutiliza si ya existe en la carpeta)."""
+    from benchmarks.bench_tarea import generar_datos
+    archivo = os.path.join(carpeta, f"tareas_{n}.json")
+    if not os.path.exists(archivo):
+        with open(archivo, "w", encoding="utf-8") as f:
+            json.dump(generar_datos(n), f, ensure_ascii=False)
+    return archivo
+
+
+def _metadatos() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return {"commit": commit, "python": platform.python_version(),
+            "plataforma": platform.platform(), "fecha": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def _comparar(resultados: list, archivo_base: str):
+    with open(archivo_base, "r", encoding="utf-8") as f:
+        base = {(r["caso"], r["n"]): r for r in json.load(f)["resultados"]}
+    print(f"\nComparación con {archivo_base} (tiempo actual / base):")
+    for r in resultados:
+        anterior = base.get((r["caso"], r["n"]))
+        if anterior and anterior["segundos_mediana"]:
+            ratio = r["segundos_mediana"] / anterior["segundos_mediana"]
+            aviso = "  ⚠️ regresión" if ratio > 1.10 else ""
+            print(f"{r['caso']:<14} {r['n']:>9}  x{ratio:.2f}{aviso}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de rendimiento de la lista de deberes.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS))
+    parser.add_argument("--casos", nargs="+", choices=list(CASOS), default=list(CASOS))
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--pdf-max", type=int, default=PDF_MAX,
+                        help="tamaño máximo para los casos de PDF")
+    parser.add_argument("--datos", help="carpeta donde generar/reutilizar los tareas.json sintéticos")
+    parser.add_argument("--salida", help="escribir los resultados en este JSON")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior para comparar")
+    parser.add_argument("--hijo", nargs=3, metavar=("CASO", "ARCHIVO", "N"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.hijo:
+        caso, archivo, n = args.hijo
+        print(json.dumps(medir_en_hijo(caso, archivo, int(n), args.repeticiones)))
+        return
+
+    carpeta = args.datos or tempfile.mkdtemp(prefix="bench_datos_")
+    os.makedirs(carpeta, exist_ok=True)
+    resultados = []
+    print(f"{'caso':<14} {'tareas':>9} {'mediana':>11} {'mínimo':>11} {'pico Python':>13} {'pico RSS':>11}")
+    for n in args.tamanos:
+        archivo = generar_archivo(carpeta, n)
+        for caso in args.casos:
+            if caso in CASOS_PDF and n > args.pdf_max:
+                continue
+            proceso = subprocess.run(
+                [sys.executable, __file__, "--hijo", caso, archivo, str(n),
+                 "--repeticiones", str(args.repeticiones)],
+                capture_output=True, text=True)
+            if proceso.returncode != 0:
+                error = (proceso.stderr.strip().splitlines() or ["?"])[-1]
+                print(f"{caso:<14} {n:>9}  (falló: {error})")
+                continue
+            r = json.loads(proceso.stdout.strip().splitlines()[-1])
+            resultados.append(r)
+            print(f"{caso:<14} {n:>9} {r['segundos_mediana'] * 1000:>9.1f}ms "
+                  f"{r['segundos_min'] * 1000:>9.1f}ms {r['pico_python_bytes'] / 2**20:>9.1f} MiB "
+                  f"{r['pico_rss_kib'] / 1024:>7.1f} MiB")
+    if not args.datos:
+        shutil.rmtree(carpeta, ignore_errors=True)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump({"meta": _metadatos(), "resultados": resultados}, f, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {args.salida}")
+    if args.comparar:
+        _comparar(resultados, args.comparar)
+
+
+if __name__ == "__main__":
+    main()
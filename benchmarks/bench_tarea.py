@@ -0,0 +1,85 @@
+# benchmarks/bench_tarea.py
+"""
+Compara memoria y tiempo de carga/orden de:
+  - Tarea "clásica" (clase con __dict__ y strptime en cada construcción)
+  - Tarea con __slots__ y fecha cacheada como ordinal (models.tarea)
+  - TareasColumnar (una columna por campo)
+
+Uso: python benchmarks/bench_tarea.py [n_tareas]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gc
+import random
+import time
+import tracemalloc
+from datetime import datetime, date, timedelta
+
+from models.tarea import Tarea
+from models.tareas_columnar import TareasColumnar
+
+
+class TareaClasica:
+    """Réplica del modelo anterior (con __dict__), solo para comparar."""
+    def __init__(self, titulo, descripcion="", fecha_limite="", completada=False, id=""):
+        self.id = id
+        self.titulo = titulo.strip()
+        self.descripcion = descripcion.strip()
+        self.fecha_limite = datetime.strptime(fecha_limite, "%Y-%m-%d").strftime("%Y-%m-%d") if fecha_limite else ""
+        self.completada = bool(completada)
+
+
+def generar_datos(n: int, semilla: int = 42) -> list:
+    rnd = random.Random(semilla)
+    base = date(2025, 1, 1)
+    return [{
+        "id": f"{i:032x}",
+        "titulo": f"Tarea {i}",
+        "descripcion": "Descripción de prueba " * rnd.randint(0, 3),
+        "fecha_limite": "" if rnd.random() < 0.1 else (base + timedelta(days=rnd.randint(0, 730))).isoformat(),
+        "completada": rnd.random() < 0.3,
+    } for i in range(n)]
+
+
+def medir(nombre: str, funcion):
+    """
+    Tiempo en una pasada sin tracemalloc (ralentiza cada asignación, y mucho más
+    a los casos que más asignan); la memoria que retiene el resultado, en otra.
+    """
+    gc.collect()
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcion()
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{nombre:<34} {segundos * 1000:>10.1f} ms {memoria / 2**20:>10.1f} MiB")
+    return resultado
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    datos = generar_datos(n)
+    print(f"{n} tareas")
+    print(f"{'caso':<34} {'tiempo':>13} {'memoria':>14}")
+
+    clasicas = medir("carga Tarea clásica", lambda: [TareaClasica(**d) for d in datos])
+    medir("orden clásico (int(replace))", lambda: sorted(
+        clasicas, key=lambda t: int(t.fecha_limite.replace("-", "")) if t.fecha_limite else float("inf")))
+    del clasicas
+
+    slots = medir("carga Tarea __slots__ (from_dict)", lambda: [Tarea.from_dict(d) for d in datos])
+    medir("orden por ordinal", lambda: sorted(
+        slots, key=lambda t: t.ordinal or float("inf")))
+    del slots
+
+    columnas = medir("carga TareasColumnar", lambda: TareasColumnar.desde_dicts(datos)[0])
+    medir("Tareas desde columnas", lambda: list(columnas.tareas()))
+
+
+if __name__ == "__main__":
+    main()
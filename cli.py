@@ -0,0 +1,246 @@
+# cli.py
+"""
+Modo sin interfaz gráfica: opera sobre el repositorio y el exportador PDF
+directamente, sin tkinter. Los módulos pesados (reportlab, csv, fechas) solo
+se importan en los comandos que los necesitan.
+
+Ejemplos:
+    python cli.py agregar "Estudiar árboles" -d "Cap. 5" -f 2025-06-01
+    python cli.py importar tareas.csv
+    python cli.py listar --pendientes --limite 20
+    python cli.py marcar 3f2a 9b1c
+    python cli.py limpiar
+    python cli.py archivar --dias 30
+    python cli.py historial --limite 20
+    python cli.py exportar informe.pdf
+    python cli.py convertir tareas.json tareas.bin
+"""
+import argparse
+import os
+import sys
+
+
+def _abrir_repositorio(args):
+    from data.fabrica import crear_repositorio
+    # Asíncrono: las ráfagas (p. ej. importar) se agrupan en una única escritura al cerrar
+    return crear_repositorio(args.archivo, diario=args.diario, asincrono=True)
+
+
+def _resolver_id(repo, prefijo: str) -> str:
+    """Acepta el id completo o un prefijo único (como los que muestra 'listar')."""
+    try:
+        return repo.obtener(prefijo).id
+    except KeyError:
+        pass
+    candidatos = [t.id for t in repo.tareas if t.id.startswith(prefijo)]
+    if len(candidatos) != 1:
+        motivo = "no existe" if not candidatos else "es ambiguo"
+        raise KeyError(f"El id '{prefijo}' {motivo}.")
+    return candidatos[0]
+
+
+def _linea(t) -> str:
+    estado = "✅" if t.completada else "⏳"
+    return f"{t.id[:8]}  {estado}  {t.fecha_limite or '—':<10}  {t.titulo}"
+
+
+# --- Comandos ---
+def cmd_agregar(args, repo) -> int:
+    from models.tarea import Tarea
+    tarea = Tarea(titulo=args.titulo, descripcion=args.descripcion, fecha_limite=args.fecha)
+    repo.agregar(tarea)
+    print(f"✅ Tarea '{tarea.titulo}' añadida ({tarea.id[:8]}).")
+    return 0
+
+
+def cmd_importar(args, repo) -> int:
+    from models.tareas_columnar import TareasColumnar
+    columnas, rechazadas = TareasColumnar.desde_dicts(_leer_registros(args.origen))
+    anadidas = 0
+    with repo.lote():  # Una sola confirmación para todo el archivo
+        for posicion, tarea in enumerate(columnas.tareas()):
+            if args.ids_nuevos:
+                tarea.id = tarea.nuevo_id()
+            try:
+                repo.agregar(tarea)
+                anadidas += 1
+            except ValueError as e:  # Id ya presente en el repositorio
+                rechazadas.append((posicion, str(e)))
+    print(f"✅ {anadidas} tareas importadas de {args.origen}, {len(rechazadas)} rechazadas.")
+    for posicion, motivo in rechazadas[:20]:
+        print(f"  ⚠️ #{posicion}: {motivo}", file=sys.stderr)
+    return 1 if rechazadas else 0
+
+
+def cmd_marcar(args, repo) -> int:
+    tareas = [repo.obtener(_resolver_id(repo, i)) for i in args.ids]
+    with repo.lote():
+        for tarea in tareas:
+            nuevo_estado = not tarea.completada
+            repo.marcar(tarea.id, nuevo_estado)
+            print(f"{'✅ Completada' if nuevo_estado else '⏳ Pendiente'}: {tarea.titulo}")
+    return 0
+
+
+def cmd_eliminar(args, repo) -> int:
+    for tarea in repo.eliminar_varias([_resolver_id(repo, i) for i in args.ids]):
+        print(f"🗑️ Tarea '{tarea.titulo}' eliminada.")
+    return 0
+
+
+def cmd_limpiar(args, repo) -> int:
+    print(f"🧹 {repo.limpiar_completadas()} tareas completadas eliminadas.")
+    return 0
+
+
+def cmd_archivar(args, repo) -> int:
+    print(f"📜 {repo.archivar_completadas(args.dias)} tareas completadas pasadas al historial.")
+    return 0
+
+
+def cmd_historial(args, repo) -> int:
+    for t in repo.historial(args.limite):
+        print(f"{t.id[:8]}  {t.fecha_completada or '—':<10}  {t.titulo}")
+    return 0
+
+
+def cmd_listar(args, repo) -> int:
+    if args.pendientes:
+        tareas = repo.pendientes(ascendente=True, limite=args.limite, desplazamiento=args.desde)
+    else:
+        fin = None if args.limite is None else args.desde + args.limite
+        tareas = repo.en_orden()[args.desde:fin]
+    if args.json:
+        import json
+        for t in tareas:
+            print(json.dumps(t.to_dict(), ensure_ascii=False))
+    else:
+        for t in tareas:
+            print(_linea(t))
+    return 0
+
+
+def cmd_exportar(args, repo) -> int:
+    from utils.cache_pdf import crear_cache_pdf
+    from utils.pdf_exporter import PDFExporter, REPORTLAB_AVAILABLE
+    if not REPORTLAB_AVAILABLE:
+        print("❌ reportlab no está instalado. Ejecuta: pip install reportlab", file=sys.stderr)
+        return 1
+    tareas = repo.pendientes(ascendente=True)
+    if not tareas:
+        print("ℹ️ No hay tareas pendientes para exportar.")
+        return 0
+    carpeta = os.path.dirname(args.destino)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    exportar = PDFExporter.exportar_paralelo if args.paralelo else PDFExporter.exportar_streaming
+    cache = None if args.sin_cache else crear_cache_pdf()
+    if cache is None:
+        exportar(tareas, args.destino)
+    elif cache.exportar(tareas, args.destino, lambda ruta: exportar(tareas, ruta),
+                        formato="paralelo" if args.paralelo else "streaming"):
+        print(f"✅ PDF copiado de la caché: {args.destino} ({len(tareas)} tareas, sin cambios)")
+        return 0
+    print(f"✅ PDF generado: {args.destino} ({len(tareas)} tareas)")
+    return 0
+
+
+def cmd_convertir(args, repo) -> int:
+    from data.binario import convertir
+    print(f"🔁 {convertir(args.origen, args.destino)} tareas escritas en {args.destino}")
+    return 0
+
+
+def _leer_registros(ruta: str):
+    """Registros (dict) desde CSV con cabecera o JSONL (una tarea por línea)."""
+    if ruta.lower().endswith(".csv"):
+        import csv
+        with open(ruta, "r", encoding="utf-8-sig", newline="") as f:
+            for fila in csv.DictReader(f):
+                fila["completada"] = fila.get("completada", "").strip().lower() in ("1", "true", "sí", "si", "x")
+                yield fila
+    else:
+        import json
+        with open(ruta, "r", encoding="utf-8") as f:
+            for linea in f:
+                if linea.strip():
+                    yield json.loads(linea)
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    from data.archivo import DIAS_ARCHIVO
+    # Mismo umbral que la interfaz gráfica (TAREAS_ARCHIVAR_DIAS)
+    dias_archivo = int(os.environ.get("TAREAS_ARCHIVAR_DIAS", DIAS_ARCHIVO))
+    parser = argparse.ArgumentParser(prog="cli.py", description="Lista de deberes sin interfaz gráfica.")
+    parser.add_argument("--archivo", default=os.environ.get("TAREAS_ARCHIVO", "tareas.json"),
+                        help="tareas.json (por defecto), binario .bin o una base .db/.sqlite")
+    parser.add_argument("--diario", action="store_true", help="usar el backend con diario append-only")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("agregar", help="añadir una tarea")
+    p.add_argument("titulo")
+    p.add_argument("-d", "--descripcion", default="")
+    p.add_argument("-f", "--fecha", default="", help="AAAA-MM-DD")
+    p.set_defaults(funcion=cmd_agregar)
+
+    p = sub.add_parser("importar", help="importar tareas desde CSV o JSONL")
+    p.add_argument("origen")
+    p.add_argument("--ids-nuevos", action="store_true", help="ignorar los ids del archivo de origen")
+    p.set_defaults(funcion=cmd_importar)
+
+    p = sub.add_parser("marcar", help="alternar completada/pendiente")
+    p.add_argument("ids", nargs="+", metavar="id", help="id o prefijo único")
+    p.set_defaults(funcion=cmd_marcar)
+
+    p = sub.add_parser("eliminar", help="eliminar tareas")
+    p.add_argument("ids", nargs="+", metavar="id", help="id o prefijo único")
+    p.set_defaults(funcion=cmd_eliminar)
+
+    p = sub.add_parser("limpiar", help="eliminar todas las tareas completadas")
+    p.set_defaults(funcion=cmd_limpiar)
+
+    p = sub.add_parser("archivar", help="pasar al historial las completadas antiguas")
+    p.add_argument("--dias", type=int, default=dias_archivo,
+                   help=f"días desde que se completaron ({dias_archivo})")
+    p.set_defaults(funcion=cmd_archivar)
+
+    p = sub.add_parser("historial", help="listar tareas archivadas, más recientes primero")
+    p.add_argument("--limite", type=int, default=None)
+    p.set_defaults(funcion=cmd_historial)
+
+    p = sub.add_parser("listar", help="listar tareas")
+    p.add_argument("--pendientes", action="store_true", help="solo pendientes, más próximas primero")
+    p.add_argument("--limite", type=int, default=None)
+    p.add_argument("--desde", type=int, default=0)
+    p.add_argument("--json", action="store_true", help="una tarea JSON por línea")
+    p.set_defaults(funcion=cmd_listar)
+
+    p = sub.add_parser("exportar", help="exportar pendientes a PDF")
+    p.add_argument("destino")
+    p.add_argument("--paralelo", action="store_true", help="renderizar en varios procesos")
+    p.add_argument("--sin-cache", action="store_true", help="renderizar aunque la lista no haya cambiado")
+    p.set_defaults(funcion=cmd_exportar)
+
+    p = sub.add_parser("convertir", help="convertir entre JSON y el formato binario .bin")
+    p.add_argument("origen")
+    p.add_argument("destino", help="extensión .bin para binario; cualquier otra, JSON")
+    p.set_defaults(funcion=cmd_convertir, repositorio=False)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = crear_parser().parse_args(argv)
+    repo = _abrir_repositorio(args) if getattr(args, "repositorio", True) else None
+    try:
+        return args.funcion(args, repo)
+    except (KeyError, ValueError, OSError) as e:
+        mensaje = e.args[0] if isinstance(e, KeyError) and e.args else e
+        print(f"❌ {mensaje}", file=sys.stderr)
+        return 1
+    finally:
+        if repo is not None:
+            repo.cerrar()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+# data/almacenamiento.py
+import glob
+import json
+import os
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+from data.bloqueo import BloqueoArchivo, ConflictoEscritura, firma
+from data.cargador import LectorSnapshot
+
+
+class AlmacenamientoJSON:
+    """
+    Backend de persistencia clásico: reescribe el archivo JSON completo.
+    ✅ Compatible con el formato histórico de tareas.json (lista de objetos)
+    ✅ Escritura atómica: archivo temporal + fsync + os.replace
+    ✅ Modo asíncrono opcional: las mutaciones solo marcan el estado como sucio
+       y un hilo de fondo agrupa las ráfagas en una única escritura
+    ✅ Compartible entre procesos: cerrojo de archivo en cada escritura y firma
+       (mtime, tamaño, inodo) para detectar cambios ajenos sin releer el archivo
+    ✅ El hilo de fondo nunca recorre la colección viva: copia las tareas con
+       `memoria` tomado, el mismo cerrojo que toma el repositorio al mutarlas
+    """
+    def __init__(self, archivo_json: str = "tareas.json", asincrono: bool = False,
+                 espera: float = 0.5):
+        self.archivo_json = archivo_json
+        self.asincrono = asincrono
+        self.espera = espera                 # Segundos sin cambios antes de escribir
+        self._condicion = threading.Condition()
+        self._pendiente = None               # Última vista de tareas sin guardar
+        self._version = 0                    # Cambios registrados
+        self._guardada = 0                   # Último cambio ya en disco
+        self._detener = False
+        self._escritor: threading.Thread = None
+        self._escritura = threading.Lock()   # Serializa snapshot + escritura
+        self.bloqueo = BloqueoArchivo(archivo_json)  # Siempre antes que _escritura
+        # Cerrojo de las tareas en memoria (lo comparte el repositorio); siempre el último en tomarse
+        self.memoria = threading.RLock()
+        self.firma = None                    # Archivo tal como lo leímos o escribimos
+
+    @property
+    def sucio(self) -> bool:
+        return self._guardada < self._version
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def confirmada(self) -> int:
+        """Último cambio registrado que ya está en disco."""
+        return self._guardada
+
+    def cambiado(self) -> bool:
+        """True si otro proceso escribió el archivo desde nuestra última lectura/escritura (un stat)."""
+        return firma(self.archivo_json) != self.firma
+
+    def cargar(self) -> Tuple[List[dict], List[dict]]:
+        """Devuelve (datos del snapshot, operaciones pendientes de reproducir)."""
+        self.firma = firma(self.archivo_json)  # Antes de leer: un cambio a mitad se verá luego
+        return _leer_snapshot(self.archivo_json)[1], []
+
+    def cargar_incremental(self) -> Tuple[Iterable[dict], Callable[[], List[dict]]]:
+        """Devuelve (registros leídos por bloques, función que da las operaciones a reproducir)."""
+        self.firma = firma(self.archivo_json)
+        return _registros(self.archivo_json), list
+
+    def releer(self) -> Optional[List[dict]]:
+        """Como cargar(), pero propaga los errores de lectura; None si el archivo no existe."""
+        self.firma = firma(self.archivo_json)
+        if self.firma is None:
+            return None
+        with open(self.archivo_json, "r", encoding="utf-8") as f:
+            datos = json.load(f)
+        return datos.get("tareas", []) if isinstance(datos, dict) else datos
+
+    def guardar(self, tareas: list):
+        with self.bloqueo, self._escritura:
+            with self._condicion:
+                version = self._version
+            self._escribir_comprobado(tareas)
+            self._confirmar(version)
+
+    def registrar(self, operacion: dict, tareas: list):
+        """Persiste una operación; equivale a reescribir todo el archivo (ahora o en diferido)."""
+        if not self.asincrono:
+            self._version += 1
+            self.guardar(tareas)
+            return
+        with self._condicion:
+            self._version += 1
+            self._pendiente = tareas
+            if self._escritor is None:
+                self._escritor = threading.Thread(target=self._bucle_escritor, daemon=True)
+                self._escritor.start()
+            self._condicion.notify_all()
+
+    def vaciar(self, timeout: float = None) -> bool:
+        """Espera (sin debounce) a que los cambios registrados estén en disco."""
+        limite = None if timeout is None else time.monotonic() + timeout
+        with self._condicion:
+            while self.sucio and self._escritor is not None and self._escritor.is_alive():
+                if limite is not None and time.monotonic() >= limite:
+                    break
+                self._condicion.notify_all()  # Corta la espera del debounce
+                self._condicion.wait(0.05)
+            return not self.sucio
+
+    def cerrar(self, tareas: list):
+        if self._escritor is not None:
+            with self._condicion:
+                self._detener = True
+                self._condicion.notify_all()
+            self._escritor.join()
+            self._escritor = None
+            self._detener = False
+        if self.sucio:
+            self.guardar(tareas)
+
+    def _confirmar(self, version: int):
+        with self._condicion:
+            self._guardada = max(self._guardada, version)
+            self._condicion.notify_all()
+
+    def _escribir_comprobado(self, tareas):
+        """Con el cerrojo tomado: escribe solo si nadie más lo hizo desde nuestra última lectura."""
+        if self.cambiado():
+            raise ConflictoEscritura(f"{self.archivo_json} cambió en otro proceso.")
+        with self.memoria:
+            datos = self._instantanea(tareas)
+        self._escribir(datos)
+        self.firma = firma(self.archivo_json)
+
+    def _instantanea(self, tareas) -> list:
+        """Copia fija de las tareas (con `memoria` tomado): lo que se serializa después."""
+        return [t.to_dict() for t in tareas]
+
+    def _escribir(self, datos: list):
+        _escribir_atomico(self.archivo_json, datos, indent=4)
+
+    def _bucle_escritor(self):
+        while True:
+            with self._condicion:
+                while not self.sucio and not self._detener:
+                    self._condicion.wait()
+                if not self.sucio:
+                    return
+                # Debounce: esperar a que la ráfaga de cambios se calme
+                while not self._detener:
+                    version = self._version
+                    self._condicion.wait(self.espera)
+                    if self._version == version:
+                        break
+                version, tareas = self._version, self._pendiente
+            try:
+                with self.bloqueo, self._escritura:
+                    self._escribir_comprobado(tareas)
+                    self._confirmar(version)  # Aún con el cerrojo: quien lo tome después lo ve
+            except ConflictoEscritura:
+                pass  # El repositorio incorpora el cambio ajeno (sincronizar) y se reintenta
+            except Exception as e:
+                print(f"[❌] Error al guardar en {self.archivo_json}: {e}")  # Se reintentará
+            with self._condicion:
+                if self._detener:
+                    return  # cerrar() hace el último guardado síncrono si hace falta
+
+
+class AlmacenamientoBinario(AlmacenamientoJSON):
+    """
+    Backend con el formato binario de data.binario (tareas.bin).
+    ✅ abrir() mapea el archivo y devuelve las tareas sin decodificarlas (TareasPerezosas)
+    ✅ Al guardar, las tareas que no se llegaron a leer se copian en crudo
+    ✅ Mismo guardado síncrono/asíncrono y atómico que AlmacenamientoJSON
+    ✅ Migración única desde el tareas.json existente
+    """
+    def __init__(self, archivo: str = "tareas.bin", asincrono: bool = False,
+                 espera: float = 0.5, migrar_desde: Optional[str] = "tareas.json"):
+        super().__init__(archivo, asincrono=asincrono, espera=espera)
+        self.migrar_desde = migrar_desde
+
+    def abrir(self):
+        """Tareas del archivo como TareasPerezosas (None si todavía no existe)."""
+        from data.binario import LectorBinario, TareasPerezosas, convertir
+        with self.bloqueo:
+            if not os.path.exists(self.archivo_json):
+                self.firma = None
+                if not (self.migrar_desde and os.path.exists(self.migrar_desde)):
+                    return None
+                n = convertir(self.migrar_desde, self.archivo_json)
+                print(f"[ℹ️] Migradas {n} tareas desde {self.migrar_desde} a {self.archivo_json}")
+            self.firma = firma(self.archivo_json)
+            return TareasPerezosas(LectorBinario(self.archivo_json))
+
+    def cargar(self) -> Tuple[List[dict], List[dict]]:
+        return self.releer() or [], []
+
+    def releer(self) -> Optional[List[dict]]:
+        tareas = self.abrir()
+        if tareas is None:
+            return None
+        try:
+            return list(tareas.lector.registros())
+        finally:
+            tareas.lector.cerrar()
+
+    def cargar_incremental(self) -> Tuple[Iterable[dict], Callable[[], List[dict]]]:
+        tareas = self.abrir()
+        return ([] if tareas is None else tareas.lector.registros()), list
+
+    def _instantanea(self, tareas) -> tuple:
+        from data.binario import instantanea
+        mapeadas = getattr(tareas, "tareas", None)
+        if os.name == "nt" and mapeadas is not None:
+            mapeadas.materializar()  # Windows no reemplaza un archivo que sigue mapeado
+        return instantanea(tareas)
+
+    def _escribir(self, datos: tuple):
+        from data.binario import escribir_instantanea
+        escribir_instantanea(self.archivo_json, datos)
+
+
+class AlmacenamientoDiario:
+    """
+    Backend con diario de operaciones (append-only) y compactación periódica.
+    ✅ Cada mutación añade una línea al diario: O(1) escrituras
+    ✅ Al arrancar se carga el snapshot y se reproduce la cola del diario
+    ✅ La compactación escribe un snapshot nuevo en un hilo de fondo
+
+    Archivos:
+        tareas.json              -> snapshot {"generacion": g, "tareas": [...]}
+        tareas.json.<g>.log      -> operaciones posteriores al snapshot (JSONL)
+
+    Un snapshot de generación g incluye todas las operaciones de diarios con
+    generación < g, así que un corte a mitad de compactación nunca pierde
+    ni duplica operaciones.
+    """
+    def __init__(self, archivo_json: str = "tareas.json", umbral_compactacion: int = 1000):
+        self.archivo_json = archivo_json
+        self.umbral_compactacion = umbral_compactacion
+        self._generacion = 0
+        self._operaciones = 0
+        self._diario = None
+        self._lock = threading.Lock()
+        self._compactador: threading.Thread = None
+
+    def _ruta_diario(self, generacion: int) -> str:
+        return f"{self.archivo_json}.{generacion}.log"
+
+    def _diarios_existentes(self) -> List[Tuple[int, str]]:
+        diarios = []
+        for ruta in glob.glob(glob.escape(self.archivo_json) + ".*.log"):
+            sufijo = ruta[len(self.archivo_json) + 1:-len(".log")]
+            if sufijo.isdigit():
+                diarios.append((int(sufijo), ruta))
+        return sorted(diarios)
+
+    def cargar(self) -> Tuple[List[dict], List[dict]]:
+        generacion, datos = _leer_snapshot(self.archivo_json)
+        return datos, self._leer_diarios(generacion)
+
+    def cargar_incremental(self) -> Tuple[Iterable[dict], Callable[[], List[dict]]]:
+        """El snapshot se lee por bloques; el diario, cuando el snapshot ya se consumió."""
+        lector = _registros(self.archivo_json)
+        return lector, lambda: self._leer_diarios(getattr(lector, "generacion", 0))
+
+    def _leer_diarios(self, generacion: int) -> List[dict]:
+        operaciones = []
+        ultima = generacion
+        for gen, ruta in self._diarios_existentes():
+            if gen < generacion:
+                # Ya incluido en el snapshot (compactación interrumpida)
+                os.remove(ruta)
+                continue
+            ultima = max(ultima, gen)
+            with open(ruta, "rb+") as f:
+                inicio = 0
+                for linea in f:
+                    completa = linea.endswith(b"\n")
+                    if linea.strip():
+                        try:
+                            operaciones.append(json.loads(linea))
+                        except ValueError:
+                            print(f"[⚠️] Operación ilegible en {ruta}, se ignora.")
+                            if not completa:
+                                # Última línea truncada por un corte: se recorta para que
+                                # la siguiente operación no se escriba pegada a ella
+                                f.truncate(inicio)
+                                completa = True
+                        if not completa:
+                            f.write(b"\n")  # Operación entera a la que le faltó el salto
+                    inicio += len(linea)
+        self._generacion = ultima
+        self._operaciones = len(operaciones)
+        return operaciones
+
+    def _abrir_diario(self):
+        if self._diario is None:
+            self._diario = open(self._ruta_diario(self._generacion), "a", encoding="utf-8")
+        return self._diario
+
+    def guardar(self, tareas: list):
+        """Guardado completo: compacta de forma síncrona."""
+        self._esperar_compactacion()
+        with self._lock:
+            self._rotar()
+            copia = [t.to_dict() for t in tareas]
+        self._escribir_snapshot(self._generacion, copia)
+
+    def registrar(self, operacion: dict, tareas: list):
+        with self._lock:
+            diario = self._abrir_diario()
+            diario.write(json.dumps(operacion, ensure_ascii=False) + "\n")
+            diario.flush()
+            self._operaciones += 1
+            compactar = (self._operaciones >= self.umbral_compactacion
+                         and not self._compactando())
+            if compactar:
+                self._rotar()
+                # Copia en este hilo: el compactador no debe leer Tareas que se siguen editando
+                copia = [t.to_dict() for t in tareas]
+        if compactar:
+            self._compactador = threading.Thread(
+                target=self._escribir_snapshot, args=(self._generacion, copia), daemon=True)
+            self._compactador.start()
+
+    def cerrar(self, tareas: list):
+        self._esperar_compactacion()
+        if self._operaciones:
+            self.guardar(tareas)
+        with self._lock:
+            if self._diario is not None:
+                self._diario.close()
+                self._diario = None
+
+    # --- Compactación ---
+    def _compactando(self) -> bool:
+        return self._compactador is not None and self._compactador.is_alive()
+
+    def _esperar_compactacion(self):
+        if self._compactador is not None:
+            self._compactador.join()
+            self._compactador = None
+
+    def _rotar(self):
+        """Cierra el diario actual y empieza una generación nueva (con el lock tomado)."""
+        if self._diario is not None:
+            self._diario.close()
+            self._diario = None
+        self._generacion += 1
+        self._operaciones = 0
+
+    def _escribir_snapshot(self, generacion: int, tareas: List[dict]):
+        try:
+            datos = {"generacion": generacion, "tareas": tareas}
+            _escribir_atomico(self.archivo_json, datos)
+            for gen, ruta in self._diarios_existentes():
+                if gen < generacion:
+                    os.remove(ruta)
+        except Exception as e:
+            print(f"[❌] Error al compactar {self.archivo_json}: {e}")
+
+
+def _escribir_atomico(ruta: str, datos, indent: int = None):
+    """Escribe en un temporal, lo sincroniza y lo renombra: nunca deja el archivo a medias."""
+    temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+
+
+def _registros(archivo_json: str) -> Iterable[dict]:
+    """Lector por bloques del snapshot (vacío si el archivo no existe)."""
+    if not os.path.exists(archivo_json):
+        return []
+    return LectorSnapshot(archivo_json)
+
+
+def _leer_snapshot(archivo_json: str) -> Tuple[int, List[dict]]:
+    """Lee tareas.json en formato lista (histórico) o snapshot con generación."""
+    if not os.path.exists(archivo_json):
+        return 0, []
+    try:
+        with open(archivo_json, "r", encoding="utf-8") as f:
+            datos = json.load(f)
+    except (json.JSONDecodeError, FileNotFoundError, PermissionError) as e:
+        print(f"[❌] Error al cargar {archivo_json}: {e}")
+        return 0, []
+    if isinstance(datos, dict):
+        return int(datos.get("generacion", 0)), datos.get("tareas", [])
+    return 0, datos
@@ -0,0 +1,135 @@
+# data/archivo.py
+import json
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+from models.tarea import Tarea, _normalizar_fecha
+from data.almacenamiento import _escribir_atomico
+
+_PARTICION = re.compile(r"(\d{4}-\d{2})\.json\Z")
+# Días que una tarea completada sigue en el archivo de trabajo antes de archivarse
+DIAS_ARCHIVO = 30
+
+
+class ArchivoTareas:
+    """
+    Nivel frío: tareas completadas sacadas del archivo de trabajo.
+    ✅ Particionado por mes de finalización (una lista JSON por mes: 2025-03.json)
+    ✅ Carga perezosa: solo se lee una partición cuando se consulta el historial
+    ✅ Escritura atómica e idempotente (fusiona por id: reintentar no duplica)
+    """
+    def __init__(self, carpeta: str):
+        self.carpeta = carpeta
+        self._cache: Dict[str, List[Tarea]] = {}
+
+    @classmethod
+    def junto_a(cls, archivo: str) -> "ArchivoTareas":
+        """Archivo asociado a tareas.json / tareas.db: carpeta tareas_archivo/ al lado."""
+        return cls(os.path.splitext(archivo)[0] + "_archivo")
+
+    def particiones(self) -> List[str]:
+        """Meses archivados ("AAAA-MM"), del más reciente al más antiguo, sin leerlos."""
+        try:
+            nombres = os.listdir(self.carpeta)
+        except FileNotFoundError:
+            return []
+        return sorted((m[1] for m in map(_PARTICION.match, nombres) if m), reverse=True)
+
+    def cargar(self, particion: str) -> List[Tarea]:
+        """Tareas de un mes (cacheadas tras la primera lectura)."""
+        if particion not in self._cache:
+            ruta = self._ruta(particion)
+            try:
+                with open(ruta, "r", encoding="utf-8") as f:
+                    datos = json.load(f)
+            except FileNotFoundError:
+                datos = []
+            except (json.JSONDecodeError, PermissionError) as e:
+                print(f"[❌] Error al leer el archivo {ruta}: {e}")
+                datos = []
+            tareas = []
+            for item in datos:
+                try:
+                    tareas.append(Tarea.from_dict(item))
+                except ValueError as e:
+                    print(f"[⚠️] Tarea archivada ignorada en {ruta}: {e}")
+            self._cache[particion] = tareas
+        return list(self._cache[particion])
+
+    def historial(self, limite: Optional[int] = None, despues_de: Optional[Tarea] = None) -> Iterator[Tarea]:
+        """
+        Completadas de la más reciente a la más antigua, leyendo meses solo según se necesitan.
+        despues_de: última tarea de la página anterior; se sigue justo detrás de ella
+        aunque entretanto se hayan quitado tareas del archivo.
+        """
+        cursor = None if despues_de is None else _clave_orden(despues_de)
+        entregadas = 0
+        for particion in self.particiones():
+            if cursor is not None and particion > cursor[0]:
+                continue  # Mes ya recorrido en páginas anteriores: ni se ordena
+            tareas = sorted(self.cargar(particion), key=_clave_orden, reverse=True)
+            if cursor is not None and particion == cursor[0]:
+                tareas = [t for t in tareas if _clave_orden(t) < cursor]
+            for tarea in tareas:
+                if limite is not None and entregadas >= limite:
+                    return
+                yield tarea
+                entregadas += 1
+
+    def archivar(self, tareas: Iterable[Tarea]):
+        """Añade las tareas a la partición de su mes (se escriben antes de borrarlas del nivel caliente)."""
+        por_mes: Dict[str, List[Tarea]] = {}
+        for tarea in tareas:
+            por_mes.setdefault(_particion_de(tarea), []).append(tarea)
+        if not por_mes:
+            return
+        os.makedirs(self.carpeta, exist_ok=True)
+        for particion, nuevas in por_mes.items():
+            existentes = {t.id: t for t in self.cargar(particion)}
+            existentes.update((t.id, t) for t in nuevas)
+            self._escribir(particion, list(existentes.values()))
+
+    def quitar(self, tareas: Iterable[Tarea]):
+        """Borra tareas del archivo (ya devueltas al nivel caliente)."""
+        por_mes: Dict[str, set] = {}
+        for tarea in tareas:
+            por_mes.setdefault(_particion_de(tarea), set()).add(tarea.id)
+        for particion, ids in por_mes.items():
+            tareas_mes = self.cargar(particion)
+            restantes = [t for t in tareas_mes if t.id not in ids]
+            if len(restantes) != len(tareas_mes):
+                self._escribir(particion, restantes)
+
+    def _escribir(self, particion: str, tareas: List[Tarea]):
+        ruta = self._ruta(particion)
+        if tareas:
+            _escribir_atomico(ruta, [t.to_dict() for t in tareas], indent=4)
+        elif os.path.exists(ruta):
+            os.remove(ruta)
+        self._cache[particion] = tareas
+
+    def _ruta(self, particion: str) -> str:
+        return os.path.join(self.carpeta, f"{particion}.json")
+
+
+def es_archivable(tarea: Tarea, limite: int) -> bool:
+    """Completada con fecha de referencia en o antes del ordinal límite (o sin ninguna fecha)."""
+    if not tarea.completada:
+        return False
+    if tarea.fecha_completada:
+        return _normalizar_fecha(tarea.fecha_completada)[1] <= limite
+    return not tarea.ordinal or tarea.ordinal <= limite
+
+
+def _particion_de(tarea: Tarea) -> str:
+    return _clave_archivo(tarea)[:7] or "0000-00"  # Sin fecha alguna: partición aparte
+
+
+def _clave_orden(tarea: Tarea) -> tuple:
+    """Orden total del historial (mes, fecha, id): un id no se repite dentro de un mes."""
+    return _particion_de(tarea), _clave_archivo(tarea), tarea.id
+
+
+def _clave_archivo(tarea: Tarea) -> str:
+    """Fecha de referencia: la de finalización o, en datos antiguos, la fecha límite."""
+    return tarea.fecha_completada or tarea.fecha_limite
@@ -0,0 +1,299 @@
+# data/binario.py
+"""
+Formato binario compacto de tareas (extensión .bin), alternativa a tareas.json.
+
+Disposición (enteros little-endian):
+
+    cabecera   "<8sHHIQQQ": magia b"TAREABIN", versión, reservado, n.º de tareas,
+               posición de la tabla de desplazamientos, posición y longitud de los ids
+    registros  uno por tarea, en el orden almacenado:
+               "<IBiHIIHH" longitud del registro, completada, ordinal de la fecha
+               límite y longitudes en bytes de id, título, descripción,
+               fecha_limite y fecha_completada; después esos cinco textos en UTF-8
+    ids        todos los ids en UTF-8 separados por 0xFF (byte que UTF-8 no usa)
+    tabla      n desplazamientos u64 (alineados a 8) al inicio de cada registro
+
+El archivo se abre con mmap: abrir solo lee la cabecera, la tabla se usa sin
+copiarla y cada Tarea se decodifica la primera vez que se pide.
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from typing import Iterable, Iterator, List
+from models.tarea import Tarea
+
+MAGIA = b"TAREABIN"
+VERSION = 1
+_CABECERA = struct.Struct("<8sHHIQQQ")
+_REGISTRO = struct.Struct("<IBiHIIHH")
+_SEPARADOR_ID = b"\xff"
+
+
+class LectorBinario:
+    """
+    Acceso aleatorio a un archivo .bin mapeado en memoria.
+    ✅ Apertura en tiempo constante: cabecera + tabla de desplazamientos sin copiar
+    ✅ Decodificación de una tarea bajo demanda (sin revalidar fechas: el ordinal va guardado)
+    ✅ Los registros se pueden copiar tal cual al reescribir (sin decodificar)
+    """
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        with open(ruta, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._leer_cabecera()
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _leer_cabecera(self):
+        mm = self._mm
+        if len(mm) < _CABECERA.size:
+            raise ValueError(f"{self.ruta} no es un archivo de tareas binario (demasiado corto).")
+        magia, version, _, cuenta, tabla, ids, longitud_ids = _CABECERA.unpack_from(mm, 0)
+        if magia != MAGIA:
+            raise ValueError(f"{self.ruta} no es un archivo de tareas binario.")
+        if version != VERSION:
+            raise ValueError(f"Versión de formato binario no soportada: {version}.")
+        if tabla + 8 * cuenta > len(mm) or ids + longitud_ids > len(mm):
+            raise ValueError(f"{self.ruta} está truncado.")
+        self._cuenta = cuenta
+        self._ids = (ids, longitud_ids)
+        if sys.byteorder == "little":
+            self._desplazamientos = memoryview(mm)[tabla:tabla + 8 * cuenta].cast("Q")
+        else:
+            self._desplazamientos = array("Q", mm[tabla:tabla + 8 * cuenta])
+            self._desplazamientos.byteswap()
+
+    def __len__(self) -> int:
+        return self._cuenta
+
+    def ids(self) -> List[str]:
+        """Ids en el orden almacenado (un solo bloque: no toca los registros)."""
+        if not self._cuenta:
+            return []
+        inicio, longitud = self._ids
+        bloque = self._mm[inicio:inicio + longitud]
+        if bloque.translate(None, _SEPARADOR_ID).isascii():
+            # Caso habitual (ids hexadecimales): una sola decodificación para todos
+            return bloque.decode("latin-1").split(_SEPARADOR_ID.decode("latin-1"))
+        return [i.decode("utf-8") for i in bloque.split(_SEPARADOR_ID)]
+
+    def tarea(self, i: int) -> Tarea:
+        """Decodifica el registro i."""
+        inicio = self._desplazamientos[i]
+        try:
+            _, completada, ordinal, l_id, l_tit, l_desc, l_fecha, l_comp = \
+                _REGISTRO.unpack_from(self._mm, inicio)
+            p = inicio + _REGISTRO.size
+            datos = self._mm[p:p + l_id + l_tit + l_desc + l_fecha + l_comp]
+            a = l_id
+            b = a + l_tit
+            c = b + l_desc
+            d = c + l_fecha
+            return Tarea._crear(datos[:a].decode("utf-8"), datos[a:b].decode("utf-8"),
+                                datos[b:c].decode("utf-8"), datos[c:d].decode("utf-8"),
+                                ordinal, bool(completada), datos[d:].decode("utf-8"))
+        except (struct.error, UnicodeDecodeError) as e:
+            raise ValueError(f"Registro {i} dañado en {self.ruta}: {e}")
+
+    def completada(self, i: int) -> bool:
+        """Estado del registro i sin decodificarlo (un byte tras la longitud)."""
+        return bool(self._mm[self._desplazamientos[i] + 4])
+
+    def registro(self, i: int) -> bytes:
+        """Bytes del registro i tal cual (prefijo de longitud incluido)."""
+        inicio = self._desplazamientos[i]
+        longitud, = struct.unpack_from("<I", self._mm, inicio)
+        return self._mm[inicio:inicio + longitud]
+
+    def tareas(self) -> Iterator[Tarea]:
+        for i in range(self._cuenta):
+            yield self.tarea(i)
+
+    def registros(self) -> Iterator[dict]:
+        """Tareas como diccionarios (mismo formato que tareas.json)."""
+        for tarea in self.tareas():
+            yield tarea.to_dict()
+
+    def cerrar(self):
+        if isinstance(self._desplazamientos, memoryview):
+            self._desplazamientos.release()
+        self._mm.close()
+
+
+class TareasPerezosas(dict):
+    """
+    Diccionario id -> Tarea respaldado por un LectorBinario.
+    ✅ Abrir cuesta lo que leer los ids: las tareas empiezan como número de registro
+    ✅ Cada tarea se decodifica (y se queda en el diccionario) al primer acceso
+    ✅ Altas, bajas y reemplazos funcionan como en un dict normal
+    """
+    def __init__(self, lector: LectorBinario):
+        super().__init__(zip(lector.ids(), range(len(lector))))
+        self.lector = lector
+        self._bloqueo = threading.Lock()  # El guardado en segundo plano también lee
+
+    def __getitem__(self, id_tarea: str) -> Tarea:
+        valor = dict.__getitem__(self, id_tarea)
+        if type(valor) is int:
+            valor = self._decodificar(id_tarea, valor)
+        return valor
+
+    def _decodificar(self, id_tarea: str, registro: int) -> Tarea:
+        with self._bloqueo:
+            valor = dict.__getitem__(self, id_tarea)
+            if type(valor) is int:
+                valor = self.lector.tarea(registro)
+                dict.__setitem__(self, id_tarea, valor)  # Misma clave: no cambia el tamaño
+            return valor
+
+    def get(self, id_tarea: str, defecto=None):
+        return self[id_tarea] if id_tarea in self else defecto
+
+    def pop(self, id_tarea: str, *defecto):
+        if id_tarea in self:
+            valor = self[id_tarea]
+            dict.__delitem__(self, id_tarea)
+            return valor
+        return dict.pop(self, id_tarea, *defecto)
+
+    def values(self):
+        return _ValoresPerezosos(self)
+
+    def items(self):
+        return ((id_tarea, self[id_tarea]) for id_tarea in list(self))
+
+    def completadas(self) -> List[Tarea]:
+        """Solo las completadas: las demás no se decodifican."""
+        lector = self.lector
+        ids = [id_tarea for id_tarea, valor in dict.items(self)
+               if (lector.completada(valor) if type(valor) is int else valor.completada)]
+        return [self[id_tarea] for id_tarea in ids]
+
+    def crudos(self) -> Iterator:
+        """(id, número de registro o Tarea) sin decodificar nada."""
+        return dict.items(self)
+
+    def materializar(self):
+        """Decodifica todo y suelta el mapeo (p. ej. antes de reemplazar el archivo en Windows)."""
+        for id_tarea in list(self):
+            self[id_tarea]
+        self.lector.cerrar()
+
+
+class _ValoresPerezosos:
+    """Vista de valores: decodifica al recorrer y conoce el diccionario para guardar en crudo."""
+    def __init__(self, tareas: TareasPerezosas):
+        self.tareas = tareas
+
+    def __len__(self) -> int:
+        return len(self.tareas)
+
+    def __iter__(self) -> Iterator[Tarea]:
+        tareas = self.tareas
+        for id_tarea in list(tareas):
+            yield tareas[id_tarea]
+
+
+def escribir_binario(ruta: str, tareas: Iterable[Tarea]):
+    """
+    Escribe las tareas en formato binario de forma atómica (temporal + fsync + os.replace).
+    Si recibe los valores de un TareasPerezosas, los registros que nunca se
+    decodificaron se copian byte a byte desde el archivo mapeado.
+    """
+    escribir_instantanea(ruta, instantanea(tareas))
+
+
+def instantanea(tareas: Iterable[Tarea]) -> tuple:
+    """
+    (lector o None, [(id, número de registro o bytes codificados)]): copia fija de
+    las tareas que otro hilo puede escribir mientras el original sigue cambiando.
+    """
+    if isinstance(tareas, _ValoresPerezosos):
+        return tareas.tareas.lector, [(id_tarea, valor if type(valor) is int else _codificar(valor))
+                                      for id_tarea, valor in tareas.tareas.crudos()]
+    return None, [(t.id, _codificar(t)) for t in tareas]
+
+
+def escribir_instantanea(ruta: str, datos: tuple):
+    """Escribe de forma atómica una copia tomada con instantanea()."""
+    crudos, tareas = datos
+    temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    desplazamientos = array("Q")
+    ids = []
+    with open(temporal, "wb") as f:
+        f.write(bytes(_CABECERA.size))
+        posicion = _CABECERA.size
+        for id_tarea, valor in tareas:
+            registro = crudos.registro(valor) if type(valor) is int else valor
+            desplazamientos.append(posicion)
+            ids.append(id_tarea.encode("utf-8"))
+            f.write(registro)
+            posicion += len(registro)
+        bloque_ids = _SEPARADOR_ID.join(ids)
+        f.write(bloque_ids)
+        inicio_ids = posicion
+        posicion += len(bloque_ids)
+        relleno = -posicion % 8
+        f.write(bytes(relleno))
+        tabla = posicion + relleno
+        if sys.byteorder != "little":
+            desplazamientos.byteswap()
+        f.write(desplazamientos.tobytes())
+        f.seek(0)
+        f.write(_CABECERA.pack(MAGIA, VERSION, 0, len(ids), tabla, inicio_ids, len(bloque_ids)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+
+
+def _codificar(tarea: Tarea) -> bytes:
+    textos = [tarea.id.encode("utf-8"), tarea.titulo.encode("utf-8"),
+              tarea.descripcion.encode("utf-8"), tarea.fecha_limite.encode("utf-8"),
+              tarea.fecha_completada.encode("utf-8")]
+    cuerpo = b"".join(textos)
+    return _REGISTRO.pack(_REGISTRO.size + len(cuerpo), tarea.completada, tarea.ordinal,
+                          *map(len, textos)) + cuerpo
+
+
+def es_binario(ruta: str) -> bool:
+    """True si el archivo existe y empieza por la firma del formato binario."""
+    try:
+        with open(ruta, "rb") as f:
+            return f.read(len(MAGIA)) == MAGIA
+    except OSError:
+        return False
+
+
+def convertir(origen: str, destino: str) -> int:
+    """
+    Convierte entre tareas.json (lista o snapshot del diario) y .bin, en cualquier
+    sentido según la firma del origen y la extensión del destino. Sin pérdidas:
+    el JSON exportado es el mismo que guardaría la aplicación. Devuelve cuántas tareas.
+    """
+    if es_binario(origen):
+        lector = LectorBinario(origen)
+        try:
+            tareas = list(lector.tareas())
+        finally:
+            lector.cerrar()
+    elif os.path.exists(origen):
+        from data.cargador import LectorSnapshot
+        from models.tareas_columnar import TareasColumnar
+        columnas, rechazadas = TareasColumnar.desde_dicts(LectorSnapshot(origen))
+        if rechazadas:
+            posicion, motivo = rechazadas[0]
+            raise ValueError(f"{len(rechazadas)} tareas inválidas en {origen} (#{posicion}: {motivo})")
+        tareas = list(columnas.tareas())
+    else:
+        tareas = []
+    if os.path.splitext(destino)[1].lower() == ".bin":
+        escribir_binario(destino, tareas)
+    else:
+        from data.almacenamiento import _escribir_atomico
+        _escribir_atomico(destino, [t.to_dict() for t in tareas], indent=4)
+    return len(tareas)
@@ -0,0 +1,91 @@
+# data/bloqueo.py
+import os
+import threading
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+Firma = Tuple[int, int, int]
+
+
+class BloqueoArchivo:
+    """
+    Cerrojo exclusivo entre procesos sobre <archivo>.lock (se usa con `with`).
+    ✅ fcntl.flock en POSIX y msvcrt.locking en Windows; sin ninguno, solo entre hilos
+    ✅ Reentrante en el mismo hilo: el repositorio y el backend pueden anidarlo
+    ✅ Archivo de cerrojo aparte: el de datos se reemplaza con os.replace al guardar
+    """
+    def __init__(self, archivo: str):
+        self.ruta = archivo + ".lock"
+        self._hilos = threading.RLock()
+        self._nivel = 0
+        self._f = None
+
+    def __enter__(self) -> "BloqueoArchivo":
+        self._hilos.acquire()
+        if self._nivel == 0:
+            try:
+                self._adquirir()
+            except BaseException:
+                self._hilos.release()
+                raise
+        self._nivel += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._nivel -= 1
+        if self._nivel == 0:
+            self._liberar()
+        self._hilos.release()
+
+    def _adquirir(self):
+        carpeta = os.path.dirname(self.ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        self._f = open(self.ruta, "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._f.fileno(), fcntl.LOCK_EX)
+            elif msvcrt is not None:
+                self._f.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:  # LK_LOCK se rinde tras ~10 s: seguir esperando
+                        continue
+        except BaseException:
+            self._f.close()
+            self._f = None
+            raise
+
+    def _liberar(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                self._f.seek(0)
+                msvcrt.locking(self._f.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._f.close()
+            self._f = None
+
+
+class ConflictoEscritura(Exception):
+    """Otro proceso modificó el archivo desde la última lectura o escritura propia."""
+
+
+def firma(ruta: str) -> Optional[Firma]:
+    """(mtime en ns, tamaño, inodo): cambia con cada guardado, incluido el os.replace atómico."""
+    try:
+        st = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
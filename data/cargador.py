@@ -0,0 +1,142 @@
+# data/cargador.py
+import json
+from typing import Iterator, List, Tuple
+
+_DECODER = json.JSONDecoder()
+_ESPACIOS = " \t\n\r"
+
+
+class InformeCarga:
+    """
+    Resultado de una carga: cuántas tareas entraron y cuáles se rechazaron.
+    ✅ Sustituye a los print por cada entrada inválida
+    """
+    def __init__(self, origen: str = ""):
+        self.origen = origen
+        self.aceptadas = 0
+        self.rechazadas: List[Tuple[int, str]] = []   # (posición en el archivo, motivo)
+        self.error: str = ""                           # Error que cortó la lectura, si lo hubo
+
+    @property
+    def completa(self) -> bool:
+        return not self.error
+
+    def resumen(self, maximo: int = 10) -> str:
+        lineas = [f"{self.aceptadas} tareas cargadas, {len(self.rechazadas)} rechazadas."]
+        for posicion, motivo in self.rechazadas[:maximo]:
+            lineas.append(f"  • #{posicion}: {motivo}")
+        if len(self.rechazadas) > maximo:
+            lineas.append(f"  • … y {len(self.rechazadas) - maximo} más")
+        if self.error:
+            lineas.append(f"Lectura interrumpida: {self.error}")
+        return "\n".join(lineas)
+
+    def __repr__(self):
+        return f"<InformeCarga {self.origen} | ✅ {self.aceptadas} | ❌ {len(self.rechazadas)}>"
+
+
+class LectorSnapshot:
+    """
+    Lector incremental de tareas.json: produce los objetos de la lista uno a uno
+    leyendo el archivo por bloques, sin cargarlo entero en memoria.
+    ✅ Formato histórico: [ {...}, {...} ]
+    ✅ Formato snapshot del diario: {"generacion": g, "tareas": [ ... ]}
+    """
+    def __init__(self, archivo_json: str, tamano_bloque: int = 1 << 16):
+        self.archivo_json = archivo_json
+        self.tamano_bloque = tamano_bloque
+        self.generacion = 0
+        self._f = None
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[dict]:
+        with open(self.archivo_json, "r", encoding="utf-8") as self._f:
+            self._buf, self._pos, self._eof = "", 0, False
+            caracter = self._siguiente()
+            if caracter == "[":
+                yield from self._lista()
+            elif caracter == "{":
+                yield from self._objeto_snapshot()
+            elif caracter:
+                raise json.JSONDecodeError("Se esperaba una lista u objeto", self._buf, self._pos)
+
+    # --- Lectura por bloques ---
+    def _rellenar(self) -> bool:
+        bloque = self._f.read(self.tamano_bloque)
+        if not bloque:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + bloque
+        self._pos = 0
+        return True
+
+    def _siguiente(self) -> str:
+        """Salta espacios y devuelve (sin consumir) el siguiente carácter, o '' al final."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _ESPACIOS:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._rellenar():
+                return ""
+
+    def _consumir(self, esperado: str):
+        if self._siguiente() != esperado:
+            raise json.JSONDecodeError(f"Se esperaba '{esperado}'", self._buf, self._pos)
+        self._pos += 1
+
+    def _valor(self):
+        self._siguiente()
+        while True:
+            try:
+                valor, fin = _DECODER.raw_decode(self._buf, self._pos)
+                # Un número al borde del búfer podría estar cortado: pedir más
+                if fin < len(self._buf) or self._eof:
+                    self._pos = fin
+                    return valor
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._rellenar()
+
+    def _lista(self) -> Iterator[dict]:
+        self._consumir("[")
+        if self._siguiente() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._valor()
+            caracter = self._siguiente()
+            self._pos += 1
+            if caracter == "]":
+                return
+            if caracter != ",":
+                raise json.JSONDecodeError("Se esperaba ',' o ']'", self._buf, self._pos - 1)
+
+    def _objeto_snapshot(self) -> Iterator[dict]:
+        self._consumir("{")
+        while self._siguiente() not in ("}", ""):
+            clave = self._valor()
+            self._consumir(":")
+            if clave == "tareas":
+                yield from self._lista()
+            elif clave == "generacion":
+                self.generacion = int(self._valor())
+            else:
+                self._valor()
+            if self._siguiente() == ",":
+                self._pos += 1
+
+
+def iterar_lotes(registros, tamano_lote: int) -> Iterator[list]:
+    """Agrupa un iterable en listas de tamano_lote elementos."""
+    lote = []
+    for registro in registros:
+        lote.append(registro)
+        if len(lote) >= tamano_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
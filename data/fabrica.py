@@ -0,0 +1,28 @@
+import os
+from data.tarea_repository import TareaRepository
+from data.almacenamiento import AlmacenamientoBinario, AlmacenamientoDiario, AlmacenamientoJSON
+
+
+def crear_repositorio(archivo: str = "tareas.json", diario: bool = False, cargar: bool = True,
+                      asincrono: bool = False):
+    """
+    Crea el repositorio adecuado según la extensión del archivo.
+    ✅ .db / .sqlite / .sqlite3 -> TareaRepositorySQLite (migra tareas.json si existe)
+    ✅ .bin                     -> TareaRepository con formato binario mapeado en memoria
+                                   (migra tareas.json si existe)
+    ✅ cualquier otro           -> TareaRepository (JSON, opcionalmente con diario)
+    Con asincrono=True el JSON se guarda en un hilo de fondo que agrupa ráfagas.
+    Con cargar=False el repositorio JSON queda vacío hasta llamar a
+    cargar_desde_json() o consumir cargar_incremental().
+    """
+    extension = os.path.splitext(archivo)[1].lower()
+    if extension in (".db", ".sqlite", ".sqlite3"):
+        from data.tarea_repository_sqlite import TareaRepositorySQLite
+        return TareaRepositorySQLite(archivo)
+    if extension == ".bin":
+        return TareaRepository(archivo, almacenamiento=AlmacenamientoBinario(archivo, asincrono=asincrono),
+                               cargar=cargar)
+    if diario:
+        return TareaRepository(archivo, almacenamiento=AlmacenamientoDiario(archivo), cargar=cargar)
+    return TareaRepository(archivo, almacenamiento=AlmacenamientoJSON(archivo, asincrono=asincrono),
+                           cargar=cargar)
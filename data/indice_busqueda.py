@@ -0,0 +1,107 @@
+# data/indice_busqueda.py
+import re
+import unicodedata
+from functools import lru_cache
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Set, Tuple
+
+_PALABRA = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=65536)
+def normalizar(texto: str) -> str:
+    """Minúsculas y sin tildes/diéresis: 'Árbol Binario' -> 'arbol binario'."""
+    if texto.isascii():  # Caso habitual: nada que descomponer
+        return texto.lower()
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).casefold()
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Palabras normalizadas; se normaliza palabra a palabra para aprovechar la caché."""
+    if texto.isascii():
+        return _PALABRA.findall(texto.lower())
+    texto = unicodedata.normalize("NFC", texto)  # Tildes como carácter único para \w
+    return [normalizar(palabra) for palabra in _PALABRA.findall(texto)]
+
+
+class IndiceInvertido:
+    """
+    Índice invertido en memoria: palabra normalizada -> ids de tarea.
+    ✅ Insensible a mayúsculas y tildes (texto en español)
+    ✅ Actualización incremental por tarea (alta, baja, cambio)
+    ✅ La última palabra de la consulta se trata como prefijo (búsqueda al teclear)
+    """
+    def __init__(self):
+        self._ids_por_palabra: Dict[str, Set[str]] = {}
+        self._palabras_por_id: Dict[str, Tuple[str, ...]] = {}
+        self._vocabulario: List[str] = []  # Ordenado, para buscar prefijos con bisect
+
+    def __len__(self) -> int:
+        return len(self._palabras_por_id)
+
+    def agregar(self, id_tarea: str, texto: str):
+        if id_tarea in self._palabras_por_id:
+            self.eliminar(id_tarea)
+        palabras = tuple(set(tokenizar(texto)))
+        self._palabras_por_id[id_tarea] = palabras
+        for palabra in palabras:
+            ids = self._ids_por_palabra.get(palabra)
+            if ids is None:
+                ids = self._ids_por_palabra[palabra] = set()
+                insort(self._vocabulario, palabra)
+            ids.add(id_tarea)
+
+    def eliminar(self, id_tarea: str):
+        for palabra in self._palabras_por_id.pop(id_tarea, ()):
+            ids = self._ids_por_palabra[palabra]
+            ids.discard(id_tarea)
+            if not ids:
+                del self._ids_por_palabra[palabra]
+                del self._vocabulario[bisect_left(self._vocabulario, palabra)]
+
+    def agregar_varios(self, pares: Iterable[Tuple[str, str]]):
+        """Alta masiva (carga inicial): ordena el vocabulario una sola vez."""
+        nuevas = False
+        for id_tarea, texto in pares:
+            if id_tarea in self._palabras_por_id:
+                self.eliminar(id_tarea)
+            palabras = tuple(set(tokenizar(texto)))
+            self._palabras_por_id[id_tarea] = palabras
+            for palabra in palabras:
+                ids = self._ids_por_palabra.get(palabra)
+                if ids is None:
+                    ids = self._ids_por_palabra[palabra] = set()
+                    nuevas = True
+                ids.add(id_tarea)
+        if nuevas:
+            self._vocabulario = sorted(self._ids_por_palabra)
+
+    def limpiar(self):
+        self.__init__()
+
+    def buscar(self, consulta: str) -> Set[str]:
+        """Ids que contienen todas las palabras (la última, como prefijo)."""
+        palabras = tokenizar(consulta)
+        if not palabras:
+            return set()
+        conjuntos = [self._ids_por_palabra.get(p, set()) for p in palabras[:-1]]
+        conjuntos.append(self._con_prefijo(palabras[-1]))
+        conjuntos.sort(key=len)
+        resultado = set(conjuntos[0])
+        for conjunto in conjuntos[1:]:
+            if not resultado:
+                break
+            resultado &= conjunto
+        return resultado
+
+    def _con_prefijo(self, prefijo: str) -> Set[str]:
+        exacta = self._ids_por_palabra.get(prefijo)
+        inicio = bisect_left(self._vocabulario, prefijo)
+        fin = bisect_left(self._vocabulario, prefijo + "\U0010ffff", inicio)
+        if fin - inicio == 1 and exacta is not None:
+            return exacta
+        resultado = set()
+        for palabra in self._vocabulario[inicio:fin]:
+            resultado |= self._ids_por_palabra[palabra]
+        return resultado
@@ -0,0 +1,96 @@
+# data/indice_fechas.py
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class IndiceFechas:
+    """
+    Índice ordenado por fecha límite: lista de (ordinal, secuencia, id) mantenida con bisect.
+    ✅ Altas, bajas y cambios incrementales (sin reordenar todo)
+    ✅ Rangos de fechas por búsqueda binaria (vencidas, esta semana, próximas)
+    ✅ Ambos sentidos de recorrido con el mismo criterio que ordenar_por_fecha:
+       empates en orden almacenado y tareas sin fecha (ordinal 0) siempre al final
+    """
+    def __init__(self):
+        self._claves: Dict[str, Tuple[int, int]] = {}  # id -> (ordinal, secuencia)
+        self._orden: List[Tuple[int, int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._orden)
+
+    def __contains__(self, id_tarea: str) -> bool:
+        return id_tarea in self._claves
+
+    def agregar(self, id_tarea: str, ordinal: int, secuencia: int):
+        """Alta o cambio de fecha/posición de una tarea."""
+        if self._claves.get(id_tarea) == (ordinal, secuencia):
+            return
+        self.eliminar(id_tarea)
+        self._claves[id_tarea] = (ordinal, secuencia)
+        insort(self._orden, (ordinal, secuencia, id_tarea))
+
+    def eliminar(self, id_tarea: str):
+        clave = self._claves.pop(id_tarea, None)
+        if clave is not None:
+            del self._orden[bisect_left(self._orden, (*clave, id_tarea))]
+
+    def agregar_varios(self, entradas: Iterable[Tuple[str, int, int]]):
+        """Alta masiva de (id, ordinal, secuencia): ordena una sola vez."""
+        nuevas = {id_tarea: (ordinal, secuencia) for id_tarea, ordinal, secuencia in entradas}
+        # Primero las bajas, con la lista aún ordenada (eliminar busca con bisect)
+        for id_tarea in nuevas:
+            self.eliminar(id_tarea)
+        for id_tarea, clave in nuevas.items():
+            self._claves[id_tarea] = clave
+            self._orden.append((*clave, id_tarea))
+        self._orden.sort()
+
+    def ids(self, ascendente: bool = True) -> Iterator[str]:
+        """Recorrido perezoso por fecha (combinar con islice para paginar)."""
+        orden = self._orden
+        primera_fechada = bisect_left(orden, (1,))
+        if ascendente:
+            for i in range(primera_fechada, len(orden)):
+                yield orden[i][2]
+        else:
+            # De la fecha mayor a la menor, pero cada grupo de la misma fecha en orden almacenado
+            fin = len(orden)
+            while fin > primera_fechada:
+                inicio = bisect_left(orden, (orden[fin - 1][0],), primera_fechada, fin)
+                for i in range(inicio, fin):
+                    yield orden[i][2]
+                fin = inicio
+        for i in range(primera_fechada):
+            yield orden[i][2]
+
+    def rango(self, desde: int, hasta: Optional[int] = None, limite: Optional[int] = None) -> List[str]:
+        """Ids con fecha entre los ordinales desde y hasta (incluidos), de la más próxima a la más lejana."""
+        orden = self._orden
+        inicio = bisect_left(orden, (max(desde, 1),))
+        fin = len(orden) if hasta is None else bisect_right(orden, (hasta, float("inf")), inicio)
+        if limite is not None:
+            fin = min(fin, inicio + limite)
+        return [orden[i][2] for i in range(inicio, fin)]
+
+
+def ordinal_de_hoy(hoy=None) -> int:
+    """Ordinal de la fecha dada (datetime.date) o de la fecha actual."""
+    if hoy is None:
+        from datetime import date  # Import diferido, como en models.tarea
+        hoy = date.today()
+    return hoy.toordinal()
+
+
+def iso_de_hoy(hoy=None) -> str:
+    """Fecha dada o actual como AAAA-MM-DD."""
+    if hoy is None:
+        from datetime import date
+        hoy = date.today()
+    return hoy.isoformat()
+
+
+def limites_semana(hoy=None) -> Tuple[int, int]:
+    """(hoy, domingo de la semana en curso) como ordinales; la semana va de lunes a domingo."""
+    inicio = ordinal_de_hoy(hoy)
+    # El ordinal 1 (0001-01-01) fue lunes: (ordinal - 1) % 7 es 0 en lunes y 6 en domingo
+    return inicio, inicio + 6 - (inicio - 1) % 7
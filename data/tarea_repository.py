@@ -1,82 +1,637 @@
 import json
-import os
-from typing import List
+import shutil
+import threading
+from contextlib import contextmanager
+from itertools import count, islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from models.tarea import Tarea
+from models.tareas_columnar import TareasColumnar
+from data.almacenamiento import AlmacenamientoJSON
+from data.bloqueo import ConflictoEscritura, firma
+from data.cargador import InformeCarga, iterar_lotes
+from data.indice_busqueda import IndiceInvertido
+from data.indice_fechas import IndiceFechas, iso_de_hoy, limites_semana, ordinal_de_hoy
+from data.archivo import DIAS_ARCHIVO, ArchivoTareas, es_archivable
 
 class TareaRepository:
     """
-    Capa de persistencia: gestiona el almacenamiento en JSON.
+    Capa de persistencia: gestiona el almacenamiento de tareas.
     ✅ Abstrae el acceso a datos
-    ✅ Usa composición (lista de Tarea)
+    ✅ Usa composición (diccionario ordenado id -> Tarea)
     ✅ Single Responsibility Principle
+    ✅ Backend de almacenamiento intercambiable (JSON completo o diario)
+    ✅ Acceso y mutación por id en O(1); los índices posicionales se mantienen
+       por compatibilidad (O(n))
+    ✅ Varios procesos sobre el mismo archivo: cada escritura se hace con el
+       cerrojo tomado y, si otro proceso escribió antes, se incorporan sus
+       cambios (solo las tareas que difieren) y se reaplica la operación propia
     """
-    def __init__(self, archivo_json: str = "tareas.json"):
+    def __init__(self, archivo_json: str = "tareas.json", almacenamiento=None, cargar: bool = True):
         self.archivo_json = archivo_json
-        self._tareas: List[Tarea] = []
-        self.cargar_desde_json()
+        self._almacenamiento = almacenamiento or AlmacenamientoJSON(archivo_json)
+        self._tareas: Dict[str, Tarea] = {}  # Orden de inserción = orden almacenado
+        self._secuencia: Dict[str, int] = {}  # id -> número creciente en el orden almacenado
+        self._contador = 0
+        self._indice: Optional[IndiceInvertido] = None  # Se construye en la primera búsqueda
+        self._fechas: Optional[IndiceFechas] = None     # Todas, por fecha (primera consulta)
+        self._fechas_pendientes: Optional[IndiceFechas] = None
+        self._lote: Optional[List[dict]] = None  # Operaciones retenidas dentro de lote()
+        # Backend compartible entre procesos (JSON/binario; el diario es de un solo escritor)
+        self._compartido = hasattr(self._almacenamiento, "cambiado")
+        # Toda mutación de _tareas (o de una Tarea guardada) se hace con este cerrojo:
+        # el guardado en segundo plano copia las tareas con él tomado
+        self._memoria = getattr(self._almacenamiento, "memoria", None) or threading.RLock()
+        self._sin_confirmar: List[Tuple[int, dict]] = []  # (versión, operación) aún no en disco
+        self._ids_sin_guardar = False     # Ids generados al cargar un archivo antiguo, aún no en disco
+        self._respaldo_pendiente = False  # La carga ignoró datos: copiar el original antes de reescribirlo
+        self._firma_cargada = None        # Archivo tal como se cargó (solo se respalda si sigue igual)
+        self.archivo = ArchivoTareas.junto_a(archivo_json)  # Nivel frío (completadas antiguas)
+        self.informe_carga = InformeCarga(archivo_json)
+        if cargar:
+            self.cargar_desde_json()
 
     @property
     def tareas(self) -> List[Tarea]:
-        return self._tareas.copy()  # Evita modificación externa directa
+        return list(self._tareas.values())  # Evita modificación externa directa
+
+    def __len__(self) -> int:
+        return len(self._tareas)
+
+    def en_orden(self) -> "TareasEnOrden":
+        """Como `tareas`, sin construir la lista: cada corte solo toca sus tareas
+        (con el backend binario, solo esas se decodifican)."""
+        ids, tareas = list(self._tareas), self._tareas
+        return TareasEnOrden(len(ids), lambda inicio, fin: [tareas[i] for i in ids[inicio:fin]])
+
+    @property
+    def almacenamiento(self):
+        """Backend de persistencia (JSON, binario o diario)."""
+        return self._almacenamiento
+
+    # --- Operaciones por id (O(1)) ---
+    def obtener(self, id_tarea: str) -> Tarea:
+        try:
+            return self._tareas[id_tarea]
+        except KeyError:
+            raise KeyError(f"No existe la tarea {id_tarea}.")
 
     def agregar(self, tarea: Tarea):
-        self._tareas.append(tarea)
-        self.guardar_en_json()
+        if tarea.id in self._tareas:
+            raise ValueError(f"Ya existe una tarea con id {tarea.id}.")
+        self._poner(tarea)
+        self._registrar({"op": "agregar", "tarea": tarea.to_dict()})
 
-    def eliminar_por_indice(self, indice: int):
-        if 0 <= indice < len(self._tareas):
-            self._tareas.pop(indice)
-            self.guardar_en_json()
+    def eliminar(self, id_tarea: str) -> Tarea:
+        tarea = self.obtener(id_tarea)
+        self._quitar(id_tarea)
+        self._registrar({"op": "eliminar", "id": id_tarea})
+        return tarea
+
+    def actualizar(self, id_tarea: str, tarea: Tarea):
+        """Reemplaza la tarea conservando su id y su posición."""
+        self.obtener(id_tarea)
+        tarea.id = id_tarea
+        self._poner(tarea)
+        self._registrar({"op": "actualizar", "tarea": tarea.to_dict()})
+
+    def marcar(self, id_tarea: str, valor: bool = True):
+        self._registrar(self._marcar(self.obtener(id_tarea), valor))
+
+    def _marcar(self, tarea: Tarea, valor: bool) -> dict:
+        """Cambia el estado (fechando la finalización) y devuelve la operación a registrar."""
+        with self._memoria:
+            if not valor:
+                tarea.fecha_completada = ""
+            elif not (tarea.completada and tarea.fecha_completada):
+                tarea.fecha_completada = iso_de_hoy()
+            tarea.completada = bool(valor)
+            self._indexar_fecha(tarea)
+        return {"op": "marcar", "id": tarea.id, "valor": tarea.completada,
+                "fecha": tarea.fecha_completada}
+
+    # --- Operaciones masivas (una sola confirmación) ---
+    @contextmanager
+    def lote(self):
+        """
+        Agrupa operaciones: se aplican en memoria al momento y se persisten juntas
+        al salir del bloque, como una única operación "lote" (una escritura del
+        JSON o una línea del diario). Admite anidamiento. Si el bloque lanza una
+        excepción, lo ya aplicado se confirma igualmente para que memoria y disco
+        no diverjan.
+        """
+        if self._lote is not None:
+            yield self
+            return
+        self._lote = []
+        try:
+            with self._memoria:  # El guardado en segundo plano no ve el lote a medias
+                yield self
+        finally:
+            operaciones, self._lote = self._lote, None
+            if operaciones:
+                self._registrar({"op": "lote", "operaciones": operaciones})
+
+    def agregar_varias(self, tareas: Iterable[Tarea]):
+        """Añade todas o ninguna: los ids repetidos se detectan antes de tocar nada."""
+        tareas = list(tareas)
+        vistos = set()
+        for tarea in tareas:
+            if tarea.id in self._tareas or tarea.id in vistos:
+                raise ValueError(f"Ya existe una tarea con id {tarea.id}.")
+            vistos.add(tarea.id)
+        with self.lote():
+            for tarea in tareas:
+                self._poner(tarea)
+                self._registrar({"op": "agregar", "tarea": tarea.to_dict()})
+
+    def marcar_varias(self, ids: Iterable[str], valor: bool = True):
+        tareas = [self.obtener(i) for i in ids]  # KeyError antes de cambiar nada
+        self._soltar_fechas_si_masivo(len(tareas))
+        with self.lote():
+            for tarea in tareas:
+                self._registrar(self._marcar(tarea, valor))
+
+    def eliminar_varias(self, ids: Iterable[str]) -> List[Tarea]:
+        tareas = list({i: self.obtener(i) for i in ids}.values())  # Sin repetidos
+        self._soltar_fechas_si_masivo(len(tareas))
+        with self.lote():
+            for tarea in tareas:
+                self._quitar(tarea.id)
+                self._registrar({"op": "eliminar", "id": tarea.id})
+        return tareas
+
+    def limpiar_completadas(self) -> int:
+        """Elimina todas las tareas completadas; devuelve cuántas."""
+        return len(self.eliminar_varias([t.id for t in self._tareas.values() if t.completada]))
+
+    # --- Nivel frío: archivo de completadas ---
+    def archivar_completadas(self, dias: int = DIAS_ARCHIVO, hoy=None) -> int:
+        """
+        Mueve al archivo particionado las completadas hace más de `dias` días.
+        Primero se escribe el archivo y luego se borran del nivel caliente: un
+        corte entre ambos pasos solo deja un duplicado que el siguiente pase absorbe.
+        """
+        limite = ordinal_de_hoy(hoy) - dias
+        if hasattr(self._tareas, "completadas"):  # Binario: sin decodificar las pendientes
+            completadas = self._tareas.completadas()
         else:
-            raise IndexError("Índice fuera de rango.")
+            completadas = [t for t in self._tareas.values() if t.completada]
+        antiguas = [t for t in completadas if es_archivable(t, limite)]
+        if antiguas:
+            self.archivo.archivar(antiguas)
+            self.eliminar_varias([t.id for t in antiguas])
+        return len(antiguas)
 
-    def actualizar_por_indice(self, indice: int, tarea: Tarea):
-        if 0 <= indice < len(self._tareas):
-            self._tareas[indice] = tarea
-            self.guardar_en_json()
+    def historial(self, limite: Optional[int] = None, despues_de: Optional[Tarea] = None) -> List[Tarea]:
+        """Tareas archivadas, de la completada más recientemente a la más antigua
+        (las que siguen a `despues_de`, para paginar)."""
+        return list(self.archivo.historial(limite, despues_de))
+
+    def reabrir_archivadas(self, tareas: Iterable[Tarea]) -> List[Tarea]:
+        """Devuelve tareas archivadas al nivel caliente como pendientes."""
+        tareas = [t for t in tareas if t.id not in self._tareas]
+        reabiertas = [Tarea._crear(t.id, t.titulo, t.descripcion, t.fecha_limite, t.ordinal, False)
+                      for t in tareas]
+        self.agregar_varias(reabiertas)
+        self.archivo.quitar(tareas)
+        return reabiertas
+
+    def _soltar_fechas_si_masivo(self, cambios: int):
+        """Muchos cambios a la vez: reconstruir el índice por fecha después sale más barato."""
+        if self._fechas is not None and cambios > max(1000, len(self._tareas) // 8):
+            self._fechas = self._fechas_pendientes = None
+
+    def buscar(self, consulta: str) -> List[Tarea]:
+        """Tareas cuyo título/descripción contienen todas las palabras de la consulta
+        (sin distinguir mayúsculas ni tildes; la última palabra vale como prefijo),
+        en el orden almacenado."""
+        if self._indice is None:
+            self._indice = IndiceInvertido()
+            self._indice.agregar_varios((t.id, f"{t.titulo} {t.descripcion}")
+                                        for t in self._tareas.values())
+        ids = self._indice.buscar(consulta)
+        return [self._tareas[i] for i in sorted(ids, key=self._secuencia.__getitem__)]
+
+    # --- Mantenimiento del diccionario y del índice de búsqueda ---
+    def _poner(self, tarea: Tarea):
+        """Alta (al final) o reemplazo (en su sitio) de una tarea."""
+        with self._memoria:
+            if tarea.id not in self._tareas:
+                self._secuencia[tarea.id] = self._contador
+                self._contador += 1
+            self._tareas[tarea.id] = tarea
+        if self._indice is not None:
+            self._indice.agregar(tarea.id, f"{tarea.titulo} {tarea.descripcion}")
+        self._indexar_fecha(tarea)
+
+    def _quitar(self, id_tarea: str):
+        with self._memoria:
+            quitada = self._tareas.pop(id_tarea, None)
+        if quitada is not None:
+            del self._secuencia[id_tarea]
+            if self._indice is not None:
+                self._indice.eliminar(id_tarea)
+            if self._fechas is not None:
+                self._fechas.eliminar(id_tarea)
+                self._fechas_pendientes.eliminar(id_tarea)
+
+    def _indexar_fecha(self, tarea: Tarea):
+        if self._fechas is None:
+            return
+        secuencia = self._secuencia[tarea.id]
+        self._fechas.agregar(tarea.id, tarea.ordinal, secuencia)
+        if tarea.completada:
+            self._fechas_pendientes.eliminar(tarea.id)
         else:
-            raise IndexError("Índice fuera de rango.")
+            self._fechas_pendientes.agregar(tarea.id, tarea.ordinal, secuencia)
 
-    def marcar_completada(self, indice: int, valor: bool = True):
+    def _indices_fecha(self):
+        """Crea (una vez) los índices por fecha; después se mantienen en cada operación."""
+        if self._fechas is None:
+            secuencia = self._secuencia
+            self._fechas, self._fechas_pendientes = IndiceFechas(), IndiceFechas()
+            self._fechas.agregar_varios(
+                (t.id, t.ordinal, secuencia[t.id]) for t in self._tareas.values())
+            self._fechas_pendientes.agregar_varios(
+                (t.id, t.ordinal, secuencia[t.id]) for t in self._tareas.values() if not t.completada)
+        return self._fechas, self._fechas_pendientes
+
+    # --- Operaciones por índice (compatibilidad) ---
+    def _id_en(self, indice: int) -> str:
         if 0 <= indice < len(self._tareas):
-            self._tareas[indice].completada = valor
-            self.guardar_en_json()
-        else:
-            raise IndexError("Índice fuera de rango.")
+            return next(islice(self._tareas, indice, None))
+        raise IndexError("Índice fuera de rango.")
+
+    def eliminar_por_indice(self, indice: int):
+        self.eliminar(self._id_en(indice))
+
+    def actualizar_por_indice(self, indice: int, tarea: Tarea):
+        self.actualizar(self._id_en(indice), tarea)
+
+    def marcar_completada(self, indice: int, valor: bool = True):
+        self.marcar(self._id_en(indice), valor)
 
     def ordenar_por_fecha(self, ascendente: bool = True):
-        """Ordena por fecha límite (más próximas primero si ascendente=True)."""
-        def clave(t: Tarea):
-            if not t.fecha_limite:
-                return float('inf') if ascendente else float('-inf')
-            try:
-                return int(t.fecha_limite.replace("-", ""))
-            except:
-                return float('inf') if ascendente else float('-inf')
-        self._tareas.sort(key=clave, reverse=not ascendente)
-        self.guardar_en_json()
+        """
+        Reescribe el orden almacenado por fecha límite (más próximas primero si
+        ascendente=True) y lo persiste. Para solo mostrar las tareas ordenadas,
+        ordenadas_por_fecha() no modifica nada.
+        """
+        self._ordenar(ascendente)
+        self._registrar({"op": "ordenar", "ascendente": ascendente})
+
+    def _ordenar(self, ascendente: bool):
+        ordenadas = sorted(self._tareas.values(), key=lambda t: _clave_fecha(t, ascendente),
+                           reverse=not ascendente)
+        self._reordenar([t.id for t in ordenadas])
+
+    def _reordenar(self, ids: List[str]):
+        """
+        Nuevo orden almacenado sobre el mismo diccionario: el guardado asíncrono
+        conserva la vista de _tareas, así que nunca se sustituye por otro.
+        """
+        with self._memoria:
+            # dict.* directamente: en un TareasPerezosas no decodifica nada
+            entradas = [(i, dict.__getitem__(self._tareas, i)) for i in ids]
+            dict.clear(self._tareas)
+            dict.update(self._tareas, entradas)
+        self._secuencia = {id_tarea: i for i, id_tarea in enumerate(ids)}
+        self._contador = len(ids)
+        self._fechas = self._fechas_pendientes = None  # Las secuencias han cambiado
+
+    # --- Vistas por fecha (no modifican el orden almacenado ni guardan) ---
+    def ordenadas_por_fecha(self, ascendente: bool = True, limite: Optional[int] = None,
+                            desplazamiento: int = 0, solo_pendientes: bool = False) -> List[Tarea]:
+        """Tareas por fecha límite (sin fecha al final, empates en orden almacenado), paginadas."""
+        todas, pendientes = self._indices_fecha()
+        indice = pendientes if solo_pendientes else todas
+        fin = None if limite is None else desplazamiento + limite
+        return [self._tareas[i] for i in islice(indice.ids(ascendente), desplazamiento, fin)]
+
+    def pendientes(self, ascendente: bool = True, limite: Optional[int] = None,
+                   desplazamiento: int = 0) -> List[Tarea]:
+        """Tareas no completadas ordenadas por fecha (sin fecha al final), paginadas."""
+        return self.ordenadas_por_fecha(ascendente, limite, desplazamiento, solo_pendientes=True)
+
+    def proximas(self, limite: int = 10, hoy=None) -> List[Tarea]:
+        """Las `limite` tareas pendientes que vencen antes, a partir de hoy."""
+        _, pendientes = self._indices_fecha()
+        return [self._tareas[i] for i in pendientes.rango(ordinal_de_hoy(hoy), limite=limite)]
+
+    def vencidas(self, hoy=None) -> List[Tarea]:
+        """Tareas pendientes con fecha límite anterior a hoy, la más antigua primero."""
+        _, pendientes = self._indices_fecha()
+        return [self._tareas[i] for i in pendientes.rango(1, ordinal_de_hoy(hoy) - 1)]
+
+    def esta_semana(self, hoy=None) -> List[Tarea]:
+        """Tareas pendientes que vencen entre hoy y el domingo."""
+        _, pendientes = self._indices_fecha()
+        return [self._tareas[i] for i in pendientes.rango(*limites_semana(hoy))]
 
     def cargar_desde_json(self):
-        """Carga tareas desde JSON y las convierte en instancias de Tarea."""
-        self._tareas = []
-        if os.path.exists(self.archivo_json):
+        """Carga el snapshot y reproduce las operaciones pendientes del backend."""
+        for _ in self.cargar_incremental(decodificar=False):
+            pass
+
+    def cargar_incremental(self, tamano_lote: int = 2000, decodificar: bool = True) -> Iterator[List[Tarea]]:
+        """
+        Carga por lotes: el snapshot se lee y valida por bloques y cada lote se
+        añade al repositorio antes de entregarse, de modo que la vista puede
+        mostrar las primeras tareas mientras el resto del archivo se procesa.
+        Al terminar, self.informe_carga resume lo aceptado y lo rechazado.
+        Con un backend mapeado (binario) todas las tareas están disponibles desde
+        el principio; los lotes solo las decodifican por adelantado y con
+        decodificar=False no se entrega ninguno (se decodifican al usarlas).
+        """
+        self._tareas, self._secuencia, self._contador = {}, {}, 0
+        self._indice = self._fechas = self._fechas_pendientes = None
+        informe = self.informe_carga = InformeCarga(self.archivo_json)
+        if hasattr(self._almacenamiento, "abrir"):
+            yield from self._abrir_mapeado(informe, tamano_lote, decodificar)
+            return
+        self._firma_cargada = firma(self.archivo_json)
+        registros, obtener_operaciones = self._almacenamiento.cargar_incremental()
+        ids_nuevos = False
+        leidos = 0
+        for bloque in iterar_lotes(self._registros_hasta_error(registros, informe), tamano_lote):
+            # Validación y construcción en bloque (fechas cacheadas, sin revalidar por Tarea)
+            columnas, rechazadas = TareasColumnar.desde_dicts(bloque, desplazamiento=leidos)
+            leidos += len(bloque)
+            informe.rechazadas.extend(rechazadas)
+            ids_nuevos = ids_nuevos or "" in columnas.ids  # Archivo anterior a los ids
+            lote = []
+            with self._memoria:
+                for tarea in columnas.tareas():
+                    if tarea.id in self._tareas:
+                        tarea.id = Tarea.nuevo_id()  # Id repetido
+                        ids_nuevos = True
+                    self._tareas[tarea.id] = tarea
+                    self._secuencia[tarea.id] = self._contador
+                    self._contador += 1
+                    lote.append(tarea)
+            if self._indice is not None:  # Ya se buscó durante la carga
+                self._indice.agregar_varios((t.id, f"{t.titulo} {t.descripcion}") for t in lote)
+            for tarea in lote if self._fechas is not None else ():
+                self._indexar_fecha(tarea)
+            informe.aceptadas += len(lote)
+            yield lote
+        for operacion in obtener_operaciones():
+            try:
+                self._reproducir(operacion)
+            except (KeyError, IndexError, ValueError) as e:
+                print(f"[⚠️] Operación ignorada ({operacion.get('op')}): {e}")
+        if informe.rechazadas:
+            print(f"[⚠️] {len(informe.rechazadas)} tareas ignoradas (JSON inválido) en {self.archivo_json}")
+        self._ids_sin_guardar = ids_nuevos
+        self._respaldo_pendiente = bool(informe.rechazadas or informe.error)
+        if ids_nuevos:
+            # Guardar ya los ids generados (tras respaldar el original si se ignoró algo):
+            # otro proceso o la siguiente ejecución deben ver los mismos. Si falla, se
+            # reintenta con la primera mutación.
+            self.guardar_en_json()
+
+    def _abrir_mapeado(self, informe: InformeCarga, tamano_lote: int,
+                       decodificar: bool) -> Iterator[List[Tarea]]:
+        try:
+            tareas = self._almacenamiento.abrir()
+        except (ValueError, OSError) as e:
+            informe.error = str(e)
+            print(f"[❌] Error al cargar {self.archivo_json}: {e}")
+            return
+        if tareas is None:
+            return
+        self._tareas = tareas
+        # Recién abierto, cada valor es aún su número de registro: la secuencia, sin recorrer nada
+        self._secuencia = dict.copy(tareas)
+        self._contador = informe.aceptadas = len(tareas)
+        if decodificar:
+            ids = list(tareas)
+            for inicio in range(0, len(ids), tamano_lote):
+                yield [tareas[i] for i in ids[inicio:inicio + tamano_lote]]
+
+    def _registros_hasta_error(self, registros, informe: InformeCarga):
+        """Entrega registros hasta que el archivo deje de ser legible (se conserva lo leído)."""
+        try:
+            yield from registros
+        except (json.JSONDecodeError, UnicodeDecodeError, OSError) as e:
+            informe.error = str(e)
+            print(f"[❌] Error al cargar {self.archivo_json}: {e}")
+
+    def _reproducir(self, operacion: dict):
+        """Aplica en memoria una operación del diario, sin volver a persistirla."""
+        with self._memoria:  # Varias mutaciones (lote, marcar): una sola sección
+            self._aplicar(operacion)
+
+    def _aplicar(self, operacion: dict):
+        op = operacion["op"]
+        if "indice" in operacion:  # Diarios anteriores a los ids
+            operacion = dict(operacion, id=self._id_en(operacion["indice"]))
+        if op == "agregar":
+            self._poner(Tarea.from_dict(operacion["tarea"]))
+        elif op == "eliminar":
+            self._quitar(operacion["id"])
+        elif op == "actualizar":
+            tarea = Tarea.from_dict(operacion["tarea"])
+            tarea.id = operacion.get("id", tarea.id)
+            self._poner(tarea)
+        elif op == "marcar":
+            tarea = self._tareas[operacion["id"]]
+            tarea.completada = operacion["valor"]
+            tarea.fecha_completada = operacion.get("fecha", "") if tarea.completada else ""
+            self._indexar_fecha(tarea)
+        elif op == "ordenar":
+            self._ordenar(operacion["ascendente"])
+        elif op == "lote":
+            for suboperacion in operacion["operaciones"]:
+                self._aplicar(suboperacion)
+        else:
+            raise ValueError(f"Operación desconocida: {op}")
+
+    def _registrar(self, operacion: dict):
+        if self._lote is not None:
+            self._lote.append(operacion)
+            return
+        try:
+            if not self._compartido:
+                self._respaldar_original()
+                if self._ids_sin_guardar:
+                    # El diario no puede referirse a ids que aún no están en el snapshot
+                    self._almacenamiento.guardar(self._tareas.values())
+                    self._ids_sin_guardar = False
+                else:
+                    self._almacenamiento.registrar(operacion, self._tareas.values())
+                return
+            almacenamiento = self._almacenamiento
+            with almacenamiento.bloqueo:
+                self._respaldar_original()
+                self._absorber_cambios(operacion)
+                # Reescribe el estado completo: los ids generados al cargar van incluidos
+                almacenamiento.registrar(operacion, self._tareas.values())
+                self._ids_sin_guardar = False
+                self._sin_confirmar.append((almacenamiento.version, operacion))
+                confirmada = almacenamiento.confirmada
+                if self._sin_confirmar[0][0] <= confirmada:
+                    self._sin_confirmar = [(v, op) for v, op in self._sin_confirmar if v > confirmada]
+        except Exception as e:
+            print(f"[❌] Error al guardar en {self.archivo_json}: {e}")
+
+    # --- Acceso concurrente desde varios procesos ---
+    def cambios_externos(self) -> bool:
+        """True si otro proceso escribió el almacén desde nuestra última lectura/escritura.
+        Solo hace un stat: pensado para sondear desde la vista."""
+        return self._compartido and self._almacenamiento.cambiado()
+
+    def sincronizar(self) -> bool:
+        """Incorpora los cambios de otros procesos, si los hay (solo las tareas que difieren)."""
+        if not self.cambios_externos():
+            return False
+        with self._almacenamiento.bloqueo:
+            return self._absorber_cambios()
+
+    def _absorber_cambios(self, *operaciones: dict) -> bool:
+        """
+        Con el cerrojo tomado: si el archivo cambió, lleva la memoria al estado de
+        disco y reaplica encima lo propio que aún no se ha escrito (operaciones
+        registradas sin confirmar y las recibidas, ya aplicadas en memoria).
+        Devuelve True si la memoria cambió (un archivo solo tocado no cuenta).
+        """
+        almacenamiento = self._almacenamiento
+        if not almacenamiento.cambiado():
+            return False
+        confirmada = almacenamiento.confirmada
+        propias = [op for v, op in self._sin_confirmar if v > confirmada] + list(operaciones)
+        try:
+            datos = almacenamiento.releer()
+        except (ValueError, OSError) as e:
+            print(f"[⚠️] No se pudo releer {self.archivo_json} ({e}); se conserva la versión en memoria.")
+            return False
+        if datos is None:
+            return False  # Archivo borrado por fuera: la próxima escritura lo recrea
+        cambios = self._aplicar_diferencias(datos)
+        for operacion in propias:
             try:
-                with open(self.archivo_json, "r", encoding="utf-8") as f:
-                    datos = json.load(f)
-                    for item in datos:
-                        try:
-                            tarea = Tarea.from_dict(item)
-                            self._tareas.append(tarea)
-                        except ValueError as e:
-                            print(f"[⚠️] Tarea ignorada (JSON inválido): {e}")
-            except (json.JSONDecodeError, FileNotFoundError, PermissionError) as e:
-                print(f"[❌] Error al cargar {self.archivo_json}: {e}")
+                self._reproducir(operacion)
+            except (KeyError, IndexError, ValueError) as e:
+                print(f"[⚠️] Operación descartada ({operacion.get('op')}): "
+                      f"la tarea cambió en otro proceso ({e})")
+        return cambios
+
+    def _aplicar_diferencias(self, datos: List[dict]) -> bool:
+        """Sustituye solo las tareas nuevas, cambiadas o borradas según `datos` (orden de disco).
+        Devuelve False si la memoria ya coincidía (p. ej. el archivo solo se tocó)."""
+        columnas, rechazadas = TareasColumnar.desde_dicts(datos)
+        if rechazadas:
+            print(f"[⚠️] {len(rechazadas)} tareas ignoradas (JSON inválido) en {self.archivo_json}")
+        en_disco = {t.id: t for t in columnas.tareas()}
+        cambios = False
+        with self._memoria:
+            for id_tarea in [i for i in self._tareas if i not in en_disco]:
+                self._quitar(id_tarea)
+                cambios = True
+            for tarea in en_disco.values():
+                actual = self._tareas.get(tarea.id)
+                if actual is None or _campos(actual) != _campos(tarea):
+                    self._poner(tarea)
+                    cambios = True
+            if list(self._tareas) != list(en_disco):  # Otro proceso reordenó
+                self._reordenar(list(en_disco))
+                cambios = True
+        return cambios
 
     def guardar_en_json(self):
-        """Guarda la lista de tareas en JSON."""
+        """Guarda el estado completo (compacta el diario si lo hay)."""
         try:
-            datos = [t.to_dict() for t in self._tareas]
-            with open(self.archivo_json, "w", encoding="utf-8") as f:
-                json.dump(datos, f, ensure_ascii=False, indent=4)
+            if not self._compartido:
+                self._respaldar_original()
+                self._almacenamiento.guardar(self._tareas.values())
+            else:
+                with self._almacenamiento.bloqueo:
+                    self._respaldar_original()
+                    self._absorber_cambios()
+                    self._almacenamiento.guardar(self._tareas.values())
+            self._ids_sin_guardar = False
         except Exception as e:
-            print(f"[❌] Error al guardar en {self.archivo_json}: {e}")
\ No newline at end of file
+            print(f"[❌] Error al guardar en {self.archivo_json}: {e}")
+
+    def _respaldar_original(self):
+        """
+        Antes de la primera escritura tras una carga que ignoró datos (con el cerrojo
+        tomado): copia el archivo a <archivo>.bak, o .bak.1, .bak.2... sin pisar nunca
+        una copia anterior. Solo si sigue siendo el que se cargó: si otro proceso ya lo
+        reescribió, lo ignorado ya no está en él. Se intenta una sola vez; un fallo se
+        avisa y no impide guardar.
+        """
+        if not self._respaldo_pendiente:
+            return
+        self._respaldo_pendiente = False
+        if firma(self.archivo_json) != self._firma_cargada:
+            print(f"[⚠️] {self.archivo_json} cambió desde que se cargó: no se respalda")
+            return
+        try:
+            with open(self.archivo_json, "rb") as origen:
+                for n in count():
+                    respaldo = f"{self.archivo_json}.bak" + (f".{n}" if n else "")
+                    try:
+                        destino = open(respaldo, "xb")  # Nunca sobrescribe
+                    except FileExistsError:
+                        continue
+                    with destino:
+                        shutil.copyfileobj(origen, destino)
+                    break
+        except OSError as e:
+            print(f"[❌] No se pudo respaldar {self.archivo_json} ({e}); "
+                  f"las tareas ignoradas al cargar no se conservarán")
+            return
+        print(f"[ℹ️] {self.archivo_json} tenía datos ilegibles; copia del original en {respaldo}")
+
+    def cerrar(self):
+        """Vacía y cierra el backend (compactación final del diario)."""
+        try:
+            try:
+                self._almacenamiento.cerrar(self._tareas.values())
+            except ConflictoEscritura:
+                # Otro proceso escribió justo antes del guardado final: incorporarlo y reintentar
+                with self._almacenamiento.bloqueo:
+                    self._absorber_cambios()
+                    self._almacenamiento.guardar(self._tareas.values())
+        except Exception as e:
+            print(f"[❌] Error al cerrar {self.archivo_json}: {e}")
+
+
+class TareasEnOrden:
+    """
+    Secuencia de solo lectura en el orden almacenado: len(), índices y cortes.
+    leer(inicio, fin) entrega solo ese tramo, así que la vista virtual (que
+    pide la ventana visible) nunca recorre ni materializa el resto.
+    """
+    def __init__(self, total: int, leer: Callable[[int, int], List[Tarea]]):
+        self._total = total
+        self._leer = leer
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            inicio, fin, paso = i.indices(self._total)
+            tramo = self._leer(inicio, max(inicio, fin)) if paso > 0 else self._leer(0, self._total)[i]
+            return tramo[::paso] if paso > 1 else tramo
+        if i < 0:
+            i += self._total
+        if not 0 <= i < self._total:
+            raise IndexError("Índice fuera de rango.")
+        return self._leer(i, i + 1)[0]
+
+    def __iter__(self) -> Iterator[Tarea]:
+        return iter(self._leer(0, self._total))
+
+
+def _campos(t: Tarea) -> tuple:
+    return t.titulo, t.descripcion, t.fecha_limite, t.completada, t.fecha_completada
+
+
+def _clave_fecha(t: Tarea, ascendente: bool):
+    """Clave de orden por fecha límite; las tareas sin fecha quedan siempre al final."""
+    if not t.ordinal:
+        return float('inf') if ascendente else float('-inf')
+    return t.ordinal
@@ -0,0 +1,427 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+from models.tarea import Tarea
+from data.almacenamiento import AlmacenamientoJSON
+from data.cargador import InformeCarga
+from data.indice_busqueda import IndiceInvertido
+from data.indice_fechas import iso_de_hoy, limites_semana, ordinal_de_hoy
+from data.archivo import DIAS_ARCHIVO, ArchivoTareas, es_archivable
+from data.tarea_repository import TareasEnOrden
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS tareas (
+    id           INTEGER PRIMARY KEY,
+    uid          TEXT    NOT NULL,
+    posicion     INTEGER NOT NULL,
+    titulo       TEXT    NOT NULL,
+    descripcion  TEXT    NOT NULL DEFAULT '',
+    fecha_limite TEXT    NOT NULL DEFAULT '',
+    completada   INTEGER NOT NULL DEFAULT 0,
+    fecha_completada TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_tareas_posicion ON tareas (posicion);
+CREATE INDEX IF NOT EXISTS idx_tareas_fecha ON tareas (fecha_limite);
+CREATE INDEX IF NOT EXISTS idx_tareas_pendientes ON tareas (completada, fecha_limite, posicion);
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+"""
+
+_COLUMNAS = "uid, titulo, descripcion, fecha_limite, completada, fecha_completada"
+_HUECOS = ", ".join("?" * len(_COLUMNAS.split(",")))
+# Marcar conserva la fecha de finalización si ya estaba completada; desmarcar la borra
+_SQL_MARCAR = """
+    UPDATE tareas SET completada = :valor,
+        fecha_completada = CASE WHEN :valor = 0 THEN ''
+                                WHEN completada = 1 AND fecha_completada != '' THEN fecha_completada
+                                ELSE :fecha END
+    WHERE uid = :uid"""
+_MAX_PARAMETROS = 900  # Por debajo del límite clásico de 999 variables de SQLite
+
+
+class TareaRepositorySQLite:
+    """
+    Capa de persistencia sobre SQLite (módulo estándar sqlite3).
+    ✅ Misma API que TareaRepository
+    ✅ Índices sobre fecha_limite y completada: las vistas ordenadas/filtradas
+       se resuelven con recorridos de índice y LIMIT/OFFSET
+    ✅ Migración única desde el tareas.json existente (anotada en la tabla meta:
+       una base vaciada después no vuelve a importarlo)
+    ✅ Ids estables de Tarea (columna uid con índice único)
+    ✅ Varios procesos: SQLite serializa las escrituras y PRAGMA data_version
+       detecta los cambios ajenos sin leer las tablas
+    """
+    def __init__(self, archivo_db: str = "tareas.db", migrar_desde: Optional[str] = "tareas.json"):
+        """migrar_desde, si es relativa, se busca en la carpeta de archivo_db."""
+        self.archivo_db = archivo_db
+        self._conn = sqlite3.connect(archivo_db, timeout=30)  # Espera a otros escritores
+        self._conn.executescript(_ESQUEMA)
+        self._migrar_esquema()
+        self.informe_carga = InformeCarga(archivo_db)
+        self._indice: Optional[IndiceInvertido] = None  # Se construye en la primera búsqueda
+        self._profundidad_lote = 0
+        self.archivo = ArchivoTareas.junto_a(archivo_db)  # Nivel frío (completadas antiguas)
+        if migrar_desde:
+            self._migrar_una_vez(os.path.join(os.path.dirname(os.path.abspath(archivo_db)), migrar_desde))
+        self._version_datos = self._data_version()
+
+    @property
+    def tareas(self) -> List[Tarea]:
+        filas = self._conn.execute(f"SELECT {_COLUMNAS} FROM tareas ORDER BY posicion")
+        return [_fila_a_tarea(f) for f in filas]
+
+    def __len__(self) -> int:
+        return self._contar()
+
+    def en_orden(self) -> TareasEnOrden:
+        """Como `tareas`, pero cada corte es una consulta LIMIT/OFFSET."""
+        return TareasEnOrden(self._contar(), lambda inicio, fin: [_fila_a_tarea(f) for f in self._conn.execute(
+            f"SELECT {_COLUMNAS} FROM tareas ORDER BY posicion LIMIT ? OFFSET ?", (fin - inicio, inicio))])
+
+    # --- Operaciones por id ---
+    def obtener(self, id_tarea: str) -> Tarea:
+        fila = self._conn.execute(
+            f"SELECT {_COLUMNAS} FROM tareas WHERE uid = ?", (id_tarea,)).fetchone()
+        if fila is None:
+            raise KeyError(f"No existe la tarea {id_tarea}.")
+        return _fila_a_tarea(fila)
+
+    def agregar(self, tarea: Tarea):
+        try:
+            with self._transaccion():
+                self._conn.execute(
+                    f"INSERT INTO tareas (posicion, {_COLUMNAS}) "
+                    f"VALUES ((SELECT COALESCE(MAX(posicion), 0) + 1 FROM tareas), {_HUECOS})",
+                    _tarea_a_fila(tarea))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Ya existe una tarea con id {tarea.id}.")
+        self._indexar(tarea)
+
+    def eliminar(self, id_tarea: str) -> Tarea:
+        tarea = self.obtener(id_tarea)
+        with self._transaccion():
+            self._conn.execute("DELETE FROM tareas WHERE uid = ?", (id_tarea,))
+        if self._indice is not None:
+            self._indice.eliminar(id_tarea)
+        return tarea
+
+    def actualizar(self, id_tarea: str, tarea: Tarea):
+        """Reemplaza la tarea conservando su id y su posición."""
+        tarea.id = id_tarea
+        with self._transaccion():
+            cursor = self._conn.execute(
+                "UPDATE tareas SET titulo = ?, descripcion = ?, fecha_limite = ?, completada = ?, "
+                "fecha_completada = ? WHERE uid = ?", (*_tarea_a_fila(tarea)[1:], id_tarea))
+        if cursor.rowcount == 0:
+            raise KeyError(f"No existe la tarea {id_tarea}.")
+        self._indexar(tarea)
+
+    def marcar(self, id_tarea: str, valor: bool = True):
+        with self._transaccion():
+            cursor = self._conn.execute(_SQL_MARCAR, dict(_parametros_marcar(valor), uid=id_tarea))
+        if cursor.rowcount == 0:
+            raise KeyError(f"No existe la tarea {id_tarea}.")
+
+    # --- Operaciones masivas (una sola transacción) ---
+    @contextmanager
+    def lote(self):
+        """Como TareaRepository.lote(): todo el bloque se confirma en un único COMMIT."""
+        self._profundidad_lote += 1
+        try:
+            yield self
+        finally:
+            self._profundidad_lote -= 1
+            if not self._profundidad_lote:
+                self._conn.commit()
+
+    @contextmanager
+    def _transaccion(self):
+        if self._profundidad_lote:
+            yield  # Dentro de lote(): el COMMIT llega al salir del lote
+            return
+        with self._conn:
+            yield
+
+    def agregar_varias(self, tareas: Iterable[Tarea]):
+        """Añade todas o ninguna: los ids repetidos se detectan antes de insertar."""
+        filas = [_tarea_a_fila(t) for t in tareas]
+        uids = [f[0] for f in filas]
+        repetidos = len(set(uids)) != len(uids)
+        if repetidos or self._existentes(uids):
+            raise ValueError("Alguna de las tareas ya existe (id repetido).")
+        with self._transaccion():
+            inicio = self._conn.execute("SELECT COALESCE(MAX(posicion), 0) FROM tareas").fetchone()[0]
+            self._conn.executemany(
+                f"INSERT INTO tareas (posicion, {_COLUMNAS}) VALUES (?, {_HUECOS})",
+                ((inicio + i + 1, *fila) for i, fila in enumerate(filas)))
+        if self._indice is not None:
+            self._indice.agregar_varios((f[0], f"{f[1]} {f[2]}") for f in filas)
+
+    def marcar_varias(self, ids: Iterable[str], valor: bool = True):
+        ids = list(dict.fromkeys(ids))
+        if len(self._existentes(ids)) != len(ids):
+            raise KeyError("Alguna de las tareas seleccionadas ya no existe.")
+        with self._transaccion():
+            parametros = _parametros_marcar(valor)
+            self._conn.executemany(_SQL_MARCAR, (dict(parametros, uid=i) for i in ids))
+
+    def eliminar_varias(self, ids: Iterable[str]) -> List[Tarea]:
+        tareas = [self.obtener(i) for i in dict.fromkeys(ids)]
+        with self._transaccion():
+            self._conn.executemany("DELETE FROM tareas WHERE uid = ?", ((t.id,) for t in tareas))
+        if self._indice is not None:
+            for tarea in tareas:
+                self._indice.eliminar(tarea.id)
+        return tareas
+
+    def limpiar_completadas(self) -> int:
+        with self._transaccion():
+            cursor = self._conn.execute("DELETE FROM tareas WHERE completada = 1")
+        self._indice = None  # Se reconstruye en la próxima búsqueda
+        return cursor.rowcount
+
+    # --- Nivel frío: archivo de completadas (mismo formato que TareaRepository) ---
+    def archivar_completadas(self, dias: int = DIAS_ARCHIVO, hoy=None) -> int:
+        limite = ordinal_de_hoy(hoy) - dias
+        antiguas = [t for t in (_fila_a_tarea(f) for f in self._conn.execute(
+            f"SELECT {_COLUMNAS} FROM tareas WHERE completada = 1")) if es_archivable(t, limite)]
+        if antiguas:
+            self.archivo.archivar(antiguas)
+            self.eliminar_varias([t.id for t in antiguas])
+        return len(antiguas)
+
+    def historial(self, limite: Optional[int] = None, despues_de: Optional[Tarea] = None) -> List[Tarea]:
+        return list(self.archivo.historial(limite, despues_de))
+
+    def reabrir_archivadas(self, tareas: Iterable[Tarea]) -> List[Tarea]:
+        tareas = list(tareas)
+        presentes = self._existentes([t.id for t in tareas])
+        tareas = [t for t in tareas if t.id not in presentes]
+        reabiertas = [Tarea(titulo=t.titulo, descripcion=t.descripcion, fecha_limite=t.fecha_limite,
+                            id=t.id) for t in tareas]
+        self.agregar_varias(reabiertas)
+        self.archivo.quitar(tareas)
+        return reabiertas
+
+    def _existentes(self, uids: List[str]) -> set:
+        existentes = set()
+        for inicio in range(0, len(uids), _MAX_PARAMETROS):
+            bloque = uids[inicio:inicio + _MAX_PARAMETROS]
+            existentes.update(fila[0] for fila in self._conn.execute(
+                f"SELECT uid FROM tareas WHERE uid IN ({', '.join('?' * len(bloque))})", bloque))
+        return existentes
+
+    def buscar(self, consulta: str) -> List[Tarea]:
+        """Igual que TareaRepository.buscar; el índice invertido se crea con la primera búsqueda."""
+        self.sincronizar()  # El índice en memoria no ve lo que escriben otros procesos
+        if self._indice is None:
+            self._indice = IndiceInvertido()
+            self._indice.agregar_varios(
+                (uid, f"{titulo} {descripcion}") for uid, titulo, descripcion in
+                self._conn.execute("SELECT uid, titulo, descripcion FROM tareas"))
+        ids = list(self._indice.buscar(consulta))
+        filas = []
+        for inicio in range(0, len(ids), _MAX_PARAMETROS):
+            bloque = ids[inicio:inicio + _MAX_PARAMETROS]
+            filas.extend(self._conn.execute(
+                f"SELECT posicion, {_COLUMNAS} FROM tareas "
+                f"WHERE uid IN ({', '.join('?' * len(bloque))})", bloque))
+        filas.sort()
+        return [_fila_a_tarea(f[1:]) for f in filas]
+
+    # --- Operaciones por índice (compatibilidad) ---
+    def eliminar_por_indice(self, indice: int):
+        self.eliminar(self._id_en(indice))
+
+    def actualizar_por_indice(self, indice: int, tarea: Tarea):
+        self.actualizar(self._id_en(indice), tarea)
+
+    def marcar_completada(self, indice: int, valor: bool = True):
+        self.marcar(self._id_en(indice), valor)
+
+    def ordenar_por_fecha(self, ascendente: bool = True):
+        """Reescribe el orden almacenado por fecha límite (sin fecha al final, orden estable)."""
+        direccion = "ASC" if ascendente else "DESC"
+        with self._transaccion():
+            self._conn.execute(f"""
+                UPDATE tareas SET posicion = orden.n
+                FROM (SELECT id, ROW_NUMBER() OVER (
+                          ORDER BY fecha_limite = '', fecha_limite {direccion}, posicion) AS n
+                      FROM tareas) AS orden
+                WHERE orden.id = tareas.id""")
+
+    def pendientes(self, ascendente: bool = True, limite: Optional[int] = None,
+                   desplazamiento: int = 0) -> List[Tarea]:
+        """
+        Tareas no completadas ordenadas por fecha (sin fecha al final), paginadas.
+        Las fechadas salen de un rango de idx_tareas_pendientes; las sin fecha,
+        de la misma clave (completada = 0, fecha_limite = '').
+        """
+        direccion = "ASC" if ascendente else "DESC"
+        limite_sql = -1 if limite is None else limite
+        resultado = [_fila_a_tarea(f) for f in self._conn.execute(
+            f"SELECT {_COLUMNAS} FROM tareas WHERE completada = 0 AND fecha_limite > '' "
+            f"ORDER BY fecha_limite {direccion}, posicion LIMIT ? OFFSET ?",
+            (limite_sql, desplazamiento))]
+        if limite is not None and len(resultado) >= limite:
+            return resultado
+        # Se agotaron las fechadas: continuar con las tareas sin fecha
+        con_fecha = self._conn.execute(
+            "SELECT COUNT(*) FROM tareas WHERE completada = 0 AND fecha_limite > ''").fetchone()[0]
+        restantes = -1 if limite is None else limite - len(resultado)
+        resultado.extend(_fila_a_tarea(f) for f in self._conn.execute(
+            f"SELECT {_COLUMNAS} FROM tareas WHERE completada = 0 AND fecha_limite = '' "
+            "ORDER BY posicion LIMIT ? OFFSET ?",
+            (restantes, max(0, desplazamiento - con_fecha))))
+        return resultado
+
+    def ordenadas_por_fecha(self, ascendente: bool = True, limite: Optional[int] = None,
+                            desplazamiento: int = 0, solo_pendientes: bool = False) -> List[Tarea]:
+        """Vista ordenada por fecha sin reescribir posicion (ver ordenar_por_fecha)."""
+        if solo_pendientes:
+            return self.pendientes(ascendente, limite, desplazamiento)
+        direccion = "ASC" if ascendente else "DESC"
+        return [_fila_a_tarea(f) for f in self._conn.execute(
+            f"SELECT {_COLUMNAS} FROM tareas "
+            f"ORDER BY fecha_limite = '', fecha_limite {direccion}, posicion LIMIT ? OFFSET ?",
+            (-1 if limite is None else limite, desplazamiento))]
+
+    def proximas(self, limite: int = 10, hoy=None) -> List[Tarea]:
+        return self._pendientes_entre(ordinal_de_hoy(hoy), None, limite)
+
+    def vencidas(self, hoy=None) -> List[Tarea]:
+        return self._pendientes_entre(1, ordinal_de_hoy(hoy) - 1)
+
+    def esta_semana(self, hoy=None) -> List[Tarea]:
+        return self._pendientes_entre(*limites_semana(hoy))
+
+    def _pendientes_entre(self, desde: int, hasta: Optional[int],
+                          limite: Optional[int] = None) -> List[Tarea]:
+        """Rango de idx_tareas_pendientes; las fechas AAAA-MM-DD se comparan como texto."""
+        from datetime import date
+        hasta_sql = "9999-12-31" if hasta is None else date.fromordinal(hasta).isoformat()
+        return [_fila_a_tarea(f) for f in self._conn.execute(
+            f"SELECT {_COLUMNAS} FROM tareas WHERE completada = 0 AND fecha_limite BETWEEN ? AND ? "
+            "ORDER BY fecha_limite, posicion LIMIT ?",
+            (date.fromordinal(desde).isoformat(), hasta_sql, -1 if limite is None else limite))]
+
+    def migrar_desde_json(self, archivo_json: str):
+        """Importa (una sola vez) las tareas de un tareas.json existente."""
+        datos, _ = AlmacenamientoJSON(archivo_json).cargar()
+        filas = []
+        for item in datos:
+            try:
+                filas.append(_tarea_a_fila(Tarea.from_dict(item)))
+            except ValueError as e:
+                print(f"[⚠️] Tarea ignorada (JSON inválido): {e}")
+        inicio = self._contar()
+        with self._transaccion():
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO tareas (posicion, {_COLUMNAS}) VALUES (?, {_HUECOS})",
+                ((inicio + i + 1, *fila) for i, fila in enumerate(filas)))
+        self._indice = None
+        print(f"[ℹ️] Migradas {len(filas)} tareas desde {archivo_json} a {self.archivo_db}")
+
+    def _migrar_una_vez(self, archivo_json: str):
+        """
+        La primera vez que se abre la base (sin la marca en meta) importa archivo_json
+        si la base está vacía, y anota la migración en la misma transacción. Las bases
+        con datos de antes de la marca se dan por migradas.
+        """
+        if self._conn.execute("SELECT 1 FROM meta WHERE clave = 'migrado_desde'").fetchone():
+            return
+        with self.lote():
+            if self._contar() == 0 and os.path.exists(archivo_json):
+                self.migrar_desde_json(archivo_json)
+            self._conn.execute("INSERT OR REPLACE INTO meta (clave, valor) VALUES ('migrado_desde', ?)",
+                               (archivo_json,))
+
+    def cargar_desde_json(self):
+        """Compatibilidad con TareaRepository: los datos se leen bajo demanda."""
+        pass
+
+    def cargar_incremental(self, tamano_lote: int = 2000, decodificar: bool = True) -> Iterator[List[Tarea]]:
+        """Compatibilidad con TareaRepository: entrega las tareas por páginas (nada con decodificar=False)."""
+        if not decodificar:
+            return
+        self.informe_carga = InformeCarga(self.archivo_db)
+        ultima = 0
+        while True:
+            filas = self._conn.execute(
+                f"SELECT posicion, {_COLUMNAS} FROM tareas WHERE posicion > ? "
+                "ORDER BY posicion LIMIT ?", (ultima, tamano_lote)).fetchall()
+            if not filas:
+                return
+            ultima = filas[-1][0]
+            lote = [_fila_a_tarea(f[1:]) for f in filas]
+            self.informe_carga.aceptadas += len(lote)
+            yield lote
+
+    # --- Acceso concurrente desde varios procesos ---
+    def cambios_externos(self) -> bool:
+        """True si otra conexión confirmó cambios desde la última comprobación."""
+        return self._data_version() != self._version_datos
+
+    def sincronizar(self) -> bool:
+        """Las consultas ya leen de la base: solo se descarta el índice de búsqueda."""
+        if not self.cambios_externos():
+            return False
+        self._version_datos = self._data_version()
+        self._indice = None
+        return True
+
+    def _data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def guardar_en_json(self):
+        """Compatibilidad con TareaRepository: cada operación ya se confirma."""
+        self._conn.commit()
+
+    def cerrar(self):
+        self._conn.close()
+
+    def _migrar_esquema(self):
+        """Añade las columnas uid y fecha_completada a bases creadas antes de existir."""
+        columnas = [fila[1] for fila in self._conn.execute("PRAGMA table_info(tareas)")]
+        with self._conn:
+            if "uid" not in columnas:
+                self._conn.execute("ALTER TABLE tareas ADD COLUMN uid TEXT NOT NULL DEFAULT ''")
+                self._conn.execute("UPDATE tareas SET uid = lower(hex(randomblob(16)))")
+            self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_tareas_uid ON tareas (uid)")
+            if "fecha_completada" not in columnas:
+                self._conn.execute(
+                    "ALTER TABLE tareas ADD COLUMN fecha_completada TEXT NOT NULL DEFAULT ''")
+
+    def _indexar(self, tarea: Tarea):
+        if self._indice is not None:
+            self._indice.agregar(tarea.id, f"{tarea.titulo} {tarea.descripcion}")
+
+    def _contar(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM tareas").fetchone()[0]
+
+    def _id_en(self, indice: int) -> str:
+        fila = None
+        if indice >= 0:
+            fila = self._conn.execute(
+                "SELECT uid FROM tareas ORDER BY posicion LIMIT 1 OFFSET ?", (indice,)).fetchone()
+        if fila is None:
+            raise IndexError("Índice fuera de rango.")
+        return fila[0]
+
+
+def _tarea_a_fila(tarea: Tarea) -> tuple:
+    return (tarea.id, tarea.titulo, tarea.descripcion, tarea.fecha_limite, int(tarea.completada),
+            tarea.fecha_completada)
+
+
+def _fila_a_tarea(fila: tuple) -> Tarea:
+    uid, titulo, descripcion, fecha_limite, completada, fecha_completada = fila
+    return Tarea(titulo=titulo, descripcion=descripcion, fecha_limite=fecha_limite,
+                 completada=bool(completada), id=uid, fecha_completada=fecha_completada)
+
+
+def _parametros_marcar(valor: bool) -> dict:
+    return {"valor": int(bool(valor)), "fecha": iso_de_hoy() if valor else ""}
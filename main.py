@@ -1,42 +1,192 @@
 # main.py
 import tkinter as tk
 from views.app_view import AppView
-from data.tarea_repository import TareaRepository
+from data.fabrica import crear_repositorio
+from data.archivo import DIAS_ARCHIVO
 from models.tarea import Tarea
+from utils.instrumentacion import Instrumentacion
+from utils.cache_pdf import crear_cache_pdf
+import copy
+import os
+import queue
 import sys
+import threading
+from typing import List, Optional
 import subprocess
 import importlib
 
+# Pendientes a partir de los cuales el PDF se genera en varios procesos
+UMBRAL_PARALELO = 20000
+# Tareas que muestra la vista "Próximas"
+LIMITE_PROXIMAS = 50
+# Días tras completarse en que una tarea pasa al historial (TAREAS_ARCHIVAR_DIAS)
+DIAS_ARCHIVAR = int(os.environ.get("TAREAS_ARCHIVAR_DIAS", DIAS_ARCHIVO))
+
 
 class Controlador:
     def __init__(self):
-        self.repo = TareaRepository()
+        # TAREAS_ARCHIVO=tareas.db usa SQLite; TAREAS_DIARIO=1 activa el diario append-only
+        self.repo = crear_repositorio(os.environ.get("TAREAS_ARCHIVO", "tareas.json"),
+                                      diario=os.environ.get("TAREAS_DIARIO") == "1",
+                                      cargar=False, asincrono=True)
         self.root = tk.Tk()
         self.vista = AppView(self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self._al_cerrar)
+
+        # TAREAS_PERFIL=1: medir manejadores y fases (antes de repartir los callbacks)
+        self.instrumentacion = Instrumentacion(
+            activa=os.environ.get("TAREAS_PERFIL") == "1",
+            archivo=os.environ.get("TAREAS_PERFIL_ARCHIVO", "perfil_tareas.json"))
+        self._instrumentar()
 
         # Conectar callbacks
         self.vista.set_on_agregar(self.agregar_tarea)
         self.vista.set_on_ordenar(self.ordenar_por_fecha)
         self.vista.set_on_exportar_pdf(self.exportar_a_pdf)
+        self.vista.set_on_vista(self.cambiar_vista)
+        self.vista.set_on_buscar(self.buscar)
         self.vista.set_on_marcar(self.marcar_completada)
         self.vista.set_on_eliminar(self.eliminar_tarea)
+        self.vista.set_on_limpiar_completadas(self.limpiar_completadas)
+        self.vista.set_on_historial(self.abrir_historial)
+
+        self._exportacion: Optional[threading.Event] = None  # Señal de cancelación en curso
+        # Exportaciones repetidas de la misma lista: PDF copiado de la caché (TAREAS_CACHE_PDF=0 la desactiva)
+        self._cache_pdf = crear_cache_pdf()
+        self._filtro = ""  # Texto del cuadro de búsqueda
+        self._vista = "todas"  # Clave de views.app_view.VISTAS
+        self._orden: Optional[bool] = None  # Orden por fecha de "todas" (None = almacenado)
+
+        # Inicializar vista: carga por lotes sin bloquear la ventana
+        self._cargando = True
+        # Binario: abrir es inmediato y cada tarea se decodifica cuando la vista la pide
+        self._lotes = self.repo.cargar_incremental(decodificar=False)
+        self.root.after(0, self._cargar_siguiente_lote)
 
-        # Inicializar vista
-        self.vista.actualizar_lista(self.repo.tareas)
+    def _cargar_siguiente_lote(self):
+        lote = next(self._lotes, None)
+        if lote is not None:
+            if len(self.repo) == len(lote):
+                self._refrescar()  # Primera página cuanto antes
+            self.vista.mostrar_estado(f"Cargando… {len(self.repo)} tareas")
+            self.root.after(1, self._cargar_siguiente_lote)
+            return
+        self._cargando = False
+        archivadas = self._archivar()
+        self._refrescar()
+        self.vista.mostrar_estado(f"{len(self.repo)} tareas" +
+                                  (f" ({archivadas} completadas pasadas al historial)" if archivadas else ""))
+        # Otras instancias (u otros scripts) pueden escribir el mismo almacén
+        self.vista.vigilar_cambios(self.repo.cambios_externos, self.recargar_cambios)
+        informe = self.repo.informe_carga
+        if informe.rechazadas or informe.error:
+            self.vista.mostrar_error(f"⚠️ Problemas al cargar {informe.origen}:\n{informe.resumen()}")
+
+    def _archivar(self) -> int:
+        """Saca del conjunto de trabajo las completadas hace más de DIAS_ARCHIVAR días."""
+        try:
+            return self.repo.archivar_completadas(DIAS_ARCHIVAR)
+        except OSError as e:
+            print(f"[⚠️] No se pudieron archivar las tareas completadas: {e}")
+            return 0
+
+    def _instrumentar(self):
+        medir = self.instrumentacion
+        if not medir.activa:
+            return
+        medir.instrumentar(self, ("agregar_tarea", "marcar_completada", "eliminar_tarea",
+                                  "limpiar_completadas", "ordenar_por_fecha", "exportar_a_pdf", "buscar", "cambiar_vista",
+                                  "abrir_historial", "reabrir_archivadas", "recargar_cambios"),
+                           operacion=True)
+        # Carga por lotes: cada paso del generador es una muestra de "cargar_incremental"
+        medir.instrumentar(self.repo, ("cargar_incremental", "cerrar", "buscar", "ordenadas_por_fecha",
+                                       "pendientes", "proximas", "vencidas", "esta_semana",
+                                       "archivar_completadas", "historial", "reabrir_archivadas",
+                                       "sincronizar"))
+        backend = getattr(self.repo, "almacenamiento", None)
+        if backend is None:
+            # SQLite: cada mutación confirma en la base en el acto
+            medir.instrumentar(self.repo, ("agregar", "marcar_varias", "eliminar_varias",
+                                           "limpiar_completadas"))
+        elif hasattr(backend, "_escribir_snapshot"):
+            # Diario: la línea añadida en cada mutación y la compactación (hilo propio)
+            medir.instrumentar(backend, ("registrar", "_escribir_snapshot"), prefijo="almacenamiento.")
+        else:
+            # JSON/binario: en modo asíncrono las mutaciones solo encolan; la escritura real va
+            # en el hilo de fondo y queda como fase propia (copia con el cerrojo + volcado)
+            medir.instrumentar(backend, ("_instantanea", "_escribir"), prefijo="almacenamiento.")
+        medir.instrumentar(self.vista, ("actualizar_lista", "mostrar_info", "mostrar_error"))
+        self.vista.habilitar_depuracion(medir.resumen, self._volcar_instrumentacion,
+                                        medir.perfilar_siguiente, medir.reiniciar)
+
+    def _volcar_instrumentacion(self):
+        try:
+            ruta = self.instrumentacion.volcar()
+            self.vista.mostrar_info("💾 Latencias", f"Guardadas en:\n{os.path.abspath(ruta)}")
+        except OSError as e:
+            self.vista.mostrar_error(f"❌ No se pudieron guardar las latencias:\n{e}")
+
+    def _refrescar(self) -> int:
+        """Muestra la vista por fecha elegida, filtrada por la búsqueda activa."""
+        if self._vista == "todas" and self._orden is None:
+            # Sin filtro: la vista virtual solo pide (y el binario solo decodifica) la ventana visible
+            tareas = self.repo.buscar(self._filtro) if self._filtro else self.repo.en_orden()
+        else:
+            if self._vista == "proximas":
+                tareas = self.repo.proximas(LIMITE_PROXIMAS)
+            elif self._vista == "semana":
+                tareas = self.repo.esta_semana()
+            elif self._vista == "vencidas":
+                tareas = self.repo.vencidas()
+            else:
+                tareas = self.repo.ordenadas_por_fecha(ascendente=self._orden)
+            if self._filtro:
+                coinciden = {t.id for t in self.repo.buscar(self._filtro)}
+                tareas = [t for t in tareas if t.id in coinciden]
+        self.vista.actualizar_lista(tareas)
+        return len(tareas)
+
+    def recargar_cambios(self):
+        """Otro proceso escribió el almacén: incorporar lo que cambió y refrescar."""
+        try:
+            if self.repo.sincronizar():
+                self._refrescar()
+                self.vista.mostrar_estado(f"🔄 Actualizado desde otro proceso: {len(self.repo)} tareas")
+        except Exception as e:
+            self.vista.mostrar_error(f"❌ Error al recargar los cambios externos:\n{e}")
+
+    def cambiar_vista(self, clave: str):
+        self._vista = clave
+        self._refrescar()
+
+    def buscar(self, texto: str):
+        self._filtro = texto
+        mostradas = self._refrescar()
+        if not self._cargando:
+            total = len(self.repo)
+            self.vista.mostrar_estado(f"{mostradas} de {total} tareas" if texto else f"{total} tareas")
+
+    def _ocupado(self) -> bool:
+        if self._cargando:
+            self.vista.mostrar_info("⏳ Cargando", "Espere a que terminen de cargarse las tareas.")
+        return self._cargando
 
     def agregar_tarea(self, titulo: str, descripcion: str, fecha: str):
+        if self._ocupado():
+            return
         try:
-            if not titulo.strip():
-                raise ValueError("El título no puede estar vacío.")
-            
-            # Validar fecha
-            if fecha:
-                from datetime import datetime
-                datetime.strptime(fecha, "%Y-%m-%d")  # Solo valida, no usa
-
-            tarea = Tarea(titulo=titulo, descripcion=descripcion, fecha_limite=fecha)
+            with self.instrumentacion.fase("validación"):
+                if not titulo.strip():
+                    raise ValueError("El título no puede estar vacío.")
+
+                # Validar fecha
+                if fecha:
+                    from datetime import datetime
+                    datetime.strptime(fecha, "%Y-%m-%d")  # Solo valida, no usa
+
+                tarea = Tarea(titulo=titulo, descripcion=descripcion, fecha_limite=fecha)
             self.repo.agregar(tarea)
-            self.vista.actualizar_lista(self.repo.tareas)
+            self._refrescar()
             self.vista.limpiar_campos()
             self.vista.mostrar_info("✅ Éxito", f"Tarea '{tarea.titulo}' añadida.")
 
@@ -46,17 +196,27 @@ class Controlador:
             self.vista.mostrar_error(f"❌ Error inesperado:\n{e}")
 
     def ordenar_por_fecha(self, ascendente: bool):
+        if self._ocupado():
+            return
         try:
-            self.repo.ordenar_por_fecha(ascendente=ascendente)
-            self.vista.actualizar_lista(self.repo.tareas)
+            # Solo cambia la vista: el orden almacenado no se toca ni se guarda nada
+            self._orden = ascendente
+            self._vista = "todas"
+            self.vista.seleccionar_vista("todas")
+            self._refrescar()
             orden = "más próximas primero" if ascendente else "más lejanas primero"
-            self.vista.mostrar_info("✅ Ordenado", f"Tareas ordenadas: {orden}.")
+            self.vista.mostrar_estado(f"Tareas ordenadas: {orden}.")
         except Exception as e:
             self.vista.mostrar_error(f"❌ Error al ordenar:\n{e}")
 
     def exportar_a_pdf(self):
+        if self._ocupado():
+            return
+        if self._exportacion is not None:
+            self.vista.mostrar_info("⏳ Exportando", "Ya hay una exportación en curso.")
+            return
         try:
-            from utils.pdf_exporter import PDFExporter, REPORTLAB_AVAILABLE
+            from utils.pdf_exporter import PDFExporter, ExportacionCancelada, REPORTLAB_AVAILABLE
         except ImportError:
             REPORTLAB_AVAILABLE = False
 
@@ -78,63 +238,175 @@ class Controlador:
                     self.vista.mostrar_error(f"❌ Error al instalar:\n{e}")
             return
 
-        if not self.repo.tareas:
+        if not len(self.repo):
             self.vista.mostrar_info("ℹ️ Sin datos", "No hay tareas para exportar.")
             return
 
-        # Exportar solo tareas pendientes (no completadas)
-        tareas_pendientes = [t for t in self.repo.tareas if not t.completada]
+        # Exportar solo tareas pendientes (no completadas), más próximas primero
+        # Copias: el hilo de render no debe leer tareas que la interfaz sigue modificando
+        tareas_pendientes = [copy.copy(t) for t in self.repo.pendientes(ascendente=True)]
         if not tareas_pendientes:
             self.vista.mostrar_info("ℹ️ Sin pendientes", "No hay tareas pendientes para exportar.")
             return
 
-        ruta = self.vista.root.tk.call("tk", "getSaveFile",
-                                       "-defaultextension", ".pdf",
-                                       "-filetypes", "{{PDF files} {.pdf}}",
-                                       "-initialfile", "Informe_Tareas_EDD.pdf")
+        with self.instrumentacion.fase("diálogo guardar"):
+            ruta = self.vista.root.tk.call("tk", "getSaveFile",
+                                           "-defaultextension", ".pdf",
+                                           "-filetypes", "{{PDF files} {.pdf}}",
+                                           "-initialfile", "Informe_Tareas_EDD.pdf")
         if not ruta:
             return
 
         try:
             # Asegurar que la carpeta destino exista
-            import os
             carpeta = os.path.dirname(ruta)
             if carpeta and not os.path.exists(carpeta):
                 os.makedirs(carpeta, exist_ok=True)
-
-            PDFExporter.exportar(tareas_pendientes, ruta)
-            self.vista.mostrar_info("✅ PDF generado", f"Guardado en:\n{ruta}")
         except Exception as e:
             self.vista.mostrar_error(f"❌ Error al generar PDF:\n{e}")
+            return
+
+        # Renderizar en un hilo; la vista se actualiza desde el bucle de Tk
+        self._exportacion = threading.Event()
+        mensajes = queue.Queue()
+
+        def trabajar():
+            try:
+                # Informes muy grandes: repartir el render entre núcleos
+                paralelo = len(tareas_pendientes) > UMBRAL_PARALELO
+                exportar = PDFExporter.exportar_paralelo if paralelo else PDFExporter.exportar_streaming
+
+                def renderizar(destino: str):
+                    # Hilo propio, sin operación abierta: la fase lleva el nombre completo
+                    with self.instrumentacion.fase("exportar_a_pdf › render reportlab"):
+                        exportar(tareas_pendientes, destino,
+                                 progreso=lambda n: mensajes.put(("progreso", n)),
+                                 cancelado=self._exportacion.is_set)
 
-    def marcar_completada(self, indice: int):
+                if self._cache_pdf is None:
+                    renderizar(ruta)
+                elif self._cache_pdf.exportar(tareas_pendientes, ruta, renderizar,
+                                              formato="paralelo" if paralelo else "streaming"):
+                    # Lista sin cambios desde una exportación anterior: PDF copiado de la caché
+                    mensajes.put(("progreso", len(tareas_pendientes)))
+                mensajes.put(("ok", ruta))
+            except ExportacionCancelada:
+                mensajes.put(("cancelado", None))
+            except Exception as e:
+                mensajes.put(("error", e))
+
+        self.vista.mostrar_progreso(len(tareas_pendientes), self._exportacion.set)
+        threading.Thread(target=trabajar, daemon=True).start()
+        self.root.after(100, self._atender_exportacion, mensajes, len(tareas_pendientes))
+
+    def _atender_exportacion(self, mensajes: queue.Queue, total: int):
+        while True:
+            try:
+                tipo, valor = mensajes.get_nowait()
+            except queue.Empty:
+                self.root.after(100, self._atender_exportacion, mensajes, total)
+                return
+            if tipo == "progreso":
+                self.vista.actualizar_progreso(valor, total)
+                continue
+            self.vista.ocultar_progreso()
+            self._exportacion = None
+            if tipo == "ok":
+                self.vista.mostrar_info("✅ PDF generado", f"Guardado en:\n{valor}")
+            elif tipo == "cancelado":
+                self.vista.mostrar_info("ℹ️ Cancelado", "La exportación se canceló.")
+            else:
+                self.vista.mostrar_error(f"❌ Error al generar PDF:\n{valor}")
+            return
+
+    def marcar_completada(self, ids: List[str]):
+        """Alterna una tarea; con varias seleccionadas, todas pasan al mismo estado."""
+        if self._ocupado():
+            return
         try:
-            if not (0 <= indice < len(self.repo.tareas)):
-                raise IndexError("Índice fuera de rango.")
-            nuevo_estado = not self.repo.tareas[indice].completada
-            self.repo.marcar_completada(indice, nuevo_estado)
-            self.vista.actualizar_lista(self.repo.tareas)
+            tareas = [self.repo.obtener(i) for i in ids]
+            # Si todas están completadas se desmarcan; si no, se marcan todas
+            nuevo_estado = not all(t.completada for t in tareas)
+            self.repo.marcar_varias(ids, nuevo_estado)
+            self._refrescar()
+        except KeyError:
+            self.vista.mostrar_error("La tarea seleccionada ya no existe.")
         except Exception as e:
             self.vista.mostrar_error(f"❌ Error al marcar:\n{e}")
 
-    def eliminar_tarea(self, indice: int):
+    def eliminar_tarea(self, ids: List[str]):
+        if self._ocupado():
+            return
         try:
-            if not (0 <= indice < len(self.repo.tareas)):
-                raise IndexError("Índice fuera de rango.")
-            
-            tarea = self.repo.tareas[indice]
-            confirm = self.vista.root.tk.call("tk", "messageBox",
-                                             "-type", "yesno",
-                                             "-icon", "warning",
-                                             "-message", f"¿Eliminar tarea '{tarea.titulo}'?",
-                                             "-title", "🗑️ Confirmar eliminación")
-            if confirm == "yes":
-                self.repo.eliminar_por_indice(indice)
-                self.vista.actualizar_lista(self.repo.tareas)
-                self.vista.mostrar_info("✅ Eliminada", f"Tarea '{tarea.titulo}' eliminada.")
+            tareas = [self.repo.obtener(i) for i in ids]
+            if len(tareas) == 1:
+                pregunta, hecho = f"¿Eliminar tarea '{tareas[0].titulo}'?", f"Tarea '{tareas[0].titulo}' eliminada."
+            else:
+                pregunta, hecho = f"¿Eliminar {len(tareas)} tareas?", f"{len(tareas)} tareas eliminadas."
+            if self._confirmar(pregunta):
+                self.repo.eliminar_varias(ids)
+                self._refrescar()
+                self.vista.mostrar_info("✅ Eliminada", hecho)
+        except KeyError:
+            self.vista.mostrar_error("La tarea seleccionada ya no existe.")
         except Exception as e:
             self.vista.mostrar_error(f"❌ Error al eliminar:\n{e}")
 
+    def limpiar_completadas(self):
+        if self._ocupado():
+            return
+        completadas = len(self.repo) - len(self.repo.pendientes())
+        if not completadas:
+            self.vista.mostrar_info("ℹ️ Sin completadas", "No hay tareas completadas que eliminar.")
+            return
+        try:
+            if self._confirmar(f"¿Eliminar las {completadas} tareas completadas?"):
+                eliminadas = self.repo.limpiar_completadas()
+                self._refrescar()
+                self.vista.mostrar_estado(f"{eliminadas} tareas completadas eliminadas.")
+        except Exception as e:
+            self.vista.mostrar_error(f"❌ Error al eliminar:\n{e}")
+
+    def abrir_historial(self):
+        if self._ocupado():
+            return
+        try:
+            if not self.repo.archivo.particiones():
+                self.vista.mostrar_info("ℹ️ Historial vacío", "Todavía no hay tareas archivadas.")
+                return
+            self.vista.mostrar_historial(self.repo.historial, self.reabrir_archivadas)
+        except Exception as e:
+            self.vista.mostrar_error(f"❌ Error al leer el historial:\n{e}")
+
+    def reabrir_archivadas(self, tareas: List[Tarea]):
+        try:
+            reabiertas = self.repo.reabrir_archivadas(tareas)
+            self._refrescar()
+            self.vista.mostrar_estado(f"{len(reabiertas)} tareas reabiertas.")
+        except Exception as e:
+            self.vista.mostrar_error(f"❌ Error al reabrir:\n{e}")
+
+    def _confirmar(self, mensaje: str) -> bool:
+        with self.instrumentacion.fase("confirmación"):  # Espera del usuario, no trabajo
+            return self.vista.root.tk.call("tk", "messageBox",
+                                           "-type", "yesno",
+                                           "-icon", "warning",
+                                           "-message", mensaje,
+                                           "-title", "🗑️ Confirmar eliminación") == "yes"
+
+    def _al_cerrar(self):
+        if self._exportacion is not None:
+            self._exportacion.set()
+        if self._cargando:
+            self._lotes.close()
+        self.repo.cerrar()
+        if self.instrumentacion.activa:
+            try:
+                print(f"[ℹ️] Latencias guardadas en {self.instrumentacion.volcar()}")
+            except OSError as e:
+                print(f"[⚠️] No se pudieron guardar las latencias: {e}")
+        self.root.destroy()
+
     def ejecutar(self):
         self.root.mainloop()
 
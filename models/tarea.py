@@ -1,4 +1,7 @@
-from datetime import datetime
+import os
+import re
+from functools import lru_cache
+from typing import Tuple
 
 class Tarea:
     """
@@ -6,12 +9,53 @@ class Tarea:
     ✅ Encapsulación
     ✅ Validación de datos en el constructor
     ✅ Métodos de serialización
+    ✅ Identificador único y persistente (independiente de la posición)
+    ✅ __slots__ (sin __dict__ por instancia) y fecha cacheada como ordinal
+    ✅ Fecha de finalización (para archivar las completadas antiguas)
     """
-    def __init__(self, titulo: str, descripcion: str = "", fecha_limite: str = "", completada: bool = False):
+    __slots__ = ("id", "titulo", "descripcion", "_fecha_limite", "_ordinal", "completada",
+                 "fecha_completada")
+
+    def __init__(self, titulo: str, descripcion: str = "", fecha_limite: str = "", completada: bool = False,
+                 id: str = "", fecha_completada: str = ""):
+        self.id = id or self.nuevo_id()
         self.titulo = self._validar_titulo(titulo)
         self.descripcion = descripcion.strip()
-        self.fecha_limite = self._validar_fecha(fecha_limite)
+        self.fecha_limite = fecha_limite
         self.completada = bool(completada)
+        self.fecha_completada = self._validar_fecha(fecha_completada)[0] if self.completada else ""
+
+    @classmethod
+    def _crear(cls, id: str, titulo: str, descripcion: str, fecha_limite: str, ordinal: int,
+               completada: bool, fecha_completada: str = ""):
+        """Construye una Tarea con datos ya validados (carga masiva), sin revalidar."""
+        tarea = cls.__new__(cls)
+        tarea.id = id
+        tarea.titulo = titulo
+        tarea.descripcion = descripcion
+        tarea._fecha_limite = fecha_limite
+        tarea._ordinal = ordinal
+        tarea.completada = completada
+        tarea.fecha_completada = fecha_completada
+        return tarea
+
+    @property
+    def fecha_limite(self) -> str:
+        return self._fecha_limite
+
+    @fecha_limite.setter
+    def fecha_limite(self, valor: str):
+        self._fecha_limite, self._ordinal = self._validar_fecha(valor)
+
+    @property
+    def ordinal(self) -> int:
+        """Fecha límite como ordinal de calendario (0 si no tiene fecha)."""
+        return self._ordinal
+
+    @staticmethod
+    def nuevo_id() -> str:
+        # 128 bits aleatorios en hexadecimal (mismo formato que uuid4().hex, sin importar uuid)
+        return os.urandom(16).hex()
 
     @staticmethod
     def _validar_titulo(titulo: str) -> str:
@@ -23,25 +67,23 @@ class Tarea:
         return titulo
 
     @staticmethod
-    def _validar_fecha(fecha_str: str) -> str:
+    def _validar_fecha(fecha_str: str) -> Tuple[str, int]:
         if not fecha_str:
-            return ""
-        fecha_str = fecha_str.strip()
-        try:
-            # Normaliza a YYYY-MM-DD
-            dt = datetime.strptime(fecha_str, "%Y-%m-%d")
-            return dt.strftime("%Y-%m-%d")
-        except ValueError:
-            raise ValueError("Formato de fecha inválido. Use AAAA-MM-DD.")
+            return "", 0
+        return _normalizar_fecha(fecha_str.strip())
 
     def to_dict(self) -> dict:
         """Serializa la tarea a diccionario (para JSON)."""
-        return {
+        datos = {
+            "id": self.id,
             "titulo": self.titulo,
             "descripcion": self.descripcion,
             "fecha_limite": self.fecha_limite,
             "completada": self.completada
         }
+        if self.fecha_completada:  # Solo en las completadas: el archivo caliente no crece
+            datos["fecha_completada"] = self.fecha_completada
+        return datos
 
     @classmethod
     def from_dict(cls, data: dict):
@@ -51,10 +93,30 @@ class Tarea:
                 titulo=data["titulo"],
                 descripcion=data.get("descripcion", ""),
                 fecha_limite=data.get("fecha_limite", ""),
-                completada=data.get("completada", False)
+                completada=data.get("completada", False),
+                id=data.get("id", ""),
+                fecha_completada=data.get("fecha_completada", "")
             )
         except (KeyError, ValueError) as e:
             raise ValueError(f"Datos inválidos para crear Tarea: {e}")
 
     def __repr__(self):
-        return f"<Tarea '{self.titulo}' | {self.fecha_limite} | {'✅' if self.completada else '⏳'}>"
\ No newline at end of file
+        return f"<Tarea '{self.titulo}' | {self.fecha_limite} | {'✅' if self.completada else '⏳'}>"
+
+
+_FECHA_ISO = re.compile(r"(\d{4})-(\d{2})-(\d{2})\Z")
+
+
+@lru_cache(maxsize=8192)
+def _normalizar_fecha(fecha_str: str) -> Tuple[str, int]:
+    """Normaliza a AAAA-MM-DD y calcula el ordinal; cacheado (las fechas se repiten mucho)."""
+    from datetime import date, datetime  # Import diferido: la CLI no lo paga si no hay fechas
+    try:
+        m = _FECHA_ISO.match(fecha_str)
+        if m:
+            # Camino rápido: ya viene normalizada, solo falta comprobar que exista
+            return fecha_str, date(int(m[1]), int(m[2]), int(m[3])).toordinal()
+        dt = datetime.strptime(fecha_str, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError("Formato de fecha inválido. Use AAAA-MM-DD.")
+    return dt.strftime("%Y-%m-%d"), dt.toordinal()
@@ -0,0 +1,67 @@
+from array import array
+from typing import Iterable, Iterator, List, Tuple
+from models.tarea import Tarea, _normalizar_fecha
+
+
+class TareasColumnar:
+    """
+    Contenedor masivo de tareas en columnas (una lista/array por campo), usado
+    para cargar: el repositorio valida cada bloque de tareas.json aquí y luego
+    materializa las Tareas. Ordenar y filtrar van por el índice de fechas del
+    repositorio (data.indice_fechas), que se mantiene entre operaciones.
+    ✅ Fechas como array de enteros (ordinales) y estado como bytearray
+    ✅ Carga masiva con validación barata (fechas cacheadas)
+    """
+    def __init__(self):
+        self.ids: List[str] = []
+        self.titulos: List[str] = []
+        self.descripciones: List[str] = []
+        self.fechas: List[str] = []
+        self.ordinales = array("l")
+        self.completadas = bytearray()
+        self.fechas_completada: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def desde_dicts(cls, datos: Iterable[dict],
+                    desplazamiento: int = 0) -> Tuple["TareasColumnar", List[Tuple[int, str]]]:
+        """
+        Valida y carga diccionarios (formato de tareas.json) en bloque.
+        Devuelve (columnas, [(posición, motivo)] de las entradas rechazadas);
+        desplazamiento es la posición del primer elemento dentro del archivo.
+        """
+        columnas = cls()
+        rechazadas = []
+        for posicion, item in enumerate(datos, desplazamiento):
+            try:
+                titulo = Tarea._validar_titulo(item["titulo"])
+                fecha = item.get("fecha_limite", "")
+                fecha, ordinal = _normalizar_fecha(fecha.strip()) if fecha else ("", 0)
+                descripcion = item.get("descripcion", "").strip()
+                completada = bool(item.get("completada", False))
+                fecha_completada = item.get("fecha_completada", "") if completada else ""
+                if fecha_completada:
+                    fecha_completada = _normalizar_fecha(fecha_completada.strip())[0]
+            except (KeyError, ValueError, AttributeError, TypeError) as e:
+                rechazadas.append((posicion, f"Datos inválidos para crear Tarea: {e}"))
+                continue
+            columnas.ids.append(item.get("id", ""))
+            columnas.titulos.append(titulo)
+            columnas.descripciones.append(descripcion)
+            columnas.fechas.append(fecha)
+            columnas.ordinales.append(ordinal)
+            columnas.completadas.append(completada)
+            columnas.fechas_completada.append(fecha_completada)
+        return columnas, rechazadas
+
+    def tarea(self, i: int) -> Tarea:
+        """Materializa la fila i como Tarea (sin revalidar)."""
+        return Tarea._crear(self.ids[i] or Tarea.nuevo_id(), self.titulos[i], self.descripciones[i],
+                            self.fechas[i], self.ordinales[i], bool(self.completadas[i]),
+                            self.fechas_completada[i])
+
+    def tareas(self, indices: Iterable[int] = None) -> Iterator[Tarea]:
+        for i in (range(len(self)) if indices is None else indices):
+            yield self.tarea(i)
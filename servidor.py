@@ -0,0 +1,364 @@
+# servidor.py
+"""
+API HTTP local (JSON) sobre el repositorio de tareas, solo con la biblioteca
+estándar (asyncio). Pensada para que otras herramientas de la máquina lean y
+modifiquen tareas sin pasar por la interfaz Tk.
+
+Rutas:
+    GET    /tareas?vista=&q=&orden=&desde=&limite=   listar / filtrar / paginar
+           ("siguiente" es el desde de la página siguiente, o null)
+           vista: todas | pendientes | proximas | semana | vencidas
+           orden: asc | desc (por fecha; sin orden, el almacenado)
+    GET    /tareas/<id>                               una tarea
+    POST   /tareas                                    añadir {"titulo", "descripcion", "fecha_limite"}
+    POST   /tareas/<id>/alternar                      marcar/desmarcar
+    DELETE /tareas/<id>                               eliminar
+    GET    /pendientes.pdf                            exportar pendientes a PDF
+
+Las lecturas se atienden en el bucle de eventos; todas las mutaciones pasan por
+una única tarea escritora (cola), así que nunca se intercalan. Cada respuesta de
+lectura lleva un ETag con la versión de los datos: un cliente que sondea con
+If-None-Match recibe 304 sin cuerpo mientras nada cambie.
+
+Ejemplos:
+    python servidor.py --puerto 8765
+    curl -s "http://127.0.0.1:8765/tareas?vista=pendientes&limite=20"
+    curl -s -X POST -d '{"titulo": "Repasar grafos"}' http://127.0.0.1:8765/tareas
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import sys
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Tareas máximas por página y tamaño máximo del cuerpo de una petición
+LIMITE_PAGINA = 500
+MAX_CUERPO = 1 << 20
+# Cada cuánto se comprueba si otro proceso modificó el almacén
+INTERVALO_SONDEO = 1.0
+
+_RAZONES = {200: "OK", 201: "Created", 204: "No Content", 304: "Not Modified",
+            400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+class Respuesta:
+    def __init__(self, estado: int = 200, cuerpo: bytes = b"", tipo: str = "application/json; charset=utf-8",
+                 etag: Optional[str] = None):
+        self.estado = estado
+        self.cuerpo = cuerpo
+        self.tipo = tipo
+        self.etag = etag
+
+    @classmethod
+    def json(cls, datos, estado: int = 200, etag: Optional[str] = None) -> "Respuesta":
+        return cls(estado, json.dumps(datos, ensure_ascii=False).encode("utf-8"), etag=etag)
+
+
+class ServidorTareas:
+    """
+    Servidor HTTP/1.1 mínimo (con keep-alive) sobre un repositorio de tareas.
+    ✅ Una sola tarea escritora: las mutaciones se serializan por una cola
+    ✅ ETag = versión de los datos; If-None-Match -> 304 sin serializar nada
+    ✅ Los cambios de otros procesos se incorporan en segundo plano (sincronizar)
+    ✅ El PDF se renderiza (o se copia de la caché) en un hilo para no bloquear el bucle
+    """
+    def __init__(self, repo):
+        self.repo = repo
+        self.version = 0  # Sube con cada mutación (propia o de otro proceso)
+        # Prefijo por instancia: tras reiniciar, un ETag viejo no puede coincidir por casualidad
+        self._instancia = os.urandom(4).hex()
+        self._cola: Optional[asyncio.Queue] = None
+        from utils.cache_pdf import crear_cache_pdf
+        self._cache_pdf = crear_cache_pdf()  # Misma lista pedida otra vez: PDF sin re-renderizar
+
+    # --- Ciclo de vida ---
+    async def iniciar(self, host: str = "127.0.0.1", puerto: int = 8765) -> asyncio.AbstractServer:
+        self._cola = asyncio.Queue()
+        self._tareas_fondo = [asyncio.create_task(self._escritor()),
+                              asyncio.create_task(self._vigilar_cambios())]
+        return await asyncio.start_server(self._atender_conexion, host, puerto)
+
+    async def detener(self):
+        for tarea in self._tareas_fondo:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas_fondo, return_exceptions=True)
+
+    # --- Escritor único ---
+    async def _escritor(self):
+        while True:
+            mutacion, futuro = await self._cola.get()
+            try:
+                resultado = mutacion()
+                if resultado is not False:  # sincronizar() sin nada que absorber: mismos datos
+                    self.version += 1
+                futuro.set_result(resultado)
+            except Exception as e:
+                futuro.set_exception(e)
+
+    def _mutar(self, mutacion: Callable[[], object]) -> Awaitable:
+        futuro = asyncio.get_running_loop().create_future()
+        self._cola.put_nowait((mutacion, futuro))
+        return futuro
+
+    async def _vigilar_cambios(self):
+        while True:
+            await asyncio.sleep(INTERVALO_SONDEO)
+            if self.repo.cambios_externos():  # Un stat: no relee el archivo
+                await self._mutar(self.repo.sincronizar)
+
+    # --- HTTP ---
+    async def _atender_conexion(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                peticion = await _leer_peticion(reader)
+                if peticion is None:
+                    break
+                metodo, ruta, cabeceras, cuerpo = peticion
+                try:
+                    respuesta = await self._despachar(metodo, ruta, cabeceras, cuerpo)
+                except ErrorHTTP as e:
+                    respuesta = Respuesta.json({"error": str(e)}, e.estado)
+                except Exception as e:
+                    print(f"[❌] Error al atender {metodo} {ruta}: {e}")
+                    respuesta = Respuesta.json({"error": "Error interno."}, 500)
+                cerrar = cabeceras.get("connection", "").lower() == "close"
+                writer.write(_serializar(respuesta, cerrar))
+                await writer.drain()
+                if cerrar:
+                    break
+        except ErrorHTTP as e:  # Petición mal formada: responder y cortar
+            writer.write(_serializar(Respuesta.json({"error": str(e)}, e.estado), True))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _despachar(self, metodo: str, ruta: str, cabeceras: Dict[str, str],
+                         cuerpo: bytes) -> Respuesta:
+        url = urlsplit(ruta)
+        partes = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        consulta = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if metodo == "GET":
+            etag = f'"{self._instancia}-{self.version}"'
+            if etag in cabeceras.get("if-none-match", ""):
+                return Respuesta(304, etag=etag)
+            if partes == ["tareas"]:
+                return Respuesta.json(self._listar(consulta), etag=etag)
+            if len(partes) == 2 and partes[0] == "tareas":
+                return Respuesta.json(self._obtener(partes[1]).to_dict(), etag=etag)
+            if partes == ["pendientes.pdf"]:
+                return Respuesta(200, await self._exportar_pdf(), "application/pdf", etag)
+        elif metodo == "POST":
+            if partes == ["tareas"]:
+                tarea = await self._mutar(lambda: self._agregar(_json(cuerpo)))
+                return Respuesta.json(tarea.to_dict(), 201)
+            if len(partes) == 3 and partes[0] == "tareas" and partes[2] == "alternar":
+                tarea = await self._mutar(lambda: self._alternar(partes[1]))
+                return Respuesta.json(tarea.to_dict())
+        elif metodo == "DELETE":
+            if len(partes) == 2 and partes[0] == "tareas":
+                await self._mutar(lambda: self._eliminar(partes[1]))
+                return Respuesta(204)
+        else:
+            raise ErrorHTTP(405, f"Método no soportado: {metodo}")
+        raise ErrorHTTP(404, f"Ruta desconocida: {metodo} {url.path}")
+
+    # --- Lecturas ---
+    def _listar(self, consulta: Dict[str, str]) -> dict:
+        repo = self.repo
+        vista = consulta.get("vista", "todas")
+        orden = consulta.get("orden")
+        if orden not in (None, "asc", "desc"):
+            raise ErrorHTTP(400, "orden debe ser 'asc' o 'desc'.")
+        ascendente = orden != "desc"
+        texto = consulta.get("q", "").strip()
+        desde = _entero(consulta, "desde", 0)
+        limite = min(_entero(consulta, "limite", LIMITE_PAGINA), LIMITE_PAGINA)
+        if not texto and (vista == "pendientes" or (vista == "todas" and orden is not None)):
+            # Paginado por el índice de fechas: solo se materializa la página (+1 para saber si hay más)
+            tareas = repo.ordenadas_por_fecha(ascendente, limite + 1, desde,
+                                              solo_pendientes=vista == "pendientes")
+            desde_lista = 0
+        else:
+            if vista == "todas":
+                tareas = repo.en_orden() if orden is None else repo.ordenadas_por_fecha(ascendente)
+            elif vista == "pendientes":
+                tareas = repo.pendientes(ascendente)
+            elif vista == "proximas":
+                tareas = repo.proximas(len(repo) if texto else desde + limite + 1)
+            elif vista == "semana":
+                tareas = repo.esta_semana()
+            elif vista == "vencidas":
+                tareas = repo.vencidas()
+            else:
+                raise ErrorHTTP(400, f"Vista desconocida: {vista}")
+            if texto:
+                coinciden = {t.id for t in repo.buscar(texto)}
+                tareas = [t for t in tareas if t.id in coinciden]
+            desde_lista = desde
+        pagina = tareas[desde_lista:desde_lista + limite]
+        hay_mas = len(tareas) > desde_lista + limite
+        return {"desde": desde, "siguiente": desde + limite if hay_mas else None,
+                "tareas": [t.to_dict() for t in pagina]}
+
+    def _obtener(self, id_tarea: str):
+        try:
+            return self.repo.obtener(id_tarea)
+        except KeyError:
+            raise ErrorHTTP(404, f"No existe la tarea {id_tarea}.")
+
+    async def _exportar_pdf(self) -> bytes:
+        from utils.pdf_exporter import PDFExporter, REPORTLAB_AVAILABLE
+        if not REPORTLAB_AVAILABLE:
+            raise ErrorHTTP(503, "reportlab no está instalado en el servidor.")
+        # Copias tomadas aquí: la tarea escritora puede mutar las originales durante el render
+        pendientes = [copy.copy(t) for t in self.repo.pendientes(ascendente=True)]
+        if not pendientes:
+            raise ErrorHTTP(404, "No hay tareas pendientes para exportar.")
+        return await asyncio.get_running_loop().run_in_executor(None, _renderizar_pdf, pendientes,
+                                                                  self._cache_pdf)
+
+    # --- Mutaciones (solo desde la tarea escritora) ---
+    def _agregar(self, datos: dict):
+        from models.tarea import Tarea
+        if not isinstance(datos, dict) or "titulo" not in datos:
+            raise ErrorHTTP(400, "Se esperaba un objeto JSON con 'titulo'.")
+        try:
+            tarea = Tarea(titulo=str(datos["titulo"]), descripcion=str(datos.get("descripcion", "")),
+                          fecha_limite=str(datos.get("fecha_limite", "")))
+        except ValueError as e:
+            raise ErrorHTTP(400, str(e))
+        self.repo.agregar(tarea)
+        return tarea
+
+    def _alternar(self, id_tarea: str):
+        tarea = self._obtener(id_tarea)
+        self.repo.marcar(id_tarea, not tarea.completada)
+        return self.repo.obtener(id_tarea)
+
+    def _eliminar(self, id_tarea: str):
+        self._obtener(id_tarea)
+        return self.repo.eliminar(id_tarea)
+
+
+async def _leer_peticion(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """(método, ruta, cabeceras en minúsculas, cuerpo) o None si el cliente cerró."""
+    try:
+        cabecera = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise ErrorHTTP(400, "Petición incompleta.")
+        return None
+    except asyncio.LimitOverrunError:
+        raise ErrorHTTP(413, "Cabeceras demasiado grandes.")
+    lineas = cabecera.decode("latin-1").split("\r\n")
+    try:
+        metodo, ruta, _ = lineas[0].split(" ", 2)
+    except ValueError:
+        raise ErrorHTTP(400, "Línea de petición inválida.")
+    cabeceras = {}
+    for linea in lineas[1:]:
+        if ":" in linea:
+            nombre, valor = linea.split(":", 1)
+            cabeceras[nombre.strip().lower()] = valor.strip()
+    longitud = _entero(cabeceras, "content-length", 0)
+    if longitud > MAX_CUERPO:
+        raise ErrorHTTP(413, "Cuerpo demasiado grande.")
+    cuerpo = await reader.readexactly(longitud) if longitud else b""
+    return metodo.upper(), ruta, cabeceras, cuerpo
+
+
+def _serializar(respuesta: Respuesta, cerrar: bool) -> bytes:
+    cabeceras = [f"HTTP/1.1 {respuesta.estado} {_RAZONES.get(respuesta.estado, '')}"]
+    if respuesta.estado not in (204, 304):
+        cabeceras += [f"Content-Type: {respuesta.tipo}", f"Content-Length: {len(respuesta.cuerpo)}"]
+    if respuesta.etag:
+        cabeceras += [f"ETag: {respuesta.etag}", "Cache-Control: no-cache"]
+    if cerrar:
+        cabeceras.append("Connection: close")
+    cuerpo = b"" if respuesta.estado in (204, 304) else respuesta.cuerpo
+    return ("\r\n".join(cabeceras) + "\r\n\r\n").encode("latin-1") + cuerpo
+
+
+def _json(cuerpo: bytes):
+    try:
+        return json.loads(cuerpo or b"{}")
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ErrorHTTP(400, f"JSON inválido: {e}")
+
+
+def _entero(valores: Dict[str, str], clave: str, defecto: int) -> int:
+    try:
+        valor = int(valores.get(clave, defecto))
+    except ValueError:
+        raise ErrorHTTP(400, f"'{clave}' debe ser un entero.")
+    if valor < 0:
+        raise ErrorHTTP(400, f"'{clave}' no puede ser negativo.")
+    return valor
+
+
+def _renderizar_pdf(tareas: list, cache) -> bytes:
+    """Hilo del ejecutor: render (o copia desde la caché) a un temporal y lectura de los bytes."""
+    import tempfile
+    from utils.pdf_exporter import PDFExporter
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "pendientes.pdf")
+        if cache is None:
+            PDFExporter.exportar_streaming(tareas, ruta)
+        else:
+            cache.exportar(tareas, ruta, lambda destino: PDFExporter.exportar_streaming(tareas, destino),
+                           formato="streaming")
+        with open(ruta, "rb") as f:
+            return f.read()
+
+
+async def _servir(args):
+    from data.fabrica import crear_repositorio
+    # Asíncrono: las ráfagas de peticiones se agrupan en una única escritura
+    repo = crear_repositorio(args.archivo, diario=args.diario, asincrono=True)
+    servidor = ServidorTareas(repo)
+    http = await servidor.iniciar(args.host, args.puerto)
+    print(f"[ℹ️] Sirviendo {len(repo)} tareas de {args.archivo} en http://{args.host}:{args.puerto}/tareas")
+    try:
+        async with http:
+            await http.serve_forever()
+    finally:
+        await servidor.detener()
+        repo.cerrar()
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="servidor.py", description="API HTTP local de la lista de deberes.")
+    parser.add_argument("--archivo", default=os.environ.get("TAREAS_ARCHIVO", "tareas.json"),
+                        help="tareas.json (por defecto), binario .bin o una base .db/.sqlite")
+    parser.add_argument("--diario", action="store_true", help="usar el backend con diario append-only")
+    parser.add_argument("--host", default="127.0.0.1", help="interfaz (por defecto solo local)")
+    parser.add_argument("--puerto", type=int, default=8765)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = crear_parser().parse_args(argv)
+    try:
+        asyncio.run(_servir(args))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
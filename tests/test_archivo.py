@@ -0,0 +1,68 @@
+# tests/test_archivo.py
+"""Historial del archivo paginado por cursor, también cuando se reabren tareas entre páginas."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import unittest
+
+from data.tarea_repository import TareaRepository
+from models.tarea import Tarea
+
+
+def _paginas(repo, tamano: int, entre_paginas=None) -> list:
+    """Recorre el historial como la ventana de la GUI: página a página tras la última leída."""
+    leidas, ultima = [], None
+    while True:
+        pagina = repo.historial(tamano, despues_de=ultima)
+        leidas += pagina
+        if len(pagina) < tamano:
+            return leidas
+        ultima = pagina[-1]
+        if entre_paginas:
+            entre_paginas(pagina)
+
+
+class TestHistorial(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.repo = TareaRepository(os.path.join(self.carpeta, "tareas.json"))
+        # Tres meses, con empates de fecha dentro de cada uno
+        self.repo.agregar_varias([Tarea(f"t{i}", id=f"t{i}", completada=True,
+                                        fecha_completada=f"2024-0{1 + i % 3}-{1 + i % 4:02d}")
+                                  for i in range(30)])
+        self.assertEqual(self.repo.archivar_completadas(dias=0), 30)
+
+    def tearDown(self):
+        self.repo.cerrar()
+        shutil.rmtree(self.carpeta)
+
+    def test_paginas_igual_que_el_historial_entero(self):
+        completo = self.repo.historial()
+        self.assertEqual(len(completo), 30)
+        claves = [t.fecha_completada for t in completo]
+        self.assertEqual(claves, sorted(claves, reverse=True))
+        for tamano in (1, 4, 7, 30, 31):
+            self.assertEqual([t.id for t in _paginas(self.repo, tamano)], [t.id for t in completo])
+
+    def test_reabrir_entre_paginas_no_salta_ni_repite(self):
+        completo = [t.id for t in self.repo.historial()]
+        # Una ya está en la lista de trabajo: reabrirla no la quita del archivo
+        self.repo.agregar(Tarea("en la lista", id=completo[1]))
+        reabiertas = []
+
+        def reabrir(pagina):
+            seleccion = pagina[:2]
+            reabiertas.extend(t.id for t in seleccion)
+            self.repo.reabrir_archivadas(seleccion)
+
+        leidas = [t.id for t in _paginas(self.repo, 5, reabrir)]
+        self.assertEqual(leidas, completo)
+        self.assertEqual([t.id for t in self.repo.historial()],
+                         [i for i in completo if i not in reabiertas or i == completo[1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# tests/test_binario.py
+"""Formato .bin: ida y vuelta, decodificación perezosa, conversión y archivos dañados."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import shutil
+import struct
+import tempfile
+import unittest
+
+from data.almacenamiento import AlmacenamientoBinario
+from data.binario import LectorBinario, convertir, escribir_binario
+from data.tarea_repository import TareaRepository
+from models.tarea import Tarea
+
+
+def _muestra() -> list:
+    return [Tarea("Ñandú 🐦", descripcion="con\nsalto", fecha_limite="2030-05-01", id="a"),
+            Tarea("sin fecha", id="b"),
+            Tarea("hecha", fecha_limite="2020-01-01", completada=True, id="c",
+                  fecha_completada="2020-01-02"),
+            Tarea("id no ascii", id="ídem")]
+
+
+class TestBinario(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.carpeta, "tareas.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.carpeta)
+
+    def _abrir(self) -> TareaRepository:
+        return TareaRepository(self.ruta, almacenamiento=AlmacenamientoBinario(self.ruta, migrar_desde=None))
+
+    def test_ida_y_vuelta(self):
+        tareas = _muestra()
+        escribir_binario(self.ruta, tareas)
+        lector = LectorBinario(self.ruta)
+        try:
+            self.assertEqual(len(lector), len(tareas))
+            self.assertEqual(lector.ids(), [t.id for t in tareas])
+            self.assertEqual(list(lector.registros()), [t.to_dict() for t in tareas])
+            self.assertEqual([t.ordinal for t in lector.tareas()], [t.ordinal for t in tareas])
+            self.assertEqual([lector.completada(i) for i in range(len(tareas))], [False, False, True, False])
+        finally:
+            lector.cerrar()
+
+    def test_vacio(self):
+        escribir_binario(self.ruta, [])
+        repo = self._abrir()
+        self.assertEqual(len(repo), 0)
+        repo.cerrar()
+
+    def test_decodificacion_perezosa(self):
+        escribir_binario(self.ruta, [Tarea(f"t{i}", completada=i % 10 == 0, id=f"t{i}",
+                                           fecha_completada="2099-01-01" if i % 10 == 0 else "")
+                                     for i in range(100)])
+        repo = self._abrir()
+        decodificadas = lambda: sum(type(v) is not int for v in dict.values(repo._tareas))
+        self.assertEqual(decodificadas(), 0)
+        self.assertEqual(repo.obtener("t42").titulo, "t42")
+        ventana = repo.en_orden()
+        self.assertEqual(len(ventana), 100)
+        self.assertEqual([t.id for t in ventana[10:13]], ["t10", "t11", "t12"])
+        self.assertEqual(decodificadas(), 4)
+        # Archivar solo decodifica las completadas
+        self.assertEqual(repo.archivar_completadas(dias=0), 0)  # Completadas "en el futuro": ninguna sale
+        self.assertEqual(decodificadas(), 4 + 9)  # t0..t90 (t10 ya lo estaba)
+        # Guardar copia en crudo los registros no decodificados
+        repo.marcar("t1")
+        repo.cerrar()
+        reabierto = self._abrir()
+        self.assertTrue(reabierto.obtener("t1").completada)
+        self.assertEqual([t.id for t in reabierto.tareas], [f"t{i}" for i in range(100)])
+        reabierto.cerrar()
+
+    def test_convertir_json_bin_json(self):
+        origen = os.path.join(self.carpeta, "origen.json")
+        destino = os.path.join(self.carpeta, "destino.json")
+        datos = [t.to_dict() for t in _muestra()]
+        with open(origen, "w", encoding="utf-8") as f:
+            json.dump(datos, f)
+        self.assertEqual(convertir(origen, self.ruta), len(datos))
+        self.assertEqual(convertir(self.ruta, destino), len(datos))
+        with open(destino, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), datos)
+
+    def test_convertir_rechaza_tareas_invalidas(self):
+        origen = os.path.join(self.carpeta, "origen.json")
+        with open(origen, "w", encoding="utf-8") as f:
+            json.dump([{"titulo": "ok"}, {"fecha_limite": "sin título"}], f)
+        with self.assertRaises(ValueError):
+            convertir(origen, self.ruta)
+        self.assertFalse(os.path.exists(self.ruta))
+
+    def test_cabecera_danada(self):
+        escribir_binario(self.ruta, _muestra())
+        with open(self.ruta, "rb") as f:
+            original = f.read()
+        casos = {
+            "corto": original[:10],
+            "magia": b"XXXXXXXX" + original[8:],
+            "versión": original[:8] + struct.pack("<H", 99) + original[10:],
+            "truncado": original[:len(original) - 8],
+        }
+        for nombre, contenido in casos.items():
+            with self.subTest(nombre):
+                with open(self.ruta, "wb") as f:
+                    f.write(contenido)
+                with self.assertRaises(ValueError):
+                    LectorBinario(self.ruta).cerrar()
+                repo = self._abrir()
+                self.assertTrue(repo.informe_carga.error)
+                self.assertEqual(len(repo), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
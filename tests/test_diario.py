@@ -0,0 +1,123 @@
+# tests/test_diario.py
+"""AlmacenamientoDiario: reproducción del diario, compactación y cortes a mitad de línea."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import glob
+import json
+import shutil
+import tempfile
+import unittest
+
+from data.almacenamiento import AlmacenamientoDiario
+from data.tarea_repository import TareaRepository
+from models.tarea import Tarea
+
+
+def _estado(repo) -> list:
+    return [t.to_dict() for t in repo.tareas]
+
+
+def _abandonar(repo):
+    """Como un proceso que termina sin cerrar: el diario queda sin compactar."""
+    diario = repo.almacenamiento._diario
+    if diario is not None:
+        diario.close()
+
+
+class TestDiario(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.carpeta, "tareas.json")
+        repo = self._abrir()
+        repo.agregar_varias([Tarea("x", fecha_limite="2030-01-03", id="x"),
+                             Tarea("y", fecha_limite="2030-01-01", id="y"),
+                             Tarea("z", id="z")])
+        repo.cerrar()  # Snapshot compactado, sin diario
+
+    def tearDown(self):
+        shutil.rmtree(self.carpeta)
+
+    def _abrir(self, umbral: int = 1000) -> TareaRepository:
+        return TareaRepository(self.ruta, almacenamiento=AlmacenamientoDiario(self.ruta, umbral))
+
+    def _diarios(self) -> list:
+        return sorted(glob.glob(glob.escape(self.ruta) + ".*.log"))
+
+    def test_reproduce_cada_operacion(self):
+        repo = self._abrir()
+        repo.agregar(Tarea("nueva", descripcion="d", fecha_limite="2030-01-02", id="n"))
+        repo.actualizar("x", Tarea("x editada", fecha_limite="2030-02-01"))
+        repo.marcar("y")
+        repo.eliminar("z")
+        repo.ordenar_por_fecha(ascendente=False)
+        with repo.lote():
+            repo.marcar("n")
+            repo.agregar(Tarea("en lote", id="l"))
+        esperado = _estado(repo)
+        _abandonar(repo)
+        self.assertEqual(len(self._diarios()), 1)
+
+        reabierto = self._abrir()
+        self.assertEqual(_estado(reabierto), esperado)
+        self.assertEqual([t.id for t in reabierto.tareas], ["x", "n", "y", "l"])
+        reabierto.cerrar()
+
+    def test_reabrir_tras_compactar(self):
+        repo = self._abrir(umbral=4)
+        for i in range(10):
+            repo.agregar(Tarea(f"t{i}", id=f"t{i}"))
+            repo.marcar(f"t{i}")
+        repo.almacenamiento._esperar_compactacion()
+        esperado = _estado(repo)
+        _abandonar(repo)
+        with open(self.ruta, encoding="utf-8") as f:
+            generacion = json.load(f)["generacion"]
+        self.assertGreater(generacion, 0)
+        # Los diarios ya incluidos en el snapshot se borraron
+        self.assertTrue(all(int(r.rsplit(".", 2)[1]) >= generacion for r in self._diarios()))
+
+        reabierto = self._abrir(umbral=4)
+        self.assertEqual(_estado(reabierto), esperado)
+        reabierto.cerrar()
+        self.assertEqual(self._diarios(), [])
+        self.assertEqual(_estado(self._abrir()), esperado)
+
+    def test_ultima_linea_truncada(self):
+        repo = self._abrir()
+        repo.marcar("x")
+        repo.eliminar("y")
+        esperado = _estado(repo)
+        _abandonar(repo)
+        # Corte a mitad de escribir la siguiente operación
+        with open(self._diarios()[-1], "a", encoding="utf-8") as f:
+            f.write('{"op": "agregar", "tarea": {"titulo": "a me')
+
+        reabierto = self._abrir()
+        self.assertEqual(_estado(reabierto), esperado)
+        # Lo registrado después del corte también sobrevive
+        reabierto.agregar(Tarea("después", id="d"))
+        esperado = _estado(reabierto)
+        _abandonar(reabierto)
+        self.assertEqual(_estado(self._abrir()), esperado)
+
+    def test_ultima_operacion_sin_salto_de_linea(self):
+        repo = self._abrir()
+        repo.marcar("x")
+        _abandonar(repo)
+        ruta = self._diarios()[-1]
+        with open(ruta, "rb+") as f:
+            f.truncate(os.path.getsize(ruta) - 1)  # La operación llegó entera, el salto no
+
+        reabierto = self._abrir()
+        self.assertTrue(reabierto.obtener("x").completada)
+        reabierto.marcar("y")
+        _abandonar(reabierto)
+        reabierto = self._abrir()
+        self.assertEqual([t.completada for t in reabierto.tareas], [True, True, False])
+        reabierto.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
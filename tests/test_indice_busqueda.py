@@ -0,0 +1,95 @@
+# tests/test_indice_busqueda.py
+"""IndiceInvertido frente a un recorrido lineal, tras secuencias aleatorias de altas, bajas y cambios."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import shutil
+import tempfile
+import unittest
+
+from data.indice_busqueda import IndiceInvertido, tokenizar
+from data.tarea_repository import TareaRepository
+from models.tarea import Tarea
+
+PALABRAS = ["árbol", "Arbol", "binario", "Binarios", "cola", "colas", "pila", "Ñu", "nube",
+            "grafo", "GRAFOS", "peña", "pena", "examen", "éxito"]
+CONSULTAS = ["arbol", "ARB", "bin", "cola", "col", "nu", "ñ", "pena", "grafo bin", "arbol cola p",
+             "éx", "examen", "zzz", ""]
+
+
+def _texto(rnd: random.Random) -> str:
+    return " ".join(rnd.choice(PALABRAS) for _ in range(rnd.randint(0, 4)))
+
+
+def _coincide(texto: str, consulta: str) -> bool:
+    """Definición de buscar(): todas las palabras, la última como prefijo."""
+    palabras = tokenizar(consulta)
+    tokens = set(tokenizar(texto))
+    return bool(palabras) and all(p in tokens for p in palabras[:-1]) and \
+        any(t.startswith(palabras[-1]) for t in tokens)
+
+
+class TestIndiceInvertido(unittest.TestCase):
+    def test_mutaciones_aleatorias(self):
+        rnd = random.Random(12)
+        indice, textos = IndiceInvertido(), {}
+        for paso in range(2000):
+            accion = rnd.random()
+            id_tarea = f"i{rnd.randrange(60)}"
+            if accion < 0.5:
+                textos[id_tarea] = _texto(rnd)  # Alta o cambio
+                indice.agregar(id_tarea, textos[id_tarea])
+            elif accion < 0.8:
+                textos.pop(id_tarea, None)
+                indice.eliminar(id_tarea)
+            else:
+                pares = [(f"i{rnd.randrange(60)}", _texto(rnd)) for _ in range(5)]
+                textos.update(pares)
+                indice.agregar_varios(pares)
+            if paso % 50 == 0:
+                self.assertEqual(len(indice), len(textos))
+                for consulta in CONSULTAS:
+                    esperado = {i for i, texto in textos.items() if _coincide(texto, consulta)}
+                    self.assertEqual(indice.buscar(consulta), esperado, consulta)
+        # El vocabulario no conserva palabras de tareas ya borradas
+        for id_tarea in list(textos):
+            indice.eliminar(id_tarea)
+        self.assertEqual(indice._vocabulario, [])
+
+
+class TestBuscarEnRepositorio(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.repo = TareaRepository(os.path.join(self.carpeta, "tareas.json"))
+
+    def tearDown(self):
+        self.repo.cerrar()
+        shutil.rmtree(self.carpeta)
+
+    def test_indice_mantenido_por_las_operaciones(self):
+        rnd = random.Random(7)
+        repo = self.repo
+        repo.agregar_varias([Tarea(_texto(rnd) or "vacía", _texto(rnd)) for _ in range(40)])
+        repo.buscar("arbol")  # A partir de aquí el índice existe y se mantiene
+        for paso in range(300):
+            ids = [t.id for t in repo.tareas]
+            accion = rnd.random()
+            if accion < 0.35 or not ids:
+                repo.agregar(Tarea(_texto(rnd) or "nueva", _texto(rnd)))
+            elif accion < 0.6:
+                repo.eliminar(rnd.choice(ids))
+            elif accion < 0.85:
+                repo.actualizar(rnd.choice(ids), Tarea(_texto(rnd) or "editada", _texto(rnd)))
+            else:
+                repo.eliminar_varias(rnd.sample(ids, min(3, len(ids))))
+            if paso % 25 == 0:
+                for consulta in CONSULTAS:
+                    esperado = [t.id for t in repo.tareas
+                                if _coincide(f"{t.titulo} {t.descripcion}", consulta)]
+                    self.assertEqual([t.id for t in repo.buscar(consulta)], esperado, consulta)
+
+
+if __name__ == "__main__":
+    unittest.main()
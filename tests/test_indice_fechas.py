@@ -0,0 +1,118 @@
+# tests/test_indice_fechas.py
+"""IndiceFechas y las vistas por fecha del repositorio frente a ordenar y filtrar la lista entera."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import itertools
+import random
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from data.indice_fechas import IndiceFechas, limites_semana
+from data.tarea_repository import TareaRepository
+from models.tarea import Tarea
+
+HOY = date(2030, 6, 12)  # Miércoles
+
+
+def _orden(entradas: dict, ascendente: bool) -> list:
+    """Criterio de ordenar_por_fecha: sin fecha (0) al final, empates por secuencia."""
+    fechadas = sorted((i for i, (o, _) in entradas.items() if o),
+                      key=lambda i: ((entradas[i][0] if ascendente else -entradas[i][0]), entradas[i][1]))
+    sin_fecha = sorted((i for i, (o, _) in entradas.items() if not o), key=lambda i: entradas[i][1])
+    return fechadas + sin_fecha
+
+
+def _fecha(rnd: random.Random) -> str:
+    return "" if rnd.random() < 0.2 else (HOY + timedelta(days=rnd.randint(-10, 20))).isoformat()
+
+
+class TestIndiceFechas(unittest.TestCase):
+    def test_mutaciones_aleatorias(self):
+        rnd = random.Random(3)
+        indice, entradas = IndiceFechas(), {}
+        base = HOY.toordinal()
+        secuencia = itertools.count()  # Como en el repositorio: única y creciente
+        for paso in range(3000):
+            id_tarea = f"i{rnd.randrange(80)}"
+            accion = rnd.random()
+            if accion < 0.55:
+                # Alta, cambio de fecha o de posición (empates frecuentes: pocas fechas)
+                entradas[id_tarea] = (rnd.choice([0, base, base + 1, base + rnd.randint(-5, 5)]),
+                                      rnd.choice([entradas.get(id_tarea, (0, next(secuencia)))[1],
+                                                  next(secuencia)]))
+                indice.agregar(id_tarea, *entradas[id_tarea])
+            elif accion < 0.85:
+                entradas.pop(id_tarea, None)
+                indice.eliminar(id_tarea)
+            else:
+                lote = [(f"i{rnd.randrange(80)}", base + rnd.randint(-3, 3), next(secuencia)) for _ in range(4)]
+                entradas.update((i, (o, s)) for i, o, s in lote)
+                indice.agregar_varios(lote)
+            if paso % 100 == 0:
+                self.assertEqual(len(indice), len(entradas))
+                self.assertEqual(list(indice.ids(True)), _orden(entradas, True))
+                self.assertEqual(list(indice.ids(False)), _orden(entradas, False))
+                for desde, hasta in ((base - 3, base + 3), (base, None), (1, base - 1)):
+                    esperado = [i for i in _orden(entradas, True)
+                                if entradas[i][0] and desde <= entradas[i][0] <= (hasta or float("inf"))]
+                    self.assertEqual(indice.rango(desde, hasta), esperado)
+                    self.assertEqual(indice.rango(desde, hasta, limite=2), esperado[:2])
+
+
+class TestVistasPorFecha(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.repo = TareaRepository(os.path.join(self.carpeta, "tareas.json"))
+
+    def tearDown(self):
+        self.repo.cerrar()
+        shutil.rmtree(self.carpeta)
+
+    def _comprobar(self):
+        repo = self.repo
+        todas = repo.tareas
+        posicion = {t.id: n for n, t in enumerate(todas)}
+        clave = lambda t, asc: (not t.ordinal, (t.ordinal if asc else -t.ordinal), posicion[t.id])
+        for asc in (True, False):
+            ordenadas = sorted(todas, key=lambda t: clave(t, asc))
+            self.assertEqual(repo.ordenadas_por_fecha(asc), ordenadas)
+            pendientes = [t for t in ordenadas if not t.completada]
+            self.assertEqual(repo.pendientes(asc), pendientes)
+            self.assertEqual(repo.pendientes(asc, limite=5, desplazamiento=3), pendientes[3:8])
+        pendientes = [t for t in sorted(todas, key=lambda t: clave(t, True)) if not t.completada]
+        hoy, domingo = limites_semana(HOY)
+        self.assertEqual(repo.vencidas(HOY), [t for t in pendientes if 0 < t.ordinal < hoy])
+        self.assertEqual(repo.esta_semana(HOY), [t for t in pendientes if hoy <= t.ordinal <= domingo])
+        self.assertEqual(repo.proximas(4, HOY), [t for t in pendientes if t.ordinal >= hoy][:4])
+
+    def test_indices_mantenidos_por_las_operaciones(self):
+        rnd = random.Random(5)
+        repo = self.repo
+        repo.agregar_varias([Tarea(f"t{n}", fecha_limite=_fecha(rnd)) for n in range(30)])
+        self._comprobar()  # Crea los índices; desde aquí se mantienen
+        for paso in range(300):
+            ids = [t.id for t in repo.tareas]
+            accion = rnd.random()
+            if accion < 0.3 or not ids:
+                repo.agregar(Tarea("nueva", fecha_limite=_fecha(rnd)))
+            elif accion < 0.45:
+                repo.eliminar(rnd.choice(ids))
+            elif accion < 0.65:
+                repo.actualizar(rnd.choice(ids), Tarea("editada", fecha_limite=_fecha(rnd)))
+            elif accion < 0.9:
+                repo.marcar(rnd.choice(ids), rnd.random() < 0.7)
+            elif accion < 0.95:
+                repo.marcar_varias(rnd.sample(ids, min(3, len(ids))))
+            else:
+                repo.ordenar_por_fecha(ascendente=rnd.random() < 0.5)
+            if paso % 20 == 0:
+                self._comprobar()
+        self._comprobar()
+
+
+if __name__ == "__main__":
+    unittest.main()
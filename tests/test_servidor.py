@@ -0,0 +1,134 @@
+# tests/test_servidor.py
+"""API HTTP de servidor.py: rutas, códigos de estado, ETag/304 y cuerpos mal formados."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import json
+import shutil
+import tempfile
+import unittest
+
+from data.tarea_repository import TareaRepository
+from models.tarea import Tarea
+from servidor import ServidorTareas
+
+
+class TestServidor(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.repo = TareaRepository(os.path.join(self.carpeta, "tareas.json"))
+        self.repo.agregar_varias([Tarea("a", fecha_limite="2030-01-03", id="a"),
+                                  Tarea("b", fecha_limite="2030-01-01", id="b"),
+                                  Tarea("c", id="c")])
+        self.servidor = ServidorTareas(self.repo)
+        self.http = await self.servidor.iniciar("127.0.0.1", 0)  # Puerto efímero
+        self.puerto = self.http.sockets[0].getsockname()[1]
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.puerto)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        self.http.close()
+        await self.http.wait_closed()
+        await self.servidor.detener()
+        self.repo.cerrar()
+        shutil.rmtree(self.carpeta)
+
+    async def _pedir(self, metodo: str, ruta: str, cuerpo: bytes = b"", cabeceras: dict = None):
+        """(estado, cabeceras en minúsculas, cuerpo) sobre la conexión keep-alive de la prueba."""
+        lineas = [f"{metodo} {ruta} HTTP/1.1", "Host: localhost", f"Content-Length: {len(cuerpo)}"]
+        lineas += [f"{k}: {v}" for k, v in (cabeceras or {}).items()]
+        self.writer.write(("\r\n".join(lineas) + "\r\n\r\n").encode("latin-1") + cuerpo)
+        return await self._respuesta()
+
+    async def _respuesta(self):
+        cabecera = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        valores = {}
+        for linea in cabecera[1:]:
+            if ":" in linea:
+                nombre, valor = linea.split(":", 1)
+                valores[nombre.strip().lower()] = valor.strip()
+        longitud = int(valores.get("content-length", 0))
+        datos = await self.reader.readexactly(longitud) if longitud else b""
+        return int(cabecera[0].split(" ", 2)[1]), valores, datos
+
+    async def _json(self, metodo: str, ruta: str, cuerpo: bytes = b"", estado: int = 200):
+        obtenido, _, datos = await self._pedir(metodo, ruta, cuerpo)
+        self.assertEqual(obtenido, estado, datos)
+        return json.loads(datos)
+
+    async def test_listar_y_paginar(self):
+        ids = lambda r: [t["id"] for t in r["tareas"]]
+        self.assertEqual(ids(await self._json("GET", "/tareas")), ["a", "b", "c"])
+        self.assertEqual(ids(await self._json("GET", "/tareas?vista=pendientes")), ["b", "a", "c"])
+        self.assertEqual(ids(await self._json("GET", "/tareas?orden=desc")), ["a", "b", "c"])
+        pagina = await self._json("GET", "/tareas?vista=pendientes&limite=2")
+        self.assertEqual((ids(pagina), pagina["siguiente"]), (["b", "a"], 2))
+        pagina = await self._json("GET", "/tareas?vista=pendientes&limite=2&desde=2")
+        self.assertEqual((ids(pagina), pagina["siguiente"]), (["c"], None))
+        pagina = await self._json("GET", "/tareas?limite=1&desde=1")
+        self.assertEqual((ids(pagina), pagina["siguiente"]), (["b"], 2))
+        self.assertEqual(ids(await self._json("GET", "/tareas?q=b")), ["b"])
+        self.assertEqual((await self._json("GET", "/tareas/b"))["titulo"], "b")
+
+    async def test_mutaciones(self):
+        creada = await self._json("POST", "/tareas", json.dumps({"titulo": "nueva", "fecha_limite": "2030-01-02"})
+                                  .encode("utf-8"), estado=201)
+        self.assertEqual(self.repo.obtener(creada["id"]).titulo, "nueva")
+        alternada = await self._json("POST", f"/tareas/{creada['id']}/alternar")
+        self.assertTrue(alternada["completada"])
+        self.assertTrue(self.repo.obtener(creada["id"]).completada)
+        estado, _, datos = await self._pedir("DELETE", "/tareas/a")
+        self.assertEqual((estado, datos), (204, b""))
+        self.assertEqual([t.id for t in self.repo.tareas], ["b", "c", creada["id"]])
+
+    async def test_errores(self):
+        casos = [("GET", "/tareas/zzz", b"", 404),
+                 ("POST", "/tareas/zzz/alternar", b"", 404),
+                 ("DELETE", "/tareas/zzz", b"", 404),
+                 ("GET", "/otra", b"", 404),
+                 ("PUT", "/tareas", b"", 405),
+                 ("GET", "/tareas?vista=rara", b"", 400),
+                 ("GET", "/tareas?orden=arriba", b"", 400),
+                 ("GET", "/tareas?limite=x", b"", 400),
+                 ("GET", "/tareas?desde=-1", b"", 400),
+                 ("POST", "/tareas", b"{no es json", 400),
+                 ("POST", "/tareas", b"\xff\xfe", 400),
+                 ("POST", "/tareas", b"[1, 2]", 400),
+                 ("POST", "/tareas", b'{"descripcion": "sin titulo"}', 400),
+                 ("POST", "/tareas", b'{"titulo": "x", "fecha_limite": "31-12-2030"}', 400)]
+        for metodo, ruta, cuerpo, estado in casos:
+            with self.subTest(f"{metodo} {ruta} {cuerpo!r}"):
+                respuesta = await self._json(metodo, ruta, cuerpo, estado)
+                self.assertIn("error", respuesta)
+        # Ninguno llegó al repositorio, y la conexión sigue viva
+        self.assertEqual([t.id for t in self.repo.tareas], ["a", "b", "c"])
+        self.assertEqual(len((await self._json("GET", "/tareas"))["tareas"]), 3)
+
+    async def test_peticion_mal_formada_cierra_la_conexion(self):
+        self.writer.write(b"BASURA\r\n\r\n")
+        estado, cabeceras, _ = await self._respuesta()
+        self.assertEqual((estado, cabeceras.get("connection")), (400, "close"))
+        self.assertEqual(await self.reader.read(), b"")
+
+    async def test_etag_y_304(self):
+        estado, cabeceras, _ = await self._pedir("GET", "/tareas")
+        etag = cabeceras["etag"]
+        for ruta in ("/tareas", "/tareas?vista=pendientes", "/tareas/a"):
+            estado, cabeceras, datos = await self._pedir("GET", ruta, cabeceras={"If-None-Match": etag})
+            self.assertEqual((estado, datos, cabeceras["etag"]), (304, b"", etag))
+        # Una mutación cambia la versión: el ETag viejo ya no vale
+        await self._json("POST", "/tareas/a/alternar")
+        estado, cabeceras, _ = await self._pedir("GET", "/tareas", cabeceras={"If-None-Match": etag})
+        self.assertEqual(estado, 200)
+        self.assertNotEqual(cabeceras["etag"], etag)
+        # Una mutación fallida no
+        etag = cabeceras["etag"]
+        await self._json("POST", "/tareas", b"{", estado=400)
+        estado, _, _ = await self._pedir("GET", "/tareas", cabeceras={"If-None-Match": etag})
+        self.assertEqual(estado, 304)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+# tests/test_sincronizar.py
+"""Varios procesos sobre el mismo tareas.json: incorporar cambios ajenos sin perder los propios."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from data.almacenamiento import AlmacenamientoJSON
+from data.tarea_repository import TareaRepository
+from models.tarea import Tarea
+
+
+class TestSincronizar(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.carpeta, "tareas.json")
+        with open(self.ruta, "w", encoding="utf-8") as f:
+            json.dump([Tarea("x", fecha_limite="2030-01-02", id="x").to_dict(),
+                       Tarea("y", fecha_limite="2030-01-01", id="y").to_dict()], f)
+
+    def tearDown(self):
+        shutil.rmtree(self.carpeta)
+
+    def _en_disco(self) -> list:
+        with open(self.ruta, encoding="utf-8") as f:
+            return [t["id"] for t in json.load(f)]
+
+    def test_reorden_externo_con_alta_local_pendiente(self):
+        # A guarda en segundo plano y su alta aún no está en disco
+        a = TareaRepository(self.ruta, almacenamiento=AlmacenamientoJSON(self.ruta, asincrono=True, espera=60))
+        a.agregar(Tarea("A-nueva", id="A-nueva"))
+        # Otro proceso reordena el archivo
+        b = TareaRepository(self.ruta)
+        b.ordenar_por_fecha(ascendente=True)
+        b.cerrar()
+        self.assertEqual(self._en_disco(), ["y", "x"])
+
+        self.assertTrue(a.sincronizar())
+        self.assertEqual([t.id for t in a.tareas], ["y", "x", "A-nueva"])
+        a.cerrar()
+        self.assertEqual(self._en_disco(), ["y", "x", "A-nueva"])
+        self.assertFalse(a.cambios_externos())
+
+    def test_archivo_tocado_sin_cambios(self):
+        a = TareaRepository(self.ruta)
+        os.utime(self.ruta, ns=(0, 0))  # Cambia la firma, no el contenido
+        self.assertTrue(a.cambios_externos())
+        self.assertFalse(a.sincronizar())
+        self.assertFalse(a.cambios_externos())
+        a.cerrar()
+
+    def test_sin_cambios_externos_no_sincroniza(self):
+        a = TareaRepository(self.ruta)
+        self.assertFalse(a.sincronizar())
+        a.cerrar()
+
+    def test_abrir_archivo_antiguo_guarda_los_ids(self):
+        # Sin ids y con una entrada ilegible: se respalda el original y se guardan los ids al abrir
+        with open(self.ruta, "w", encoding="utf-8") as f:
+            json.dump([{"titulo": "sin id", "fecha_limite": "2030-01-01"}, {"fecha_limite": "roto"}], f)
+        with open(self.ruta, "rb") as f:
+            original = f.read()
+        a = TareaRepository(self.ruta)
+        generado = a.tareas[0].id
+        self.assertEqual(self._en_disco(), [generado])
+        with open(self.ruta + ".bak", "rb") as f:
+            self.assertEqual(f.read(), original)
+        # Otro proceso (o la siguiente ejecución) ve los mismos ids sin que haya mutaciones
+        b = TareaRepository(self.ruta)
+        self.assertEqual([t.id for t in b.tareas], [generado])
+        b.marcar(generado)
+        b.cerrar()
+        a.cerrar()
+        self.assertFalse(os.path.exists(self.ruta + ".bak.1"))
+
+    def _con_registro_ilegible(self) -> bytes:
+        with open(self.ruta, "w", encoding="utf-8") as f:
+            json.dump([Tarea("x", id="x").to_dict(), {"fecha_limite": "roto"}], f)
+        with open(self.ruta, "rb") as f:
+            return f.read()
+
+    def test_primera_escritura_incorpora_cambios_ajenos(self):
+        # Archivo sin ids: la primera mutación de A no debe pisar el alta de B
+        with open(self.ruta, "w", encoding="utf-8") as f:
+            json.dump([{"titulo": "sin id", "fecha_limite": "2030-01-01"}], f)
+        a = TareaRepository(self.ruta)
+        b = TareaRepository(self.ruta)
+        b.agregar(Tarea("de B", id="b"))
+        b.cerrar()
+        a.agregar(Tarea("de A", id="a"))
+        a.cerrar()
+        self.assertEqual(self._en_disco()[1:], ["b", "a"])
+
+    def test_primera_escritura_con_registro_ilegible_incorpora_cambios_ajenos(self):
+        original = self._con_registro_ilegible()
+        a = TareaRepository(self.ruta)
+        b = TareaRepository(self.ruta)
+        b.agregar(Tarea("de B", id="b"))
+        b.cerrar()
+        a.marcar("x")
+        a.cerrar()
+        c = TareaRepository(self.ruta)
+        self.assertEqual([(t.id, t.completada) for t in c.tareas], [("x", True), ("b", False)])
+        # B respaldó el original; A ya no lo tenía delante y no pisa la copia
+        with open(self.ruta + ".bak", "rb") as f:
+            self.assertEqual(f.read(), original)
+        self.assertFalse(os.path.exists(self.ruta + ".bak.1"))
+
+    def test_respaldo_no_pisa_copias_anteriores(self):
+        original = self._con_registro_ilegible()
+        with open(self.ruta + ".bak", "wb") as f:
+            f.write(b"anterior")
+        a = TareaRepository(self.ruta)
+        a.marcar("x")
+        a.cerrar()
+        with open(self.ruta + ".bak", "rb") as f:
+            self.assertEqual(f.read(), b"anterior")
+        with open(self.ruta + ".bak.1", "rb") as f:
+            self.assertEqual(f.read(), original)
+
+    def test_respaldo_fallido_no_bloquea_el_guardado(self):
+        self._con_registro_ilegible()
+        a = TareaRepository(self.ruta)
+        with mock.patch("data.tarea_repository.shutil.copyfileobj", side_effect=OSError("disco lleno")):
+            a.marcar("x")
+        a.agregar(Tarea("después", id="z"))
+        a.cerrar()
+        self.assertEqual(self._en_disco(), ["x", "z"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+# tests/test_sqlite.py
+"""TareaRepositorySQLite: operaciones, vistas paginadas, cambios de otras conexiones y migración."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import shutil
+import tempfile
+import unittest
+
+from data.fabrica import crear_repositorio
+from data.tarea_repository_sqlite import TareaRepositorySQLite
+from models.tarea import Tarea
+
+
+class TestRepositorioSQLite(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.db = os.path.join(self.carpeta, "t.db")
+        self.repo = TareaRepositorySQLite(self.db, migrar_desde=None)
+
+    def tearDown(self):
+        self.repo.cerrar()
+        shutil.rmtree(self.carpeta)
+
+    def test_operaciones_por_id(self):
+        repo = self.repo
+        repo.agregar(Tarea("a", descripcion="d", fecha_limite="2030-01-01", id="a"))
+        repo.agregar(Tarea("b", id="b"))
+        with self.assertRaises(ValueError):
+            repo.agregar(Tarea("otra", id="a"))
+        repo.actualizar("a", Tarea("a editada", fecha_limite="2030-02-01"))
+        self.assertEqual(repo.obtener("a").titulo, "a editada")
+        repo.marcar("b")
+        fecha = repo.obtener("b").fecha_completada
+        self.assertTrue(repo.obtener("b").completada and fecha)
+        repo.marcar("b")  # Volver a marcar conserva la fecha de finalización
+        self.assertEqual(repo.obtener("b").fecha_completada, fecha)
+        repo.marcar("b", False)
+        self.assertEqual(repo.obtener("b").fecha_completada, "")
+        self.assertEqual(repo.eliminar("a").titulo, "a editada")
+        self.assertEqual([t.id for t in repo.tareas], ["b"])
+        for operacion in (lambda: repo.obtener("a"), lambda: repo.marcar("a"),
+                          lambda: repo.actualizar("a", Tarea("x"))):
+            with self.assertRaises(KeyError):
+                operacion()
+
+    def test_operaciones_masivas(self):
+        repo = self.repo
+        repo.agregar_varias([Tarea(f"t{i}", id=f"t{i}") for i in range(5)])
+        with self.assertRaises(ValueError):
+            repo.agregar_varias([Tarea("nueva", id="n"), Tarea("repetida", id="t0")])
+        self.assertEqual(len(repo), 5)  # Todas o ninguna
+        repo.marcar_varias(["t1", "t2"])
+        self.assertEqual(repo.limpiar_completadas(), 2)
+        repo.eliminar_varias(["t0", "t4"])
+        self.assertEqual([t.id for t in repo.tareas], ["t3"])
+
+    def test_pendientes_ordenadas_y_paginadas(self):
+        fechas = ["2030-03-01", "", "2030-01-01", "2030-02-01", "", "2030-01-01"]
+        self.repo.agregar_varias([Tarea(f"t{i}", fecha_limite=f, id=f"t{i}") for i, f in enumerate(fechas)])
+        self.repo.marcar("t3")
+        # Por fecha (empates en orden almacenado), las sin fecha al final
+        self.assertEqual([t.id for t in self.repo.pendientes()], ["t2", "t5", "t0", "t1", "t4"])
+        self.assertEqual([t.id for t in self.repo.pendientes(ascendente=False)], ["t0", "t2", "t5", "t1", "t4"])
+        paginas = [[t.id for t in self.repo.pendientes(limite=2, desplazamiento=d)] for d in (0, 2, 4)]
+        self.assertEqual(paginas, [["t2", "t5"], ["t0", "t1"], ["t4"]])
+        todas = [t.id for t in self.repo.ordenadas_por_fecha(limite=3, desplazamiento=2)]
+        self.assertEqual(todas, ["t3", "t0", "t1"])
+
+    def test_detecta_cambios_de_otra_conexion(self):
+        self.assertFalse(self.repo.cambios_externos())
+        self.repo.agregar(Tarea("propia", id="p"))
+        self.assertFalse(self.repo.cambios_externos())  # Los cambios propios no cuentan
+        self.assertEqual([t.id for t in self.repo.buscar("propia")], ["p"])
+        otra = TareaRepositorySQLite(self.db, migrar_desde=None)
+        otra.agregar(Tarea("ajena propia", id="a"))
+        otra.cerrar()
+        self.assertTrue(self.repo.cambios_externos())
+        self.assertTrue(self.repo.sincronizar())
+        self.assertFalse(self.repo.cambios_externos())
+        self.assertEqual([t.id for t in self.repo.buscar("propia")], ["p", "a"])
+
+
+class TestMigracion(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.db = os.path.join(self.carpeta, "t.db")
+        with open(os.path.join(self.carpeta, "tareas.json"), "w", encoding="utf-8") as f:
+            json.dump([Tarea("x", fecha_limite="2030-01-02", id="x").to_dict(),
+                       Tarea("y", id="y").to_dict()], f)
+
+    def tearDown(self):
+        shutil.rmtree(self.carpeta)
+
+    def test_migra_el_json_junto_a_la_base(self):
+        # La ruta por defecto se resuelve en la carpeta de la base, no en el directorio actual
+        repo = crear_repositorio(self.db)
+        self.assertEqual([t.id for t in repo.tareas], ["x", "y"])
+        repo.cerrar()
+
+    def test_migra_una_sola_vez(self):
+        repo = crear_repositorio(self.db)
+        repo.eliminar_varias(["x", "y"])
+        repo.cerrar()
+        repo = crear_repositorio(self.db)
+        self.assertEqual(len(repo), 0)  # Vaciada por el usuario: no se reimporta
+        repo.cerrar()
+
+    def test_base_con_datos_anterior_a_la_marca(self):
+        repo = TareaRepositorySQLite(self.db, migrar_desde=None)
+        repo.agregar(Tarea("propia", id="p"))
+        repo.cerrar()
+        repo = TareaRepositorySQLite(self.db)
+        self.assertEqual([t.id for t in repo.tareas], ["p"])
+        repo.eliminar("p")
+        repo.cerrar()
+        repo = TareaRepositorySQLite(self.db)
+        self.assertEqual(len(repo), 0)
+        repo.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
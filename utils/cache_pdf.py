@@ -0,0 +1,145 @@
+# utils/cache_pdf.py
+"""
+Caché en disco de informes PDF direccionada por contenido.
+
+La clave es un SHA-256 de las filas tal y como se dibujan (estado, título,
+descripción recortada, fecha) más las opciones de maquetación: dos exportaciones
+de la misma lista producen el mismo PDF, así que la segunda copia el archivo ya
+renderizado en lugar de pasar por reportlab. La fecha del día entra en la clave
+para que el encabezado "📅 ..." nunca muestre un día anterior; dentro del mismo
+día el informe conserva la hora del primer render.
+
+TAREAS_CACHE_PDF=carpeta cambia la ubicación (0 la desactiva) y
+TAREAS_CACHE_PDF_MB el tamaño máximo.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import date
+from itertools import islice
+from typing import Callable, Iterable, List, Optional
+
+# Subir al cambiar cómo se dibuja el informe: invalida todo lo cacheado
+VERSION_MAQUETA = 1
+MAX_MB_CACHE = 200
+# Filas por bloque al calcular la huella (json.dumps de una lista es mucho más rápido que fila a fila)
+_FILAS_POR_BLOQUE = 10_000
+
+
+class CachePDF:
+    """
+    PDFs ya renderizados, guardados como <clave>.pdf en una carpeta.
+    ✅ Clave por contenido: misma lista y mismas opciones -> mismo archivo
+    ✅ Acierto = una copia de archivo (sin reportlab)
+    ✅ LRU acotada por tamaño total: el mtime marca el último uso y se
+       expulsan los menos usados al pasar del máximo
+    ✅ Un fallo de la caché nunca impide exportar: se avisa y se renderiza
+    """
+    def __init__(self, carpeta: str, max_bytes: int = MAX_MB_CACHE << 20):
+        self.carpeta = carpeta
+        self.max_bytes = max_bytes
+        self._bloqueo = threading.Lock()
+
+    def clave(self, tareas: Iterable, formato: str, filas_por_pagina: Optional[int] = None,
+              hoy: Optional[date] = None) -> str:
+        """
+        Huella de lo que se va a dibujar y de cómo se maqueta. formato es el modo
+        del exportador ("streaming", "paralelo", "clasico"): sus PDFs difieren
+        (p. ej. "Página X" frente a "Página X de Y") y no son intercambiables.
+        """
+        from utils.pdf_exporter import ENCABEZADO, FILAS_POR_PAGINA, FILAS_PRIMERA_PAGINA, _fila
+        h = hashlib.sha256()
+        opciones = [VERSION_MAQUETA, formato, ENCABEZADO, filas_por_pagina or FILAS_POR_PAGINA,
+                    FILAS_PRIMERA_PAGINA, (hoy or date.today()).isoformat()]
+        h.update(json.dumps(opciones).encode("utf-8"))
+        iterador = iter(tareas)
+        while True:
+            bloque = [_fila(t) for t in islice(iterador, _FILAS_POR_BLOQUE)]
+            if not bloque:
+                break
+            h.update(json.dumps(bloque, ensure_ascii=False).encode("utf-8"))
+        return h.hexdigest()
+
+    def ruta(self, clave: str) -> str:
+        return os.path.join(self.carpeta, f"{clave}.pdf")
+
+    def copiar(self, clave: str, destino: str) -> bool:
+        """Copia el PDF cacheado a destino; False si no está."""
+        ruta = self.ruta(clave)
+        try:
+            shutil.copyfile(ruta, destino)
+            os.utime(ruta)  # Último uso, para la expulsión LRU
+            return True
+        except FileNotFoundError:  # No cacheado, o expulsado por otro proceso
+            return False
+        except OSError as e:
+            print(f"[⚠️] No se pudo usar la caché de PDF ({ruta}): {e}")
+            return False
+
+    def guardar(self, clave: str, origen: str):
+        """Guarda una copia de origen bajo la clave y recorta la caché al máximo."""
+        try:
+            if os.path.getsize(origen) > self.max_bytes:
+                return  # Ocuparía toda la caché: no compensa
+            os.makedirs(self.carpeta, exist_ok=True)
+            ruta = self.ruta(clave)
+            temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(origen, temporal)
+            os.replace(temporal, ruta)  # Nadie ve nunca un PDF a medio copiar
+            self.recortar()
+        except OSError as e:
+            print(f"[⚠️] No se pudo guardar el PDF en la caché ({self.carpeta}): {e}")
+
+    def recortar(self):
+        """Expulsa los PDFs usados hace más tiempo hasta quedar por debajo del máximo."""
+        with self._bloqueo:
+            entradas = []
+            try:
+                with os.scandir(self.carpeta) as it:
+                    for e in it:
+                        if e.name.endswith(".pdf"):
+                            st = e.stat()
+                            entradas.append((st.st_mtime_ns, st.st_size, e.path))
+            except FileNotFoundError:
+                return
+            total = sum(tamano for _, tamano, _ in entradas)
+            for _, tamano, ruta in sorted(entradas):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(ruta)
+                except FileNotFoundError:
+                    pass
+                total -= tamano
+
+    def entradas(self) -> List[str]:
+        try:
+            return [n for n in os.listdir(self.carpeta) if n.endswith(".pdf")]
+        except FileNotFoundError:
+            return []
+
+    def exportar(self, tareas: List, ruta_salida: str, renderizar: Callable[[str], None],
+                 formato: str, filas_por_pagina: Optional[int] = None) -> bool:
+        """
+        Copia el PDF de la caché si existe; si no, llama a renderizar(ruta_salida)
+        y guarda el resultado. Devuelve True si fue un acierto.
+        """
+        clave = self.clave(tareas, formato, filas_por_pagina)
+        if self.copiar(clave, ruta_salida):
+            return True
+        renderizar(ruta_salida)
+        self.guardar(clave, ruta_salida)
+        return False
+
+
+def crear_cache_pdf() -> Optional[CachePDF]:
+    """Caché según el entorno (por defecto en la carpeta de caché del usuario); None si está desactivada."""
+    carpeta = os.environ.get("TAREAS_CACHE_PDF")
+    if carpeta == "0":
+        return None
+    if not carpeta:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        carpeta = os.path.join(base, "lista_deberes", "pdf")
+    return CachePDF(carpeta, int(os.environ.get("TAREAS_CACHE_PDF_MB", MAX_MB_CACHE)) << 20)
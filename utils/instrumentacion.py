@@ -0,0 +1,213 @@
+# utils/instrumentacion.py
+"""
+Instrumentación opcional (TAREAS_PERFIL=1): latencias por operación y por fase.
+
+Cada manejador del Controlador es una *operación*; los métodos envueltos que se
+llaman dentro de ella (E/S del repositorio, actualizar_lista, diálogos, render
+del PDF) son sus *fases* y se registran como "operación › fase". Los tiempos van
+a histogramas de cubetas logarítmicas (memoria constante) y se pueden volcar a
+JSON o inspeccionar en el panel de depuración de la vista. perfilar_siguiente()
+ejecuta la siguiente operación bajo cProfile y guarda el .prof junto al volcado.
+"""
+import functools
+import inspect
+import io
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, List, Optional
+
+# Límites superiores de las cubetas: 10 µs · 2^k (hasta ~84 s) y una de desbordamiento
+LIMITES = [1e-5 * 2 ** k for k in range(24)]
+SEPARADOR = " › "
+
+
+class Histograma:
+    """
+    Distribución de duraciones en cubetas logarítmicas.
+    ✅ Memoria constante, sin guardar cada muestra
+    ✅ Percentiles aproximados (cota superior de la cubeta, acotada por el máximo)
+    """
+    def __init__(self):
+        self.cubetas = [0] * (len(LIMITES) + 1)
+        self.cuenta = 0
+        self.total = 0.0
+        self.minimo = float("inf")
+        self.maximo = 0.0
+
+    def registrar(self, segundos: float):
+        self.cubetas[bisect_left(LIMITES, segundos)] += 1
+        self.cuenta += 1
+        self.total += segundos
+        self.minimo = min(self.minimo, segundos)
+        self.maximo = max(self.maximo, segundos)
+
+    def percentil(self, p: float) -> float:
+        if not self.cuenta:
+            return 0.0
+        objetivo = p * self.cuenta
+        acumulado = 0
+        for i, n in enumerate(self.cubetas):
+            acumulado += n
+            if acumulado >= objetivo:
+                return min(LIMITES[i] if i < len(LIMITES) else self.maximo, self.maximo)
+        return self.maximo
+
+    @property
+    def media(self) -> float:
+        return self.total / self.cuenta if self.cuenta else 0.0
+
+    def to_dict(self) -> dict:
+        return {"cuenta": self.cuenta, "total_s": self.total, "media_s": self.media,
+                "min_s": self.minimo if self.cuenta else 0.0, "max_s": self.maximo,
+                "p50_s": self.percentil(0.50), "p95_s": self.percentil(0.95),
+                "p99_s": self.percentil(0.99),
+                "cubetas": {f"<={limite:g}": n for limite, n in zip(LIMITES, self.cubetas) if n},
+                "desbordadas": self.cubetas[-1]}
+
+
+class Instrumentacion:
+    """
+    Registro de latencias por operación/fase.
+    ✅ Desactivada: instrumentar() no toca nada y fase() es un contexto vacío
+    ✅ Pila por hilo: las fases de la exportación en segundo plano no se mezclan
+    ✅ Captura de cProfile de una sola operación bajo demanda
+    """
+    def __init__(self, activa: bool = False, archivo: str = "perfil_tareas.json"):
+        self.activa = activa
+        self.archivo = archivo
+        self.histogramas: Dict[str, Histograma] = {}
+        self.ultimo_perfil = ""  # Resumen pstats de la última captura
+        self._bloqueo = threading.Lock()
+        self._local = threading.local()
+        self._perfilar = False
+
+    # --- Registro ---
+    def registrar(self, nombre: str, segundos: float):
+        with self._bloqueo:
+            histograma = self.histogramas.get(nombre)
+            if histograma is None:
+                histograma = self.histogramas[nombre] = Histograma()
+            histograma.registrar(segundos)
+
+    def fase(self, nombre: str):
+        """Contexto que mide un tramo de código como fase de la operación en curso."""
+        return self._medir(nombre, operacion=False) if self.activa else nullcontext()
+
+    @contextmanager
+    def _medir(self, nombre: str, operacion: bool):
+        pila = self._pila()
+        if pila:
+            nombre = f"{pila[0]}{SEPARADOR}{nombre}"  # Fase: se atribuye a la operación exterior
+        perfil = None
+        if operacion and not pila and self._perfilar:
+            import cProfile
+            self._perfilar = False
+            perfil = cProfile.Profile()
+        pila.append(nombre)
+        inicio = time.perf_counter()
+        if perfil is not None:
+            perfil.enable()
+        try:
+            yield
+        finally:
+            if perfil is not None:
+                perfil.disable()
+            self.registrar(nombre, time.perf_counter() - inicio)
+            pila.pop()
+            if perfil is not None:
+                self._guardar_perfil(nombre, perfil)
+
+    def _pila(self) -> List[str]:
+        pila = getattr(self._local, "pila", None)
+        if pila is None:
+            pila = self._local.pila = []
+        return pila
+
+    # --- Envoltura de métodos ---
+    def instrumentar(self, objeto, metodos: Iterable[str], operacion: bool = False, prefijo: str = ""):
+        """
+        Sustituye (en la instancia) cada método existente por una versión medida.
+        Con operacion=True el método abre una operación; si no, es una fase.
+        prefijo distingue métodos homónimos de otros objetos (p. ej. "almacenamiento.").
+        Debe llamarse antes de repartir referencias a los métodos (p. ej. callbacks).
+        """
+        if not self.activa:
+            return
+        for nombre in metodos:
+            metodo = getattr(objeto, nombre, None)
+            if callable(metodo):
+                setattr(objeto, nombre, self._envolver(metodo, prefijo + nombre, operacion))
+
+    def _envolver(self, metodo, nombre: str, operacion: bool):
+        if inspect.isgeneratorfunction(metodo):
+            # Generador (p. ej. carga por lotes): se mide cada paso, no la creación
+            @functools.wraps(metodo)
+            def pasos(*args, **kwargs):
+                iterador = metodo(*args, **kwargs)
+                while True:
+                    with self._medir(nombre, operacion):
+                        try:
+                            valor = next(iterador)
+                        except StopIteration:
+                            return
+                    yield valor
+            return pasos
+
+        @functools.wraps(metodo)
+        def envoltura(*args, **kwargs):
+            with self._medir(nombre, operacion):
+                return metodo(*args, **kwargs)
+        return envoltura
+
+    # --- cProfile ---
+    def perfilar_siguiente(self):
+        """La próxima operación (manejador del Controlador) se ejecuta bajo cProfile."""
+        self._perfilar = True
+
+    def _guardar_perfil(self, nombre: str, perfil):
+        import pstats
+        ruta = os.path.join(os.path.dirname(os.path.abspath(self.archivo)),
+                            f"perfil_{nombre}_{time.strftime('%Y%m%d_%H%M%S')}.prof")
+        try:
+            perfil.dump_stats(ruta)
+        except OSError as e:
+            print(f"[⚠️] No se pudo guardar el perfil en {ruta}: {e}")
+            ruta = ""
+        salida = io.StringIO()
+        pstats.Stats(perfil, stream=salida).sort_stats("cumulative").print_stats(25)
+        self.ultimo_perfil = f"{nombre} → {ruta or '(sin archivo)'}\n{salida.getvalue()}"
+
+    # --- Informes ---
+    def reiniciar(self):
+        with self._bloqueo:
+            self.histogramas.clear()
+
+    def resumen(self) -> str:
+        """Tabla de texto (ms) para el panel de depuración."""
+        with self._bloqueo:
+            filas = sorted(self.histogramas.items())
+            lineas = [f"{'operación / fase':<42} {'n':>6} {'media':>9} {'p50':>9} "
+                      f"{'p95':>9} {'p99':>9} {'máx':>9}"]
+            for nombre, h in filas:
+                lineas.append(f"{nombre:<42} {h.cuenta:>6} {h.media * 1e3:>9.2f} "
+                              f"{h.percentil(0.5) * 1e3:>9.2f} {h.percentil(0.95) * 1e3:>9.2f} "
+                              f"{h.percentil(0.99) * 1e3:>9.2f} {h.maximo * 1e3:>9.2f}")
+        if self.ultimo_perfil:
+            lineas += ["", "Último perfil (cProfile): " + self.ultimo_perfil]
+        elif self._perfilar:
+            lineas += ["", "🔬 La próxima operación se ejecutará bajo cProfile."]
+        return "\n".join(lineas)
+
+    def volcar(self, ruta: Optional[str] = None) -> str:
+        """Escribe los histogramas en JSON y devuelve la ruta."""
+        ruta = ruta or self.archivo
+        with self._bloqueo:
+            datos = {"fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                     "histogramas": {n: h.to_dict() for n, h in sorted(self.histogramas.items())}}
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+        return ruta
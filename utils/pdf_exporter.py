@@ -3,7 +3,12 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from typing import List
+import multiprocessing
+import tempfile
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from typing import Callable, Iterable, List, Optional
 from datetime import datetime
 
 # Detectar disponibilidad de reportlab
@@ -13,10 +18,18 @@ try:
     from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.units import inch
+    from reportlab.pdfgen import canvas
     REPORTLAB_AVAILABLE = True
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
+# pypdf es opcional: solo hace falta para unir las partes del modo paralelo
+try:
+    from pypdf import PdfWriter
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
 try:
     from models.tarea import Tarea
 except ImportError:
@@ -29,6 +42,17 @@ except ImportError:
             self.completada = completada
 
 
+class ExportacionCancelada(Exception):
+    """La exportación se detuvo a petición del usuario (no se escribe el PDF)."""
+
+
+ENCABEZADO = ["✔️", "TÍTULO", "DESCRIPCIÓN", "FECHA"]
+# Filas por página en modo streaming (las filas son de una sola línea: la
+# descripción se recorta a 50 caracteres)
+FILAS_POR_PAGINA = 24
+FILAS_PRIMERA_PAGINA = 19
+
+
 class PDFExporter:
     @staticmethod
     def exportar(tareas: List[Tarea], ruta_salida: str):
@@ -38,35 +62,249 @@ class PDFExporter:
         doc = SimpleDocTemplate(ruta_salida, pagesize=landscape(A4))
         elementos = []
 
-        styles = getSampleStyleSheet()
-        titulo = ParagraphStyle('Titulo', parent=styles['Heading1'], fontSize=20, spaceAfter=14,
-                               textColor=colors.HexColor("#1976D2"), alignment=1)
-        subtitulo = ParagraphStyle('Sub', fontSize=11, textColor=colors.grey, alignment=1)
+        styles, titulo, subtitulo = _estilos()
 
         elementos.append(Paragraph("📋 LISTA DE DEBERES — ESTRUCTURA DE DATOS", titulo))
         elementos.append(Paragraph(f"📅 {datetime.now():%d de %B de %Y, %H:%M}", subtitulo))
         elementos.append(Spacer(1, 20))
 
-        datos = [["✔️", "TÍTULO", "DESCRIPCIÓN", "FECHA"]]
-        for t in tareas:
-            estado = "✅" if t.completada else "⏳"
-            desc = (t.descripcion[:50] + "..." if len(t.descripcion) > 50 else t.descripcion) or "—"
-            datos.append([estado, t.titulo, desc, t.fecha_limite or "—"])
-
-        tabla = Table(datos, colWidths=[0.6*inch, 2*inch, 3.5*inch, 1*inch])
-        tabla.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#1976D2")),
-            ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0,0), (-1,0), 10),
-            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('BACKGROUND', (0,1), (-1,-1), colors.whitesmoke),
-        ]))
-        elementos.append(tabla)
+        datos = [ENCABEZADO] + [_fila(t) for t in tareas]
+        elementos.append(_tabla(datos))
 
         elementos.append(Spacer(1, 20))
         completadas = sum(t.completada for t in tareas)
         elementos.append(Paragraph(f"📊 Total: {len(tareas)} | ✅ {completadas} | ⏳ {len(tareas)-completadas}", styles["Normal"]))
 
-        doc.build(elementos)
\ No newline at end of file
+        doc.build(elementos)
+
+    @staticmethod
+    def exportar_streaming(tareas: Iterable[Tarea], ruta_salida: str,
+                           filas_por_pagina: int = FILAS_POR_PAGINA,
+                           progreso: Optional[Callable[[int], None]] = None,
+                           cancelado: Optional[Callable[[], bool]] = None):
+        """
+        Exporta consumiendo un iterador: cada página recibe una tabla de tamaño
+        fijo (con el encabezado repetido) que se dibuja y se descarta, así que
+        la memoria no depende del número de tareas.
+        progreso(n) se llama tras cada página con las filas dibujadas hasta ahora;
+        si cancelado() devuelve True se lanza ExportacionCancelada sin escribir nada.
+        """
+        if not REPORTLAB_AVAILABLE:
+            raise RuntimeError("reportlab no está instalado. Ejecuta: pip install reportlab")
+
+        c = canvas.Canvas(ruta_salida, pagesize=landscape(A4), pageCompression=1)
+        _dibujar_paginas(c, tareas, filas_por_pagina=filas_por_pagina,
+                         progreso=progreso, cancelado=cancelado)
+        c.save()
+
+    @staticmethod
+    def exportar_paralelo(tareas: List[Tarea], ruta_salida: str, procesos: Optional[int] = None,
+                          filas_por_pagina: int = FILAS_POR_PAGINA,
+                          progreso: Optional[Callable[[int], None]] = None,
+                          cancelado: Optional[Callable[[], bool]] = None):
+        """
+        Reparte las páginas en fragmentos contiguos, renderiza cada fragmento a
+        un PDF parcial en un ProcessPoolExecutor y los une (pypdf) en el orden
+        original. Cada parte conoce su primera página y el total, así que la
+        numeración "Página X de Y" es continua.
+        Los procesos no se crean con fork: suele llamarse desde un hilo, y un
+        fork copiaría cerrojos tomados por otros hilos (Tk, escritor en segundo plano).
+        Sin pypdf, o si el informe es pequeño, se usa exportar_streaming.
+        """
+        if not REPORTLAB_AVAILABLE:
+            raise RuntimeError("reportlab no está instalado. Ejecuta: pip install reportlab")
+
+        procesos = procesos or os.cpu_count() or 1
+        paginas = _planificar_paginas(len(tareas), filas_por_pagina)
+        if not PYPDF_AVAILABLE or procesos < 2 or len(paginas) < 2 * procesos:
+            PDFExporter.exportar_streaming(tareas, ruta_salida, filas_por_pagina, progreso, cancelado)
+            return
+
+        total_paginas = _total_paginas(len(tareas), filas_por_pagina)
+        totales = (len(tareas), sum(t.completada for t in tareas))
+        n_partes = min(len(paginas), procesos * 4)  # Más partes que procesos: mejor reparto y progreso
+        por_parte = -(-len(paginas) // n_partes)
+        grupos = [paginas[i:i + por_parte] for i in range(0, len(paginas), por_parte)]
+
+        with tempfile.TemporaryDirectory() as carpeta:
+            trabajos = []
+            for k, grupo in enumerate(grupos):
+                inicio, fin = grupo[0][0], grupo[-1][1]
+                trabajos.append((os.path.join(carpeta, f"parte_{k:05d}.pdf"), tareas[inicio:fin],
+                                 k * por_parte + 1, total_paginas,
+                                 k == 0, totales if k == len(grupos) - 1 else None,
+                                 filas_por_pagina))
+            hechas = 0
+            with ProcessPoolExecutor(max_workers=procesos, mp_context=_contexto_procesos()) as ejecutor:
+                futuros = {ejecutor.submit(_renderizar_parte, t): len(t[1]) for t in trabajos}
+                try:
+                    for futuro in as_completed(futuros):
+                        futuro.result()
+                        hechas += futuros[futuro]
+                        if progreso:
+                            progreso(hechas)
+                        if cancelado and cancelado():
+                            raise ExportacionCancelada()
+                except BaseException:
+                    ejecutor.shutdown(wait=True, cancel_futures=True)
+                    raise
+
+            escritor = PdfWriter()
+            for trabajo in trabajos:
+                escritor.append(trabajo[0])
+            with open(ruta_salida, "wb") as f:
+                escritor.write(f)
+
+
+def _contexto_procesos():
+    """forkserver donde exista (arranque rápido, sin heredar hilos); spawn si no (Windows)."""
+    metodo = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(metodo)
+
+
+@lru_cache(maxsize=None)
+def _estilos():
+    """Hoja de estilos y estilos propios, creados una vez por proceso (solo se leen)."""
+    styles = getSampleStyleSheet()
+    titulo = ParagraphStyle('Titulo', parent=styles['Heading1'], fontSize=20, spaceAfter=14,
+                           textColor=colors.HexColor("#1976D2"), alignment=1)
+    subtitulo = ParagraphStyle('Sub', fontSize=11, textColor=colors.grey, alignment=1)
+    return styles, titulo, subtitulo
+
+
+def _fila(t: Tarea) -> list:
+    estado = "✅" if t.completada else "⏳"
+    desc = (t.descripcion[:50] + "..." if len(t.descripcion) > 50 else t.descripcion) or "—"
+    return [estado, t.titulo, desc, t.fecha_limite or "—"]
+
+
+def _tabla(datos: list) -> "Table":
+    tabla = Table(datos, colWidths=[0.6*inch, 2*inch, 3.5*inch, 1*inch], repeatRows=1)
+    tabla.setStyle(_estilo_tabla())
+    return tabla
+
+
+@lru_cache(maxsize=None)
+def _estilo_tabla() -> "TableStyle":
+    """El mismo TableStyle para todas las tablas: setStyle solo lee sus comandos."""
+    return TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#1976D2")),
+        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,0), (-1,0), 10),
+        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+        ('BACKGROUND', (0,1), (-1,-1), colors.whitesmoke),
+    ])
+
+
+def _dibujar_tabla(c, datos: list, ancho: float, y: float) -> float:
+    """Dibuja la tabla centrada con su borde superior en y; devuelve el nuevo y."""
+    tabla = _tabla(datos)
+    w, h = tabla.wrapOn(c, ancho, y)
+    tabla.drawOn(c, (ancho - w) / 2, y - h)
+    return y - h
+
+
+def _pie_pagina(c, ancho: float, margen: float, pagina: int, total_paginas: Optional[int] = None):
+    c.setFont("Helvetica", 8)
+    c.setFillColor(colors.grey)
+    texto = f"Página {pagina}" if total_paginas is None else f"Página {pagina} de {total_paginas}"
+    c.drawCentredString(ancho / 2, margen / 2, texto)
+
+
+def _capacidad(primera: bool, filas_por_pagina: int) -> int:
+    return min(filas_por_pagina, FILAS_PRIMERA_PAGINA) if primera else filas_por_pagina
+
+
+def _planificar_paginas(n: int, filas_por_pagina: int) -> List[tuple]:
+    """Rangos [inicio, fin) de filas de cada página con tabla."""
+    paginas, inicio = [], 0
+    while inicio < n or not paginas:
+        fin = min(n, inicio + _capacidad(not paginas, filas_por_pagina))
+        paginas.append((inicio, fin))
+        inicio = fin
+    return paginas
+
+
+def _resumen_en_pagina_nueva(filas_ultima: int, capacidad: int) -> bool:
+    # El resumen ocupa el alto de ~2 filas bajo la tabla
+    return filas_ultima > capacidad - 2
+
+
+def _total_paginas(n: int, filas_por_pagina: int) -> int:
+    paginas = _planificar_paginas(n, filas_por_pagina)
+    inicio, fin = paginas[-1]
+    extra = _resumen_en_pagina_nueva(fin - inicio, _capacidad(len(paginas) == 1, filas_por_pagina))
+    return len(paginas) + extra
+
+
+def _dibujar_paginas(c, tareas: Iterable[Tarea], filas_por_pagina: int = FILAS_POR_PAGINA,
+                     pagina_inicial: int = 1, total_paginas: Optional[int] = None,
+                     con_cabecera: bool = True, con_resumen: bool = True, totales: tuple = None,
+                     progreso: Optional[Callable[[int], None]] = None,
+                     cancelado: Optional[Callable[[], bool]] = None):
+    """
+    Dibuja páginas de tamaño fijo sobre el canvas (sin guardarlo).
+    Se usa tanto para el informe completo como para cada parte del modo paralelo:
+    con_cabecera/con_resumen indican si esta parte abre o cierra el informe y
+    totales permite pasar el recuento global cuando la parte no lo ve entero.
+    """
+    styles, titulo, subtitulo = _estilos()
+    ancho, alto = landscape(A4)
+    margen = inch
+    iterador = iter(tareas)
+    total = completadas = 0
+    pagina = pagina_inicial
+
+    y = alto - margen
+    if con_cabecera:
+        for texto, estilo, espacio in (("📋 LISTA DE DEBERES — ESTRUCTURA DE DATOS", titulo, 0),
+                                       (f"📅 {datetime.now():%d de %B de %Y, %H:%M}", subtitulo, 20)):
+            parrafo = Paragraph(texto, estilo)
+            _, h = parrafo.wrapOn(c, ancho - 2 * margen, y)
+            y -= h + estilo.spaceAfter
+            parrafo.drawOn(c, margen, y)
+            y -= espacio
+
+    capacidad = _capacidad(con_cabecera, filas_por_pagina)
+    pendiente = []  # Elemento leído por adelantado para saber si hay más páginas
+    while True:
+        bloque = pendiente + list(islice(iterador, capacidad - len(pendiente)))
+        pendiente = list(islice(iterador, 1))
+        if bloque:
+            total += len(bloque)
+            completadas += sum(t.completada for t in bloque)
+            y = _dibujar_tabla(c, [ENCABEZADO] + [_fila(t) for t in bloque], ancho, y)
+            if progreso:
+                progreso(total)
+            if cancelado and cancelado():
+                raise ExportacionCancelada()
+        if not pendiente:
+            break
+        _pie_pagina(c, ancho, margen, pagina, total_paginas)
+        c.showPage()
+        pagina += 1
+        y = alto - margen
+        capacidad = filas_por_pagina
+
+    if con_resumen:
+        if _resumen_en_pagina_nueva(len(bloque), capacidad):
+            _pie_pagina(c, ancho, margen, pagina, total_paginas)
+            c.showPage()
+            pagina += 1
+            y = alto - margen
+        total, completadas = totales or (total, completadas)
+        resumen = Paragraph(f"📊 Total: {total} | ✅ {completadas} | ⏳ {total - completadas}", styles["Normal"])
+        _, h = resumen.wrapOn(c, ancho - 2 * margen, alto)
+        resumen.drawOn(c, margen, y - 20 - h)
+    _pie_pagina(c, ancho, margen, pagina, total_paginas)
+
+
+def _renderizar_parte(trabajo: tuple):
+    """Proceso hijo: dibuja un fragmento contiguo de páginas en su propio PDF."""
+    ruta, tareas, pagina_inicial, total_paginas, primera, totales, filas_por_pagina = trabajo
+    c = canvas.Canvas(ruta, pagesize=landscape(A4), pageCompression=1)
+    _dibujar_paginas(c, tareas, filas_por_pagina, pagina_inicial, total_paginas,
+                     con_cabecera=primera, con_resumen=totales is not None, totales=totales)
+    c.save()
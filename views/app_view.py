@@ -2,9 +2,25 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional
 from data.tarea_repository import TareaRepository
 
+# A partir de cuántas tareas la tabla pasa a modo ventana (virtualizado)
+UMBRAL_VIRTUAL = 2000
+# Filas extra materializadas por debajo de la región visible
+MARGEN_VIRTUAL = 5
+# Vistas por fecha ofrecidas en el selector (clave -> texto)
+VISTAS = {
+    "todas": "Todas",
+    "proximas": "Próximas",
+    "semana": "Vencen esta semana",
+    "vencidas": "Vencidas",
+}
+# Tareas archivadas que se leen por cada "Cargar más" del historial
+PAGINA_HISTORIAL = 200
+# Cada cuánto se comprueba si otro proceso modificó el almacén
+INTERVALO_SONDEO_MS = 1000
+
 
 class AppView:
     def __init__(self, root: tk.Tk):
@@ -17,7 +33,17 @@ class AppView:
         self.entry_titulo: Optional[tk.Entry] = None
         self.entry_desc: Optional[tk.Entry] = None
         self.entry_fecha: Optional[tk.Entry] = None
+        self.entry_buscar: Optional[tk.Entry] = None
         self.tree: Optional[ttk.Treeview] = None
+        self.scrollbar: Optional[ttk.Scrollbar] = None
+        self.label_estado: Optional[tk.Label] = None
+
+        # Estado de la tabla: lista mostrada y filas materializadas en el Treeview
+        self._tareas_vista: list = []
+        self._filas: Dict[str, tuple] = {}        # iid -> valores materializados
+        self._orden_filas: List[str] = []         # iids en el orden del Treeview
+        self._virtual = False
+        self._inicio = 0                          # primera fila de la ventana virtual
 
         self._crear_widgets()
 
@@ -60,12 +86,27 @@ class AppView:
         tk.Button(frame_botones, text="📦 Exportar pendientes (PDF)", command=self._on_exportar_pdf,
               bg="#9C27B0", fg="white", font=("Segoe UI", 9)).pack(side="right", padx=5)
 
+        self.combo_vista = ttk.Combobox(frame_botones, state="readonly", width=18,
+                                        values=list(VISTAS.values()), font=("Segoe UI", 9))
+        self.combo_vista.set(VISTAS["todas"])
+        self.combo_vista.pack(side="left", padx=5)
+        self.combo_vista.bind("<<ComboboxSelected>>", lambda e: self._on_vista())
+
+        tk.Label(frame_botones, text="🔍", font=("Segoe UI", 9)).pack(side="left", padx=(15, 2))
+        self.var_buscar = tk.StringVar()
+        self.entry_buscar = tk.Entry(frame_botones, width=25, textvariable=self.var_buscar,
+                                     font=("Segoe UI", 10))
+        self.entry_buscar.pack(side="left", padx=5)
+        self.var_buscar.trace_add("write", lambda *_: self._on_buscar())
+        self.entry_buscar.bind("<Escape>", lambda e: self.var_buscar.set(""))
+
         # === Tabla de tareas ===
         frame_tree = tk.Frame(self.root, padx=15, pady=5)
         frame_tree.pack(fill="both", expand=True)
 
         columns = ("Estado", "Título", "Descripción", "Fecha")
-        self.tree = ttk.Treeview(frame_tree, columns=columns, show="headings", height=15)
+        self.tree = ttk.Treeview(frame_tree, columns=columns, show="headings", height=15,
+                                 selectmode="extended")  # Ctrl/Mayús+clic: varias tareas
         self.tree.pack(side="left", fill="both", expand=True)
 
         for col in columns:
@@ -73,9 +114,13 @@ class AppView:
             width = 130 if col == "Descripción" else 90
             self.tree.column(col, width=width, anchor="center")
 
-        scrollbar = ttk.Scrollbar(frame_tree, orient="vertical", command=self.tree.yview)
-        scrollbar.pack(side="right", fill="y")
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = ttk.Scrollbar(frame_tree, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        self.tree.bind("<Configure>", lambda e: self._refrescar_ventana())
+        self.tree.bind("<MouseWheel>", self._on_rueda)
+        self.tree.bind("<Button-4>", self._on_rueda)
+        self.tree.bind("<Button-5>", self._on_rueda)
 
         # === Botones inferiores ===
         frame_acciones = tk.Frame(self.root, padx=15, pady=5)
@@ -85,6 +130,23 @@ class AppView:
                   font=("Segoe UI", 9)).pack(side="left", padx=5)
         tk.Button(frame_acciones, text="🗑️ Eliminar", command=self._on_eliminar,
                   bg="#f44336", fg="white", font=("Segoe UI", 9)).pack(side="left", padx=5)
+        tk.Button(frame_acciones, text="🧹 Limpiar completadas", command=self._on_limpiar_completadas,
+                  font=("Segoe UI", 9)).pack(side="left", padx=5)
+        tk.Button(frame_acciones, text="📜 Historial", command=self._on_historial,
+                  font=("Segoe UI", 9)).pack(side="left", padx=5)
+
+        self.frame_acciones = frame_acciones
+        self.label_estado = tk.Label(frame_acciones, text="", fg="grey", font=("Segoe UI", 9))
+        self.label_estado.pack(side="right", padx=5)
+
+        # === Progreso de exportación (oculto hasta que se usa) ===
+        self.frame_progreso = tk.Frame(self.root, padx=15, pady=5)
+        self.barra_progreso = ttk.Progressbar(self.frame_progreso, mode="determinate", length=300)
+        self.barra_progreso.pack(side="left", padx=5)
+        self.label_progreso = tk.Label(self.frame_progreso, text="", font=("Segoe UI", 9))
+        self.label_progreso.pack(side="left", padx=5)
+        self.btn_cancelar = tk.Button(self.frame_progreso, text="✖ Cancelar", font=("Segoe UI", 9))
+        self.btn_cancelar.pack(side="left", padx=5)
 
     # --- Métodos de eventos ---
     def set_on_agregar(self, callback: Callable[[str, str, str], None]):
@@ -96,12 +158,24 @@ class AppView:
     def set_on_exportar_pdf(self, callback: Callable[[], None]):
         self._on_exportar_pdf_cb = callback
 
-    def set_on_marcar(self, callback: Callable[[int], None]):
+    def set_on_vista(self, callback: Callable[[str], None]):
+        self._on_vista_cb = callback
+
+    def set_on_buscar(self, callback: Callable[[str], None]):
+        self._on_buscar_cb = callback
+
+    def set_on_marcar(self, callback: Callable[[List[str]], None]):
         self._on_marcar_cb = callback
 
-    def set_on_eliminar(self, callback: Callable[[int], None]):
+    def set_on_eliminar(self, callback: Callable[[List[str]], None]):
         self._on_eliminar_cb = callback
 
+    def set_on_limpiar_completadas(self, callback: Callable[[], None]):
+        self._on_limpiar_completadas_cb = callback
+
+    def set_on_historial(self, callback: Callable[[], None]):
+        self._on_historial_cb = callback
+
     def _on_agregar(self):
         if hasattr(self, '_on_agregar_cb'):
             titulo = self.entry_titulo.get().strip()
@@ -121,15 +195,20 @@ class AppView:
         if hasattr(self, '_on_exportar_pdf_cb'):
             self._on_exportar_pdf_cb()
 
+    def _on_vista(self):
+        if hasattr(self, '_on_vista_cb'):
+            texto = self.combo_vista.get()
+            self._on_vista_cb(next(clave for clave, valor in VISTAS.items() if valor == texto))
+
+    def _on_buscar(self):
+        if hasattr(self, '_on_buscar_cb'):
+            self._on_buscar_cb(self.var_buscar.get().strip())
+
     def _on_marcar(self):
         if hasattr(self, '_on_marcar_cb'):
             sel = self.tree.selection()
             if sel:
-                try:
-                    idx = int(sel[0])  # ✅ Usa el índice real (iid = str(índice))
-                    self._on_marcar_cb(idx)
-                except (ValueError, IndexError):
-                    self.mostrar_error("Índice inválido.")
+                self._on_marcar_cb(list(sel))  # ✅ iids = ids estables de las tareas
             else:
                 messagebox.showinfo("ℹ️", "Seleccione una tarea.")
 
@@ -137,26 +216,112 @@ class AppView:
         if hasattr(self, '_on_eliminar_cb'):
             sel = self.tree.selection()
             if sel:
-                try:
-                    idx = int(sel[0])  # ✅ Índice real
-                    self._on_eliminar_cb(idx)
-                except (ValueError, IndexError):
-                    self.mostrar_error("Índice inválido.")
+                self._on_eliminar_cb(list(sel))  # ✅ ids estables
             else:
                 messagebox.showinfo("ℹ️", "Seleccione una tarea.")
 
+    def _on_limpiar_completadas(self):
+        if hasattr(self, '_on_limpiar_completadas_cb'):
+            self._on_limpiar_completadas_cb()
+
+    def _on_historial(self):
+        if hasattr(self, '_on_historial_cb'):
+            self._on_historial_cb()
+
     # --- Métodos públicos ---
     def actualizar_lista(self, tareas: list):
-        """Actualiza la tabla con iid = índice real"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        for i, t in enumerate(tareas):
-            estado = "✅" if t.completada else "⏳"
-            desc = (t.descripcion[:50] + "..." if len(t.descripcion) > 50 else t.descripcion) or "—"
-            # ✅ iid = índice real como string
-            self.tree.insert("", "end", iid=str(i), values=(
-                estado, t.titulo, desc, t.fecha_limite or "—"
-            ))
+        """
+        Actualiza la tabla aplicando solo las diferencias (altas, bajas, cambios y
+        movimientos) respecto a lo ya mostrado. Con más de UMBRAL_VIRTUAL tareas
+        solo se materializan las filas de la ventana visible.
+        """
+        self._tareas_vista = tareas
+        self._virtual = len(tareas) > UMBRAL_VIRTUAL
+        if self._virtual:
+            self._refrescar_ventana()
+        else:
+            self._inicio = 0
+            self._sincronizar_filas(tareas)
+
+    # --- Sincronización incremental del Treeview ---
+    def _sincronizar_filas(self, tareas: list):
+        nuevas = [_clave_fila(t) for t in tareas]
+        conjunto = set(nuevas)
+
+        # 1) Bajas
+        sobran = [iid for iid in self._orden_filas if iid not in conjunto]
+        if sobran:
+            self.tree.delete(*sobran)
+            for iid in sobran:
+                del self._filas[iid]
+
+        # 2) Movimientos: solo si cambió el orden relativo de las filas que quedan
+        supervivientes = [iid for iid in nuevas if iid in self._filas]
+        if supervivientes != [iid for iid in self._orden_filas if iid in conjunto]:
+            for i, iid in enumerate(supervivientes):
+                self.tree.move(iid, "", i)
+
+        # 3) Altas (en su posición) y cambios de valores
+        for i, (iid, t) in enumerate(zip(nuevas, tareas)):
+            valores = _valores_fila(t)
+            anteriores = self._filas.get(iid)
+            if anteriores is None:
+                self.tree.insert("", i, iid=iid, values=valores)
+            elif anteriores != valores:
+                self.tree.item(iid, values=valores)
+            self._filas[iid] = valores
+        self._orden_filas = nuevas
+
+    def _filas_visibles(self) -> int:
+        alto_fila = ttk.Style().lookup("Treeview", "rowheight") or 20
+        alto = self.tree.winfo_height()
+        if alto <= 1:  # Aún no dibujado: usar la altura configurada
+            return int(self.tree.cget("height"))
+        return max(1, alto // int(alto_fila))
+
+    def _refrescar_ventana(self):
+        if not self._virtual:
+            return
+        total = len(self._tareas_vista)
+        visibles = self._filas_visibles()
+        self._inicio = max(0, min(self._inicio, total - visibles))
+        fin = min(total, self._inicio + visibles + MARGEN_VIRTUAL)
+        self._sincronizar_filas(self._tareas_vista[self._inicio:fin])
+        if total:
+            self.scrollbar.set(self._inicio / total, min(1.0, (self._inicio + visibles) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _desplazar_a(self, inicio: int):
+        self._inicio = inicio
+        self._refrescar_ventana()
+
+    def _on_tree_scroll(self, primero, ultimo):
+        if not self._virtual:
+            self.scrollbar.set(primero, ultimo)
+
+    def _on_scrollbar(self, *args):
+        if not self._virtual:
+            self.tree.yview(*args)
+            return
+        visibles = self._filas_visibles()
+        if args[0] == "moveto":
+            self._desplazar_a(int(float(args[1]) * len(self._tareas_vista)))
+        elif args[0] == "scroll":
+            paso = visibles if args[2] == "pages" else 1
+            self._desplazar_a(self._inicio + int(args[1]) * paso)
+
+    def _on_rueda(self, event):
+        if not self._virtual:
+            return None
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self._desplazar_a(self._inicio - 3)
+        else:
+            self._desplazar_a(self._inicio + 3)
+        return "break"
+
+    def seleccionar_vista(self, clave: str):
+        self.combo_vista.set(VISTAS[clave])
 
     def limpiar_campos(self):
         self.entry_titulo.delete(0, tk.END)
@@ -169,4 +334,158 @@ class AppView:
         messagebox.showerror("❌ Error", mensaje)
 
     def mostrar_info(self, titulo: str, mensaje: str):
-        messagebox.showinfo(titulo, mensaje)
\ No newline at end of file
+        messagebox.showinfo(titulo, mensaje)
+
+    def mostrar_progreso(self, total: int, on_cancelar: Callable[[], None]):
+        self.barra_progreso.config(maximum=max(total, 1), value=0)
+        self.label_progreso.config(text=f"📦 Exportando… 0 / {total} filas")
+        self.btn_cancelar.config(state="normal", command=lambda: self._cancelar(on_cancelar))
+        self.frame_progreso.pack(fill="x")
+
+    def actualizar_progreso(self, filas: int, total: int):
+        self.barra_progreso.config(value=filas)
+        self.label_progreso.config(text=f"📦 Exportando… {filas} / {total} filas")
+
+    def ocultar_progreso(self):
+        self.frame_progreso.pack_forget()
+
+    def _cancelar(self, on_cancelar: Callable[[], None]):
+        self.btn_cancelar.config(state="disabled")
+        self.label_progreso.config(text="Cancelando…")
+        on_cancelar()
+
+    def mostrar_estado(self, mensaje: str):
+        """Texto discreto en la barra inferior (progreso de carga, etc.)."""
+        self.label_estado.config(text=mensaje)
+
+    def vigilar_cambios(self, hay_cambios: Callable[[], bool], on_cambio: Callable[[], None],
+                        intervalo_ms: int = INTERVALO_SONDEO_MS):
+        """
+        Sondea periódicamente hay_cambios() (debe ser barato: un stat, no releer
+        el archivo) y llama a on_cambio() cuando otro proceso modificó el almacén.
+        """
+        def sondear():
+            try:
+                if hay_cambios():
+                    on_cambio()
+            except Exception as e:
+                print(f"[⚠️] Error al comprobar cambios externos: {e}")
+            self.root.after(intervalo_ms, sondear)
+        self.root.after(intervalo_ms, sondear)
+
+    # --- Panel de depuración (solo con la instrumentación activa) ---
+    def habilitar_depuracion(self, obtener_resumen: Callable[[], str], on_volcar: Callable[[], None],
+                             on_perfilar: Callable[[], None], on_reiniciar: Callable[[], None]):
+        """Añade el botón 🐞 (y F12) que abre el panel de latencias."""
+        abrir = lambda *_: self._abrir_panel_depuracion(obtener_resumen, on_volcar,
+                                                          on_perfilar, on_reiniciar)
+        tk.Button(self.frame_acciones, text="🐞 Depuración", command=abrir,
+                  font=("Segoe UI", 9)).pack(side="left", padx=5)
+        self.root.bind("<F12>", abrir)
+
+    def _abrir_panel_depuracion(self, obtener_resumen, on_volcar, on_perfilar, on_reiniciar):
+        panel = getattr(self, "_panel_depuracion", None)
+        if panel is not None and panel.winfo_exists():
+            panel.lift()
+            return
+        panel = self._panel_depuracion = tk.Toplevel(self.root)
+        panel.title("🐞 Latencias por operación (ms)")
+        panel.geometry("820x420")
+
+        botones = tk.Frame(panel, padx=10, pady=5)
+        botones.pack(fill="x")
+        tk.Button(botones, text="💾 Volcar a archivo", command=on_volcar,
+                  font=("Segoe UI", 9)).pack(side="left", padx=5)
+        tk.Button(botones, text="🔬 Perfilar siguiente operación", command=on_perfilar,
+                  font=("Segoe UI", 9)).pack(side="left", padx=5)
+        tk.Button(botones, text="🧹 Reiniciar", command=on_reiniciar,
+                  font=("Segoe UI", 9)).pack(side="left", padx=5)
+
+        texto = tk.Text(panel, font=("Consolas", 9), wrap="none")
+        texto.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        def refrescar():
+            if not panel.winfo_exists():
+                return
+            contenido = obtener_resumen()
+            if texto.get("1.0", "end-1c") != contenido:
+                primera = texto.yview()[0]
+                texto.delete("1.0", tk.END)
+                texto.insert("1.0", contenido)
+                texto.yview_moveto(primera)
+            panel.after(1000, refrescar)
+        refrescar()
+
+
+    # --- Historial (nivel frío) ---
+    def mostrar_historial(self, obtener: Callable[..., list], on_reabrir: Callable[[list], None]):
+        """
+        Ventana con las tareas archivadas, de la más reciente a la más antigua.
+        obtener(limite=, despues_de=) devuelve hasta `limite` tras la tarea `despues_de`
+        (None: desde el principio); se piden por páginas.
+        """
+        ventana = getattr(self, "_ventana_historial", None)
+        if ventana is not None and ventana.winfo_exists():
+            ventana.destroy()  # Reabrir = releer el archivo (puede haber cambiado)
+        ventana = self._ventana_historial = tk.Toplevel(self.root)
+        ventana.title("📜 Historial de tareas archivadas")
+        ventana.geometry("700x420")
+
+        columnas = ("Completada", "Título", "Descripción", "Fecha")
+        arbol = ttk.Treeview(ventana, columns=columnas, show="headings", selectmode="extended")
+        for col in columnas:
+            arbol.heading(col, text=col)
+            arbol.column(col, width=130 if col == "Descripción" else 100, anchor="center")
+        arbol.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+
+        botones = tk.Frame(ventana, padx=10, pady=5)
+        botones.pack(fill="x")
+        estado = tk.Label(botones, text="", fg="grey", font=("Segoe UI", 9))
+        mostradas: Dict[str, object] = {}
+        ultima = None  # Última entrada leída del historial: la página siguiente empieza detrás
+
+        def cargar_mas():
+            nonlocal ultima
+            tareas = obtener(limite=PAGINA_HISTORIAL, despues_de=ultima)
+            for t in tareas:
+                if t.id in mostradas:
+                    continue  # Archivada en dos meses: una sola fila (el iid no puede repetirse)
+                mostradas[t.id] = t
+                arbol.insert("", "end", iid=t.id, values=_valores_historial(t))
+            if tareas:
+                ultima = tareas[-1]
+            completo = len(tareas) < PAGINA_HISTORIAL
+            btn_mas.config(state="disabled" if completo else "normal")
+            estado.config(text=f"{len(mostradas)} tareas archivadas" + ("" if completo else "+"))
+
+        def reabrir():
+            sel = arbol.selection()
+            if not sel:
+                messagebox.showinfo("ℹ️", "Seleccione una tarea.", parent=ventana)
+                return
+            on_reabrir([mostradas.pop(iid) for iid in sel])  # El cursor no depende de lo quitado
+            arbol.delete(*sel)
+            estado.config(text=f"{len(sel)} tareas devueltas a la lista.")
+
+        btn_mas = tk.Button(botones, text="⏬ Cargar más", command=cargar_mas, font=("Segoe UI", 9))
+        btn_mas.pack(side="left", padx=5)
+        tk.Button(botones, text="↩️ Reabrir", command=reabrir,
+                  font=("Segoe UI", 9)).pack(side="left", padx=5)
+        estado.pack(side="right", padx=5)
+        cargar_mas()
+
+
+def _valores_historial(t) -> tuple:
+    desc = (t.descripcion[:50] + "..." if len(t.descripcion) > 50 else t.descripcion) or "—"
+    return (t.fecha_completada or "—", t.titulo, desc, t.fecha_limite or "—")
+
+
+def _clave_fila(t) -> str:
+    """iid estable de una tarea en el Treeview: su id persistente."""
+    return t.id
+
+
+def _valores_fila(t) -> tuple:
+    estado = "✅" if t.completada else "⏳"
+    desc = (t.descripcion[:50] + "..." if len(t.descripcion) > 50 else t.descripcion) or "—"
+    return (estado, t.titulo, desc, t.fecha_limite or "—")